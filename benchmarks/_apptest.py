@@ -0,0 +1,43 @@
+"""Ayudas para correr las páginas con ``streamlit.testing`` desde los benchmarks."""
+from __future__ import annotations
+
+import os
+import time
+
+from streamlit import config as st_config
+from streamlit import logger as st_logger
+from streamlit.testing.v1 import AppTest
+
+# Sin esto cada rerun imprime avisos de deprecación y de ScriptRunContext
+st_config.get_config_options()
+st_config.set_option("logger.level", "error")
+st_logger.set_log_level("error")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Banderas que desbloquean cada página (el juego anterior ya está resuelto)
+UNLOCKED = {
+    "authenticated": True,
+    "puzzle_solved": True,
+    "cuadro2_solved": True,
+    "cuadro3_solved": True,
+}
+
+
+def open_page(page: str, timeout: float = 60) -> AppTest:
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=timeout)
+    at.secrets["password"] = "bench"
+    for k, v in UNLOCKED.items():
+        at.session_state[k] = v
+    return at
+
+
+def timed_run(at: AppTest) -> float:
+    t0 = time.perf_counter()
+    at.run()
+    return time.perf_counter() - t0
+
+
+def timed_click(at: AppTest, key: str) -> float:
+    at.button(key).click()
+    return timed_run(at)
@@ -0,0 +1,63 @@
+"""Mensajes y bytes por movimiento del rompecabezas: tablero clásico vs sprite.
+
+Cuenta los deltas (elementos y bloques) que produce cada rerun y el tamaño de
+sus protos serializados, multiplicado por los reruns que cuesta un intercambio.
+
+Uso: ``python -m benchmarks.bench_board``
+"""
+from __future__ import annotations
+
+from benchmarks._apptest import open_page, timed_click, timed_run
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+def measure(at) -> tuple[int, int]:
+    """(deltas, bytes) de lo que el último rerun mandó al navegador."""
+    deltas = nbytes = 0
+    for node in walk(at.main):
+        deltas += 1
+        proto = getattr(node, "proto", None)
+        if proto is not None:
+            nbytes += proto.ByteSize()
+    return deltas, nbytes
+
+
+def tiles_move() -> tuple[int, int, int]:
+    at = open_page("pages/3_Cuadro1.py")
+    at.secrets["PUZZLE_BOARD_MODE"] = "tiles"
+    timed_run(at)
+    runs = deltas = nbytes = 0
+    for key in ("tile_btn_0", "tile_btn_1"):
+        # Cada clic es un rerun por el botón y otro por el st.rerun() que sigue
+        timed_click(at, key)
+        d, b = measure(at)
+        runs += 2
+        deltas += 2 * d
+        nbytes += 2 * b
+    return runs, deltas, nbytes
+
+
+def sprite_move() -> tuple[int, int, int]:
+    at = open_page("pages/3_Cuadro1.py")
+    timed_run(at)
+    # La primera casilla se marca en el navegador; solo el intercambio llega
+    at.session_state["pz_board"] = {"seq": 1, "a": 0, "b": 1}
+    timed_run(at)
+    d, b = measure(at)
+    return 1, d, b
+
+
+def main() -> None:
+    print(f"{'modo':8} {'reruns':>7} {'deltas':>7} {'bytes':>8}   (por intercambio)")
+    for name, fn in (("tiles", tiles_move), ("sprite", sprite_move)):
+        runs, deltas, nbytes = fn()
+        print(f"{name:8} {runs:7d} {deltas:7d} {nbytes:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Collage del juego de memoria: espera tras la última pareja.
+
+Compara armar todo el collage cuando se encuentra la última pareja (pegar
+cada foto + codificar) con el armado incremental de ``games.collage``, donde
+cada pareja se pega en segundo plano mientras el jugador sigue y al final
+solo falta la última casilla. También mide la segunda partida con las mismas
+fotos (el collage sale del caché). Las miniaturas ya están en caché en los
+dos casos: se mide solo el collage.
+
+Uso: ``python -m benchmarks.bench_collage``
+"""
+from __future__ import annotations
+
+import glob
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from PIL import Image
+
+from benchmarks._apptest import ROOT
+from benchmarks.bench_memory_deck import make_images
+from games import collage as collage_mod
+from games.collage import COLLAGE_QUALITY, collage_job, collage_layout
+from games.variants import thumbnail_for_file
+
+SIZES = (10, 50, 200)
+
+
+def build_at_end(paths) -> tuple[float, int]:
+    layout = collage_layout(len(paths))
+    t0 = time.perf_counter()
+    canvas = Image.new("RGB", layout.size, (255, 255, 255))
+    for slot, path in enumerate(paths):
+        with Image.open(io.BytesIO(thumbnail_for_file(path, layout.tile).data)) as tile:
+            canvas.paste(tile.convert("RGB"), layout.origin(slot))
+    buf = io.BytesIO()
+    canvas.save(buf, format="JPEG", quality=COLLAGE_QUALITY, optimize=True)
+    return time.perf_counter() - t0, len(buf.getvalue())
+
+
+def incremental(paths) -> float:
+    job = collage_job(paths)
+    for path in paths[:-1]:
+        job.add(path)
+        # El jugador tarda segundos entre parejas: la casilla ya está pegada
+        while job.pasted < paths.index(path) + 1:
+            time.sleep(0.001)
+    t0 = time.perf_counter()
+    job.add(paths[-1])
+    job.result(timeout=30)
+    return time.perf_counter() - t0
+
+
+def cached(paths) -> float:
+    t0 = time.perf_counter()
+    job = collage_job(paths)
+    job.ensure(paths)
+    assert job.result() is not None
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    photos = sorted(glob.glob(os.path.join(ROOT, "assets", "*.jpeg")))
+    directory = tempfile.mkdtemp(prefix="collage_")
+    try:
+        synthetic = make_images(directory, max(SIZES))
+        print(f"{'fotos':>5} {'px':>11} {'KB':>6} {'todo al final':>14} {'incremental':>12} {'caché':>8}")
+        for n in SIZES:
+            paths = photos[:n] if n <= len(photos) else synthetic[:n]
+            layout = collage_layout(n)
+            for p in paths:
+                thumbnail_for_file(p, layout.tile)
+            t_end, nbytes = min(build_at_end(paths) for _ in range(3))
+            collage_mod._COLLAGES.clear()
+            collage_mod._JOBS.clear()
+            t_inc = incremental(paths)
+            t_hit = cached(paths)
+            w, h = layout.size
+            print(f"{n:5d} {f'{w}×{h}':>11} {nbytes / 1024:6.0f} {t_end * 1e3:11.1f} ms "
+                  f"{t_inc * 1e3:9.1f} ms {t_hit * 1e3:5.2f} ms")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Motor de crucigramas: tamaño, densidad, cruces y tiempo por cantidad de palabras.
+
+Primero las 14 pistas del paquete de Cuadro 2 (con y sin orientación fija) y luego
+listas sintéticas con frecuencias de letras del español, todas con semilla
+fija. Cada resultado se valida renumerando la grilla: las palabras que
+aparecen tienen que ser exactamente las colocadas (sin palabras pegadas).
+
+Al final, ``search`` con K semillas (en serie y con el pool de procesos)
+sobre 200 palabras: tiempo total, semilla ganadora y su puntaje.
+
+Uso: ``python -m benchmarks.bench_crossword``
+"""
+from __future__ import annotations
+
+import os
+import random
+import time
+
+from games.crossword import number_grid
+from games.crossword_engine import H, V, construct, score, search
+from games.packs import DEFAULT_PACK, default_packs
+
+SIZES = (14, 25, 50, 100, 200, 400)
+BUDGET = 10.0
+SEARCH_WORDS = 200
+SEARCH_SEEDS = (1, 4, 8, 16)
+
+LETTERS = "eaosrnidlctumpbgvyqhfzjxkw"
+WEIGHTS = (13.7, 12.5, 8.7, 8.0, 6.9, 6.7, 6.2, 5.0, 4.9, 4.7, 4.6, 3.9, 3.2,
+           2.5, 1.4, 1.0, 0.9, 0.9, 0.9, 0.7, 0.7, 0.5, 0.4, 0.2, 0.1, 0.1)
+
+
+def page_words() -> list[tuple[str, str]]:
+    pack = default_packs().get(DEFAULT_PACK)
+    return list(pack.across + pack.down)
+
+
+def synthetic_words(n: int, seed: int = 1) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    return [("", "".join(rng.choices(LETTERS, WEIGHTS, k=rng.randint(3, 10)))) for _ in range(n)]
+
+
+def validate(res) -> None:
+    solution = {}
+    for p in res.placements:
+        for r, c, ch in p.cells():
+            assert solution.setdefault((r, c), ch) == ch
+    _, across, down = number_grid(solution, res.rows, res.cols)
+    found = sorted(w for _, w in across + down)
+    assert found == sorted(p.word for p in res.placements), "aparecieron palabras no colocadas"
+
+
+def report(label: str, entries) -> None:
+    res = construct(entries, seed=0, budget=BUDGET)
+    validate(res)
+    print(f"{label:<18} {len(entries):6d} {res.rows:>4}×{res.cols:<4} {res.density:9.3f} "
+          f"{res.crossings:7d} {res.isolated:7d} {res.elapsed * 1e3:9.1f}"
+          f"{'  (tiempo agotado)' if res.timed_out else ''}")
+
+
+def main() -> None:
+    print(f"{'caso':<18} {'palabras':>6} {'grilla':>9} {'densidad':>9} {'cruces':>7} {'aisladas':>7} {'ms':>9}")
+    words = page_words()
+    half = len(words) // 2
+    report("Cuadro 2 (H/V)", [(q, w, H if i < half else V) for i, (q, w) in enumerate(words)])
+    report("Cuadro 2 (libre)", [(q, w, None) for q, w in words])
+    for n in SIZES:
+        report("sintético", [(q, w, None) for q, w in synthetic_words(n)])
+
+    print(f"\nsearch sobre {SEARCH_WORDS} palabras ({os.cpu_count()} núcleos)")
+    print(f"{'K':>3} {'modo':>9} {'s':>7} {'semilla':>8} {'puntaje':>9} {'grilla':>9} {'cruces':>7}")
+    entries = [(q, w, None) for q, w in synthetic_words(SEARCH_WORDS)]
+    for k in SEARCH_SEEDS:
+        for parallel in (False, True):
+            t0 = time.perf_counter()
+            res = search(entries, seeds=k, budget=BUDGET, parallel=parallel)
+            elapsed = time.perf_counter() - t0
+            validate(res)
+            print(f"{k:3d} {'procesos' if parallel else 'serie':>9} {elapsed:7.2f} {res.seed:8d} "
+                  f"{score(res):9.1f} {res.rows:>4}×{res.cols:<4} {res.crossings:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Progreso del crucigrama: recorrer la grilla vs ``CrosswordState`` por letra.
+
+Se generan grillas grandes con el motor y se simula escribir la solución
+letra por letra (con un error corregido cada tanto). Tras cada letra la
+versión original recorre ``solution`` para contar las correctas y, para
+marcar palabras completas, cada palabra; ``CrosswordState.set`` solo toca
+las (a lo sumo dos) palabras que cruzan esa casilla.
+
+Uso: ``python -m benchmarks.bench_crossword_state``
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from benchmarks.bench_crossword import synthetic_words
+from games.crossword import layout_from_result
+from games.crossword_engine import construct
+from games.crossword_state import CrosswordState, WordIndex
+
+SIZES = (14, 50, 200, 800)
+SCAN_SAMPLE = 500
+
+
+def generated_grid(n: int):
+    res = construct([(q, w, None) for q, w in synthetic_words(n)], seed=0, budget=30.0)
+    layout = layout_from_result(res, digest=f"bench-{n}")
+    return WordIndex.from_layout(layout), layout.solution
+
+
+def keystrokes(solution: dict, seed: int = 0) -> list[tuple[int, int, str]]:
+    rng = random.Random(seed)
+    keys = []
+    for (r, c), ch in solution.items():
+        if rng.random() < 0.1:
+            keys.append((r, c, "x" if ch != "x" else "y"))  # error que luego se corrige
+        keys.append((r, c, ch))
+    return keys
+
+
+def run_scan(index: WordIndex, solution: dict, keys, complete: bool = True) -> float:
+    inputs = {pos: "" for pos in solution}
+    cols = index.cols
+    t0 = time.perf_counter()
+    for r, c, ch in keys:
+        inputs[(r, c)] = ch
+        correct = sum(1 for pos, want in solution.items() if inputs[pos] == want)
+        done = sum(1 for w in index.words
+                   if all(inputs[divmod(i, cols)] == solution[divmod(i, cols)] for i in w.cells))
+    if complete:
+        assert correct == len(solution) and done == len(index.words)
+    return time.perf_counter() - t0
+
+
+def run_state(index: WordIndex, keys) -> float:
+    state = CrosswordState(index)
+    t0 = time.perf_counter()
+    for r, c, ch in keys:
+        state.set(r, c, ch)
+        correct, done = state.correct, state.words_done
+    assert state.solved and done == len(index.words)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    print("µs por letra (escribir toda la solución)")
+    print(f"{'palabras':>8} {'grilla':>9} {'letras':>7} {'recorrer':>11} {'índice':>9}")
+    for n in SIZES:
+        index, solution = generated_grid(n)
+        keys = keystrokes(solution)
+        # Recorrer es O(letras) por tecla: en las grillas grandes basta una muestra
+        sample = keys if len(keys) <= SCAN_SAMPLE else keys[:SCAN_SAMPLE]
+        t_scan = run_scan(index, solution, sample, complete=sample is keys) / len(sample) * 1e6
+        t_state = min(run_state(index, keys) for _ in range(5)) / len(keys) * 1e6
+        print(f"{n:8d} {index.rows:>4}×{index.cols:<4} {index.letters:7d} {t_scan:11.1f} {t_state:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Caché HTTP contra un ``http.server`` local que cuenta las peticiones.
+
+Comprueba TTL, revalidación con ETag (304), servir copia vieja mientras se
+refresca, timeouts (cabeceras lentas y un cuerpo que llega de a un byte) y
+tamaño máximo, y mide la latencia de cada caso.
+
+Uso: ``python -m benchmarks.bench_http_cache``
+"""
+from __future__ import annotations
+
+import hashlib
+import http.server
+import os
+import tempfile
+import threading
+import time
+
+from games.http_cache import FetchError, HttpCache
+
+BODY = os.urandom(256 * 1024)
+DRIP_BYTES = 100
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    hits = {"full": 0, "not_modified": 0, "slow": 0, "drip": 0, "big": 0}
+    body = BODY
+    delay = 0.0
+
+    def do_GET(self):
+        if self.path == "/slow":
+            CountingHandler.hits["slow"] += 1
+            time.sleep(2.0)
+            return  # el cliente ya se rindió: no hay a quién contestarle
+        if self.path == "/drip":
+            # Cabeceras enseguida y el cuerpo de a un byte cada 0.2 s: ninguna
+            # lectura pasa el timeout del socket, pero el total sí
+            CountingHandler.hits["drip"] += 1
+            self.send_response(200)
+            self.send_header("Content-Length", str(DRIP_BYTES))
+            self.end_headers()
+            try:
+                for _ in range(DRIP_BYTES):
+                    self.wfile.write(b"x")
+                    self.wfile.flush()
+                    time.sleep(0.2)
+            except OSError:
+                pass  # el cliente ya se rindió
+            return
+        if self.path == "/big":
+            CountingHandler.hits["big"] += 1
+            self.send_response(200)
+            self.send_header("Content-Length", str(50 * 1024 * 1024))
+            self.end_headers()
+            return
+        if CountingHandler.delay:
+            time.sleep(CountingHandler.delay)
+        etag = '"%s"' % hashlib.md5(self.body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            CountingHandler.hits["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        CountingHandler.hits["full"] += 1
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1e3
+
+
+def main() -> None:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    url = base + "/img.jpg"
+    hits = CountingHandler.hits
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(tmp, ttl=0.5, connect_timeout=0.5, read_timeout=1.0, max_bytes=1024 * 1024)
+
+        entry, ms = timed(lambda: cache.get(url))
+        assert hits["full"] == 1 and entry.read() == BODY
+        print(f"primera descarga          : {ms:7.2f} ms  peticiones={dict(hits)}")
+
+        _, ms = timed(lambda: cache.get(url))
+        assert hits["full"] == 1
+        print(f"dentro del TTL            : {ms:7.3f} ms  (sin red)")
+
+        # Otro proceso (caché nuevo sobre el mismo directorio) lee del disco
+        cold = HttpCache(tmp, ttl=0.5)
+        _, ms = timed(lambda: cold.get(url))
+        assert hits["full"] == 1
+        print(f"arranque en frío del disco: {ms:7.3f} ms  (sin red)")
+
+        time.sleep(0.6)
+        CountingHandler.delay = 0.3   # servidor lento: el script no debe esperarlo
+        stale, ms = timed(lambda: cache.get(url))
+        assert stale.read() == BODY and ms < 100
+        print(f"vencido (copia vieja)     : {ms:7.3f} ms  revalidando en segundo plano…")
+        cache.wait_for_refresh(url)
+        assert hits["not_modified"] == 1 and hits["full"] == 1
+        print(f"revalidación              : 304  peticiones={dict(hits)}")
+        CountingHandler.delay = 0.0
+
+        time.sleep(0.6)
+        CountingHandler.body = BODY[::-1]  # el contenido cambia en el servidor
+        cache.get(url)
+        cache.wait_for_refresh(url)
+        assert cache.get(url).read() == BODY[::-1] and hits["full"] == 2
+        print(f"contenido nuevo           : 200  peticiones={dict(hits)}")
+
+        for path, label in (("/slow", "timeout de cabeceras"), ("/drip", "timeout del cuerpo"),
+                            ("/big", "tamaño máximo")):
+            t0 = time.perf_counter()
+            try:
+                cache.get(base + path)
+            except FetchError as e:
+                ms = (time.perf_counter() - t0) * 1e3
+                print(f"{label:26}: {ms:7.0f} ms  FetchError: {e}")
+            else:
+                raise AssertionError(f"{path} debió fallar")
+            if path == "/drip":
+                # read_timeout=1.0: tiene que rendirse cerca de 1 s, no al juntar un CHUNK
+                assert ms < 1500, f"el cuerpo lento tardó {ms:.0f} ms en fallar"
+
+    server.shutdown()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
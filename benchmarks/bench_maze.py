@@ -0,0 +1,121 @@
+"""Compilar el laberinto de Pac-Man: grafo + tabla de distancias (todos los pares).
+
+Para el laberinto de la página y laberintos de prueba de hasta 64×64 mide
+cuánto tarda ``build_graph`` (una vez por proceso), cuánto pesa la tabla, un
+BFS en Python desde cada casilla como referencia, y el costo de una decisión
+de fantasma: antes la distancia Manhattan de cada salida (con una closure
+nueva por fantasma), ahora una fila de ``dist``. "Atrapa" es el porcentaje de
+persecuciones (fantasma y jugador quieto al azar) que terminan en menos de
+``4 × casillas`` turnos con cada criterio.
+
+Uso: ``python -m benchmarks.bench_maze``
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+
+from games.pacman_levels import DEFAULT_LEVEL, default_levels
+from games.pacman_maze import UNREACHABLE, build_graph
+
+PAGE_MAZE = default_levels().get(DEFAULT_LEVEL).maze
+SIDES = (16, 32, 48, 64)
+DECISIONS = 20000
+CHASES = 200
+
+
+def test_maze(side: int, seed: int = 0) -> list[str]:
+    # Pilares en (par, par) y ~20% de muros sueltos: pasillos con muchos ciclos
+    rng = random.Random(seed)
+    return [
+        "".join(
+            "#" if r in (0, side - 1) or c in (0, side - 1) or (r % 2 == 0 and c % 2 == 0)
+            or rng.random() < 0.2 else "."
+            for c in range(side)
+        )
+        for r in range(side)
+    ]
+
+
+def python_bfs_all(graph) -> float:
+    t0 = time.perf_counter()
+    for s in range(graph.size):
+        d = [-1] * graph.size
+        d[s] = 0
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            for v in graph.neighbors[u]:
+                if d[v] < 0:
+                    d[v] = d[u] + 1
+                    q.append(v)
+    return time.perf_counter() - t0
+
+
+def decision_times(graph) -> tuple[float, float]:
+    rng = random.Random(1)
+    pairs = [(rng.randrange(graph.size), rng.randrange(graph.size)) for _ in range(DECISIONS)]
+
+    t0 = time.perf_counter()
+    for g, p in pairs:
+        pr, pc = graph.cells[p]
+
+        def score(cell):
+            r, c = cell
+            return -(abs(r - pr) + abs(c - pc))
+
+        max((graph.cells[v] for v in graph.neighbors[g]), key=score, default=None)
+    t_manhattan = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for g, p in pairs:
+        row = graph.dist[p]
+        min(graph.neighbors[g], key=lambda v: row[v], default=None)
+    t_table = time.perf_counter() - t0
+    return t_manhattan / DECISIONS, t_table / DECISIONS
+
+
+def catch_rate(graph) -> tuple[float, float]:
+    rng = random.Random(2)
+    starts = []
+    while len(starts) < CHASES:
+        g, p = rng.randrange(graph.size), rng.randrange(graph.size)
+        if graph.dist[g, p] != UNREACHABLE:   # sin bolsas aisladas
+            starts.append((g, p))
+    out = []
+    for use_table in (False, True):
+        caught = 0
+        for g, p in starts:
+            pr, pc = graph.cells[p]
+            for _ in range(4 * graph.size):
+                if g == p:
+                    caught += 1
+                    break
+                options = graph.neighbors[g]
+                if use_table:
+                    g = min(options, key=lambda v: graph.dist[v, p])
+                else:
+                    g = min(options, key=lambda v: abs(graph.cells[v][0] - pr) + abs(graph.cells[v][1] - pc))
+        out.append(caught / CHASES)
+    return out[0], out[1]
+
+
+def main() -> None:
+    print(f"{'laberinto':>9} {'casillas':>8} {'tabla ms':>9} {'BFS py ms':>10} {'MB':>6} "
+          f"{'Manhattan µs':>13} {'tabla µs':>9} {'atrapa M/tabla':>15}")
+    mazes = [("página", PAGE_MAZE)] + [(f"{s}×{s}", test_maze(s)) for s in SIDES]
+    for name, maze in mazes:
+        t0 = time.perf_counter()
+        graph = build_graph(maze)
+        t_build = time.perf_counter() - t0
+        t_py = python_bfs_all(graph)
+        t_man, t_tab = decision_times(graph)
+        c_man, c_tab = catch_rate(graph)
+        print(f"{name:>9} {graph.size:8d} {t_build * 1e3:9.1f} {t_py * 1e3:10.1f} "
+              f"{graph.dist.nbytes / 2**20:6.2f} {t_man * 1e6:13.2f} {t_tab * 1e6:9.2f} "
+              f"{c_man:7.0%}/{c_tab:.0%}")
+
+
+if __name__ == "__main__":
+    main()
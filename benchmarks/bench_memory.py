@@ -0,0 +1,73 @@
+"""Reruns, tiempo y bytes por jugada del juego de memoria: clásico vs componente.
+
+En el modo clásico cada carta es un botón: destaparla cuesta el rerun del
+botón más el ``st.rerun()`` que sigue, y un par que no coincide necesita
+otro rerun (con su ``st.rerun()``) para volver a taparse cuando pasa
+``flip_deadline``. Con el componente la primera carta, la espera y el
+volteo pasan en el navegador: solo el par llega al servidor.
+
+Uso: ``python -m benchmarks.bench_memory``
+"""
+from __future__ import annotations
+
+import time
+
+from benchmarks._apptest import open_page, timed_click, timed_run
+from benchmarks.bench_board import measure
+
+PAGE = "pages/5_Cuadro3.py"
+
+
+def pairs_of(game) -> tuple[tuple[int, int], tuple[int, int]]:
+    deck = list(game.deck)
+    a, b = [i for i, d in enumerate(deck) if d == deck[0]]
+    c = next(i for i, d in enumerate(deck) if d != deck[0])
+    return (a, b), (a, c)
+
+
+def classic_moves() -> dict:
+    at = open_page(PAGE)
+    at.secrets["MEMORY_MODE"] = "classic"
+    at.session_state["cuadro3_solved"] = False
+    timed_run(at)
+    match, miss = pairs_of(at.session_state.mem_game)
+    out = {}
+    for name, (a, b) in (("no coincide", miss), ("pareja", match)):
+        elapsed, runs, deltas, nbytes = 0.0, 0, 0, 0
+        for idx in (a, b):
+            elapsed += timed_click(at, f"mem_{idx}")
+            d, n = measure(at)
+            runs, deltas, nbytes = runs + 2, deltas + 2 * d, nbytes + 2 * n
+        if name == "no coincide":
+            # Hay que esperar flip_deadline y que un rerun lo note
+            time.sleep(0.85)
+            elapsed += timed_run(at)
+            d, n = measure(at)
+            runs, deltas, nbytes = runs + 2, deltas + 2 * d, nbytes + 2 * n
+        out[name] = (runs, elapsed, deltas, nbytes)
+    return out
+
+
+def client_moves() -> dict:
+    at = open_page(PAGE)
+    at.session_state["cuadro3_solved"] = False
+    timed_run(at)
+    match, miss = pairs_of(at.session_state.mem_game)
+    out = {}
+    for seq, (name, (a, b)) in enumerate((("no coincide", miss), ("pareja", match)), start=1):
+        at.session_state["mem_board"] = {"seq": seq, "a": a, "b": b}
+        elapsed = timed_run(at)
+        d, n = measure(at)
+        out[name] = (1, elapsed, d, n)
+    return out
+
+
+def main() -> None:
+    print(f"{'modo':11} {'jugada':12} {'reruns':>7} {'ms':>8} {'deltas':>7} {'bytes':>8}")
+    for mode, fn in (("clásico", classic_moves), ("componente", client_moves)):
+        for move, (runs, elapsed, deltas, nbytes) in fn().items():
+            print(f"{mode:11} {move:12} {runs:7d} {elapsed * 1e3:8.1f} {deltas:7d} {nbytes:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Juego de memoria con mazos grandes: ms por rerun y tamaño del estado.
+
+Arma una carpeta temporal con imágenes sintéticas y corre la página con
+``MEMORY_DECK_DIR`` y ``MEMORY_PAIRS`` de 4 a 400 parejas. Por tamaño mide el
+rerun de una jugada (un par que no coincide llega del componente), los bytes
+del estado en sesión (``MemoryGame`` con arrays) contra la lista de
+diccionarios ``{"img_id", "revealed", "matched"}`` que se usaba antes, y
+cuánto pesan los argumentos del componente.
+
+Uso: ``python -m benchmarks.bench_memory_deck``
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import random
+import shutil
+import statistics
+import tempfile
+
+from PIL import Image
+
+from benchmarks._apptest import open_page, timed_run
+from games.static_assets import STATIC_DIR
+from games.variants import thumbnail_for_file
+
+PAGE = "pages/5_Cuadro3.py"
+PAIRS = (4, 10, 50, 100, 200, 400)
+RERUNS = 5
+PREFIX = "deck_"
+
+
+def make_images(directory: str, n: int) -> list[str]:
+    rng = random.Random(0)
+    paths = []
+    for i in range(n):
+        path = os.path.join(directory, f"{PREFIX}{i:04d}.jpg")
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", (400, 300), color).save(path, quality=80)
+        paths.append(path)
+    return paths
+
+
+def legacy_state(game) -> bytes:
+    cards = [{"img_id": int(d), "revealed": False, "matched": False} for d in game.deck]
+    return pickle.dumps(cards)
+
+
+def run(directory: str, pairs: int) -> tuple[float, int, int, int]:
+    at = open_page(PAGE)
+    at.secrets["MEMORY_DECK_DIR"] = directory
+    at.secrets["MEMORY_PAIRS"] = pairs
+    at.session_state["cuadro3_solved"] = False
+    timed_run(at)
+    game = at.session_state.mem_game
+    deck = list(game.deck)
+    times = []
+    for seq in range(1, RERUNS + 1):
+        # Primera carta contra una de otra pareja: nunca coincide
+        b = next(i for i, d in enumerate(deck) if d != deck[0])
+        at.session_state["mem_board"] = {"seq": seq, "a": 0, "b": b}
+        times.append(timed_run(at))
+    args = next(c.proto.json_args for c in at.get("component_instance") if "memory_game" in c.proto.json_args)
+    return statistics.median(times), len(pickle.dumps(game)), len(legacy_state(game)), len(args)
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp(prefix="memory_deck_")
+    try:
+        paths = make_images(directory, max(PAIRS))
+        for path in paths:
+            # Miniaturas ya hechas: se mide el rerun en régimen, no la primera visita
+            for size in (160, 240):
+                thumbnail_for_file(path, size)
+        print(f"{'parejas':>7} {'cartas':>6} {'ms/rerun':>9} {'estado B':>9} {'dicts B':>9} {'args KB':>8}")
+        for pairs in PAIRS:
+            ms, state, legacy, args = run(directory, pairs)
+            print(f"{pairs:7d} {2 * pairs:6d} {ms * 1e3:9.1f} {state:9d} {legacy:9d} {args / 1024:8.1f}")
+    finally:
+        shutil.rmtree(directory)
+        if os.path.isdir(STATIC_DIR):
+            for name in os.listdir(STATIC_DIR):
+                if name.startswith(PREFIX):
+                    os.remove(os.path.join(STATIC_DIR, name))
+
+
+if __name__ == "__main__":
+    main()
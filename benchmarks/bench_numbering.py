@@ -0,0 +1,68 @@
+"""Numeración + pistas + máscara: diccionario original vs grilla densa.
+
+Para grillas de ~15×15 a ~100×100 generadas con el motor se mide lo que
+antes se hacía en cada layout: armar ``solution`` como diccionario,
+``number_grid`` (recorre todo el bounding box con búsquedas en el dict),
+buscar la pista de cada palabra por texto y sacar la máscara para el
+frontend. La versión densa hace una pasada por las letras colocadas
+(``number_placements``) y la máscara sale de ``bytes.translate`` por fila.
+
+Uso: ``python -m benchmarks.bench_numbering``
+"""
+from __future__ import annotations
+
+import time
+
+from benchmarks.bench_crossword import synthetic_words
+from games.crossword import layout_from_result, number_grid
+from games.crossword_engine import construct
+
+SIDES = (15, 30, 50, 75, 100)
+REPEAT = 5
+
+
+def generated(side: int):
+    # ~0.4 de densidad y ~5 letras nuevas por palabra
+    n = max(8, int(side * side * 0.4 / 5))
+    entries = [(f"pista {i}", w, None) for i, (_, w) in enumerate(synthetic_words(n, seed=side))]
+    return construct(entries, seed=0, budget=60.0)
+
+
+def run_dict(res) -> float:
+    clue_of = {p.word: p.clue for p in res.placements}
+    rows, cols = res.rows, res.cols
+    t0 = time.perf_counter()
+    solution = {(r, c): ch for p in res.placements for r, c, ch in p.cells()}
+    num_map, across, down = number_grid(solution, rows, cols)
+    clues = [clue_of.get(w, "(sin texto)") for _, w in across + down]
+    mask = "".join("1" if (r, c) in solution else "0" for r in range(rows) for c in range(cols))
+    return time.perf_counter() - t0
+
+
+def run_dense(res) -> float:
+    t0 = time.perf_counter()
+    layout = layout_from_result(res, digest="bench")   # number_placements
+    clues = [clue for _, _, clue in layout.across_list + layout.down_list]
+    mask = layout.mask()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    print(f"ms por layout (mejor de {REPEAT})")
+    print(f"{'grilla':>9} {'palabras':>8} {'letras':>7} {'dict':>9} {'densa':>9} {'x':>6}")
+    for side in SIDES:
+        res = generated(side)
+        # Las dos versiones tienen que numerar igual
+        layout = layout_from_result(res, digest="bench")
+        num_map, across, down = number_grid(layout.solution, res.rows, res.cols)
+        assert num_map == layout.num_map and across == [x[:2] for x in layout.across_list]
+        assert down == [x[:2] for x in layout.down_list]
+
+        t_dict = min(run_dict(res) for _ in range(REPEAT)) * 1e3
+        t_dense = min(run_dense(res) for _ in range(REPEAT)) * 1e3
+        print(f"{res.rows:>4}×{res.cols:<4} {len(res.placements):8d} {res.letters:7d} "
+              f"{t_dict:9.2f} {t_dense:9.3f} {t_dict / t_dense:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Paquetes de crucigramas: arranque con cientos de paquetes y costo de elegir uno.
+
+Se generan N paquetes sintéticos (JSON y CSV) en un directorio temporal y se
+compara leerlos todos al arrancar contra ``PackIndex``, que solo lista los
+nombres y lee el paquete pedido. Al final, el layout de un paquete: generarlo
+vs leer el ``<id>.layout.json`` precompilado (un servidor recién arrancado).
+
+Uso: ``python -m benchmarks.bench_packs``
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+import games.crossword as crossword
+from benchmarks.bench_crossword import synthetic_words
+from games.packs import PackIndex, parse_pack
+
+COUNTS = (100, 500, 2000)
+WORDS_PER_PACK = 14
+
+
+def write_packs(directory: str, count: int) -> list[str]:
+    ids = []
+    for i in range(count):
+        words = synthetic_words(WORDS_PER_PACK, seed=i)
+        half = len(words) // 2
+        pack_id = f"pack{i:05d}"
+        if i % 2:
+            with open(os.path.join(directory, pack_id + ".csv"), "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["orient", "clue", "answer"])
+                for j, (_, w) in enumerate(words):
+                    writer.writerow(["H" if j < half else "V", f"pista {w}", w])
+        else:
+            data = {
+                "title": pack_id,
+                "across": [{"clue": f"pista {w}", "answer": w} for _, w in words[:half]],
+                "down": [{"clue": f"pista {w}", "answer": w} for _, w in words[half:]],
+            }
+            with open(os.path.join(directory, pack_id + ".json"), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        ids.append(pack_id)
+    return ids
+
+
+def main() -> None:
+    print(f"{'paquetes':>8} {'leer todos (ms)':>16} {'índice (ms)':>12} {'get 1º (ms)':>12} {'get (µs)':>9}")
+    for count in COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            ids = write_packs(tmp, count)
+            t0 = time.perf_counter()
+            eager = {os.path.splitext(n)[0]: parse_pack(os.path.join(tmp, n)) for n in os.listdir(tmp)}
+            t_eager = (time.perf_counter() - t0) * 1e3
+            assert len(eager) == count
+
+            index = PackIndex(tmp)
+            t0 = time.perf_counter()
+            index.ids()
+            t_index = (time.perf_counter() - t0) * 1e3
+            pick = random.Random(count).choice(ids)
+            t0 = time.perf_counter()
+            index.get(pick)
+            t_first = (time.perf_counter() - t0) * 1e3
+            t0 = time.perf_counter()
+            for _ in range(1000):
+                index.get(pick)
+            t_get = (time.perf_counter() - t0) / 1000 * 1e6
+            print(f"{count:8d} {t_eager:16.1f} {t_index:12.2f} {t_first:12.3f} {t_get:9.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_packs(tmp, 1)
+        index = PackIndex(tmp)
+        pack = index.get("pack00000")
+        t0 = time.perf_counter()
+        index.layout(pack)
+        t_build = (time.perf_counter() - t0) * 1e3
+        crossword._LAYOUTS.clear()  # como un servidor recién arrancado
+        t0 = time.perf_counter()
+        index.layout(pack)
+        t_load = (time.perf_counter() - t0) * 1e3
+    print(f"\nlayout: generar + guardar {t_build:.2f} ms, leer precompilado {t_load:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Fantasmas que buscan: profundidad alcanzada según el presupuesto por turno.
+
+Para cada laberinto (los del paquete y algunos generados más grandes, con
+más fantasmas) juega turnos con un jugador al azar y, por estrategia de
+búsqueda y presupuesto en ms, mide la profundidad que completó cada
+fantasma (promedio y percentil 10: un fantasma que ya tiene al jugador al
+alcance corta en 1) y lo que tardó el turno entero (mediana y el peor):
+con más fantasmas o laberintos más grandes baja la profundidad, no sube el
+tiempo. La primera fila de cada laberinto es ``greedy`` como
+referencia (profundidad 1, sin reloj).
+
+Además comprueba que el peor turno no pase del tope más ``TOLERANCE``. Eso
+se mide en tiempo de CPU del hilo: cuenta todo lo que hace la búsqueda
+(recolector de basura incluido) pero no las pausas en que el sistema deja
+al proceso sin correr, que en una máquina cargada llegan a varios ms y no
+dependen del código. La columna "peor" es el tiempo real, con esas pausas.
+
+Uso: ``python -m benchmarks.bench_pacman_ai [--turns 60]``
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from games.pacman_ai import make_ai
+from games.pacman_engine import ACTIONS, PacmanGame
+from games.pacman_gen import generate_maze
+from games.pacman_levels import compile_level, default_levels
+
+BUDGETS_MS = (1.0, 5.0, 20.0)
+MODES = ("expectimax", "minimax")
+# Laberintos generados: (lado, fantasmas)
+GENERATED = ((41, 4), (61, 8))
+# Margen sobre el tope: una lectura del reloj cada CHECK_EVERY nodos y salir
+TOLERANCE = 0.1      # fracción del tope
+TOLERANCE_MS = 0.5
+
+
+def play(level, ai, turns: int, seed: int = 0) -> tuple[list[int], list[float], list[float]]:
+    """Profundidades de cada fantasma en cada turno y ms de cada turno (reales y de CPU)."""
+    actions = random.Random(seed)
+    game = PacmanGame(level, seed=seed, ai=ai)
+    depths, times, cpu = [], [], []
+    for _ in range(turns):
+        if game.over:
+            game = PacmanGame(level, seed=seed, ai=ai)
+        t0, c0 = time.perf_counter(), time.thread_time()
+        game.step(actions.choice(ACTIONS))
+        times.append((time.perf_counter() - t0) * 1e3)
+        cpu.append((time.thread_time() - c0) * 1e3)
+        depths.extend(getattr(ai, "depths", ()) or (1,) * len(game.ghosts))
+    return depths, times, cpu
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=60)
+    args = ap.parse_args()
+
+    levels = [default_levels().get(level_id) for level_id in default_levels().ids()]
+    for side, ghosts in GENERATED:
+        levels.append(compile_level(generate_maze(side, side, seed=side, ghosts=ghosts), f"gen_{side}"))
+
+    print(f"{'nivel':8} {'fantasmas':>9} {'estrategia':11} {'tope':>7} {'prof.':>6} {'p10':>4} "
+          f"{'ms/turno':>9} {'peor':>7} {'peor CPU':>8}")
+    over = []
+    for level in levels:
+        runs = [("greedy", None)] + [(mode, budget) for mode in MODES for budget in BUDGETS_MS]
+        for mode, budget in runs:
+            ai = make_ai() if budget is None else make_ai(mode, budget_ms=budget)
+            depths, times, cpu = play(level, ai, args.turns)
+            cap = "—" if budget is None else f"{budget:g} ms"
+            print(f"{level.id:8} {len(level.homes):9d} {mode:11} {cap:>7} "
+                  f"{statistics.fmean(depths):6.1f} {sorted(depths)[len(depths) // 10]:4d} "
+                  f"{statistics.median(times):9.2f} {max(times):7.2f} {max(cpu):8.2f}")
+            if budget is not None and max(cpu) > budget * (1 + TOLERANCE) + TOLERANCE_MS:
+                over.append(f"{level.id} {mode} {cap}: {max(cpu):.2f} ms de CPU")
+    assert not over, "turnos por encima del tope: " + "; ".join(over)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Bytes por turno del tablero de Pac-Man: HTML completo vs componente.
+
+Primero comprueba que la plantilla de ``games.pacman_board`` da exactamente
+el HTML que armaba la página (casilla por casilla, con ``pos in Gs`` y
+``Gs.index``) y compara el tiempo de armarlo. Después juega unos turnos en la
+página con ``PACMAN_BOARD_MODE=html`` (lo de antes: ``<style>`` y todas las
+casillas en cada rerun) y con el componente (laberinto una vez, después solo
+lo que cambió, con una jugada por evento), y cuenta los bytes de los protos
+del tablero y de la página.
+
+Uso: ``python -m benchmarks.bench_pacman_board``
+"""
+from __future__ import annotations
+
+import copy
+import random
+import time
+
+from benchmarks._apptest import open_page, timed_run
+from benchmarks.bench_board import walk
+from benchmarks.bench_maze import PAGE_MAZE
+from games.pacman_board import board_css, board_html, board_template
+from games.pacman_engine import ACTIONS, MOVE_LETTERS, PELLET, POWER, PacmanGame
+
+RENDERS = 2000
+TURNS = 30
+BUTTONS = {"up": "⬆️", "down": "⬇️", "left": "⬅️", "right": "➡️"}
+
+
+def legacy_html(pm: PacmanGame) -> str:
+    """El ``render_board`` de la página antes del cambio (sin el ``<style>``)."""
+    rows, cols = len(pm.maze), len(pm.maze[0])
+    P = pm.cell(pm.player)
+    Gs = [pm.cell(g) for g in pm.ghosts]
+    html = ['<div class="board {}">'.format("fright" if pm.power > 0 else "")]
+    for r in range(rows):
+        for c in range(cols):
+            pos = (r, c)
+            if not pm.graph.is_open(pos):
+                html.append('<div class="cell wall"></div>')
+                continue
+            classes = ["cell", "floor"]
+            inner = ""
+            if pos == P:
+                inner = '<div class="pacman"></div>'
+            elif pos in Gs:
+                idx = Gs.index(pos)
+                gcls = "ghost blue" if idx == 1 else "ghost"
+                inner = f'<div class="{gcls}"></div>'
+            elif pm.item_at(pos) == PELLET:
+                classes.append("pellet")
+            elif pm.item_at(pos) == POWER:
+                classes.append("power")
+            html.append(f'<div class="{" ".join(classes)}">{inner}</div>')
+    html.append("</div>")
+    return "".join(html)
+
+
+def render_times() -> tuple[float, float]:
+    rng = random.Random(0)
+    game = PacmanGame(PAGE_MAZE, random.Random(0))
+    states = []
+    for _ in range(RENDERS):
+        if game.over:
+            game = PacmanGame(PAGE_MAZE, random.Random(len(states)))
+        game.step(rng.choice(ACTIONS))
+        states.append(copy.copy(game))
+        assert legacy_html(game) == board_html(game), "la plantilla no da el mismo HTML"
+    board_template(game.graph)
+    timings = []
+    for fn in (legacy_html, board_html):
+        t0 = time.perf_counter()
+        for g in states:
+            fn(g)
+        timings.append((time.perf_counter() - t0) / len(states))
+    return timings[0], timings[1]
+
+
+def rerun_bytes(at) -> tuple[int, int]:
+    """(bytes del tablero, bytes de toda la página) del último rerun."""
+    board = total = 0
+    for node in walk(at.main):
+        proto = getattr(node, "proto", None)
+        if proto is None:
+            continue
+        size = proto.ByteSize()
+        total += size
+        if getattr(node, "type", None) == "component_instance":
+            board += size
+        elif getattr(node, "type", None) == "markdown" and (
+                'class="board' in node.value or "<style>" in node.value):
+            board += size
+    return board, total
+
+
+def play(mode: str) -> tuple[int, int, int]:
+    """Bytes del primer render y promedio (tablero, página) por turno."""
+    at = open_page("pages/6_Cuadro4.py")
+    at.secrets["PACMAN_BOARD_MODE"] = mode
+    timed_run(at)
+    first, _ = rerun_bytes(at)
+    rng = random.Random(1)
+    board = total = 0
+    for seq in range(1, TURNS + 1):
+        action = rng.choice(ACTIONS)
+        if mode == "html":
+            next(b for b in at.button if b.label == BUTTONS[action]).click()
+            reruns = 2  # el del botón y el del st.rerun() que sigue
+        else:
+            # El componente manda la jugada como evento: un rerun
+            at.session_state["pm_board"] = {"seq": seq, "moves": MOVE_LETTERS[ACTIONS.index(action)]}
+            reruns = 1
+        at.run()
+        b, t = rerun_bytes(at)
+        board += reruns * b
+        total += reruns * t
+    return first, board // TURNS, total // TURNS
+
+
+def main() -> None:
+    t_old, t_new = render_times()
+    print(f"HTML del tablero: página {t_old * 1e6:6.0f} µs   plantilla {t_new * 1e6:6.0f} µs "
+          f"(mismo HTML en {RENDERS} estados)")
+    print(f"<style> por rerun en modo html: {len(board_css(len(PAGE_MAZE[0])))} caracteres")
+    print(f"{'modo':10} {'1er render':>10} {'tablero/turno':>14} {'página/turno':>13}   (bytes)")
+    for mode in ("html", "component"):
+        first, board, total = play(mode)
+        print(f"{mode:10} {first:10d} {board:14d} {total:13d}")
+
+
+if __name__ == "__main__":
+    main()
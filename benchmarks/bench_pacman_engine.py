@@ -0,0 +1,168 @@
+"""Turnos por segundo del motor de Pac-Man sin Streamlit.
+
+Compara ``PacmanGame.step`` con las funciones que tenía la página (sets de
+tuplas y una lista de diccionarios en un ``dict`` que hace de
+``st.session_state``, con la tabla de distancias de ``games.pacman_maze``).
+Las dos versiones juegan las mismas jugadas al azar con la misma semilla y
+tienen que terminar con el mismo puntaje, vidas y posiciones.
+
+Uso: ``python -m benchmarks.bench_pacman_engine``
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from benchmarks.bench_maze import PAGE_MAZE
+from games.pacman_engine import ACTIONS, PacmanGame
+from games.pacman_maze import compile_maze
+
+TURNS = 20000
+SEEDS = 5
+
+
+class LegacyGame:
+    """Las reglas de la página tal cual, sobre un dict en vez de la sesión."""
+
+    DIRS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+    def __init__(self, maze, rng):
+        self.maze, self.rng = maze, rng
+        self.graph = compile_maze(maze)
+        self.S = {}
+        p, gs, pe, po, wa = self.find_positions()
+        S = self.S
+        S["pm_player"] = p
+        S["pm_ghosts"] = [{"pos": g, "home": g, "dir": None} for g in gs]
+        S["pm_pellets"], S["pm_powers"], S["pm_walls"] = set(pe), set(po), set(wa)
+        S["pm_score"], S["pm_lives"], S["pm_power_timer"] = 0, 3, 0
+        S["pm_game_over"] = S["pm_win"] = False
+        S["pm_moves"] = 0
+
+    def find_positions(self):
+        pellets, powers, walls = set(), set(), set()
+        player, ghosts = None, []
+        for r, line in enumerate(self.maze):
+            for c, ch in enumerate(line):
+                if ch == "#": walls.add((r, c))
+                elif ch == ".": pellets.add((r, c))
+                elif ch == "o": powers.add((r, c))
+                elif ch == "P": player = (r, c)
+                elif ch == "G": ghosts.append((r, c))
+        return player, ghosts, pellets, powers, walls
+
+    def step_player(self, dkey):
+        S = self.S
+        dr, dc = self.DIRS[dkey]
+        r, c = S["pm_player"]
+        nr, nc = r + dr, c + dc
+        if not (0 <= nr < len(self.maze) and 0 <= nc < len(self.maze[0])) or (nr, nc) in S["pm_walls"]:
+            return
+        S["pm_player"] = (nr, nc)
+        S["pm_moves"] += 1
+        if (nr, nc) in S["pm_pellets"]:
+            S["pm_pellets"].remove((nr, nc)); S["pm_score"] += 10
+        if (nr, nc) in S["pm_powers"]:
+            S["pm_powers"].remove((nr, nc)); S["pm_score"] += 50; S["pm_power_timer"] = 15
+
+    def move_ghosts(self):
+        S, G = self.S, self.graph
+        to_player = G.dist[G.node(S["pm_player"])]
+        sign = -1 if S["pm_power_timer"] == 0 else 1
+        new_positions = []
+        for g in S["pm_ghosts"]:
+            options = G.neighbors[G.node(g["pos"])]
+            best_val, best = None, []
+            for opt in options:
+                val = sign * int(to_player[opt])
+                if best_val is None or val > best_val:
+                    best_val = val; best = [opt]
+                elif val == best_val:
+                    best.append(opt)
+            new_positions.append(G.cells[best[0] if len(best) == 1 else self.rng.choice(best)])
+        for i, g in enumerate(S["pm_ghosts"]):
+            g["pos"] = new_positions[i]
+
+    def check_collisions(self):
+        S = self.S
+        eaten = []
+        for g in S["pm_ghosts"]:
+            if g["pos"] == S["pm_player"]:
+                if S["pm_power_timer"] > 0:
+                    eaten.append(g); S["pm_score"] += 200
+                else:
+                    S["pm_lives"] -= 1
+                    if S["pm_lives"] <= 0:
+                        S["pm_game_over"] = True
+                    self.respawn()
+                    return
+        for g in eaten:
+            g["pos"] = g["home"]
+
+    def respawn(self):
+        p, gs, _, _, _ = self.find_positions()
+        self.S["pm_player"] = p
+        for g in self.S["pm_ghosts"]:
+            g["pos"] = g["home"]
+        self.S["pm_power_timer"] = 0
+
+    def step(self, dkey):
+        S = self.S
+        if S["pm_game_over"] or S["pm_win"]:
+            return
+        self.step_player(dkey)
+        if not S["pm_pellets"] and not S["pm_powers"]:
+            S["pm_win"] = True
+            return
+        self.move_ghosts()
+        self.check_collisions()
+        if S["pm_power_timer"] > 0:
+            S["pm_power_timer"] -= 1
+
+    @property
+    def over(self):
+        return self.S["pm_game_over"] or self.S["pm_win"]
+
+    def summary(self):
+        S = self.S
+        return S["pm_score"], S["pm_lives"], S["pm_player"], [g["pos"] for g in S["pm_ghosts"]]
+
+
+def summary(game: PacmanGame):
+    return game.score, game.lives, game.cell(game.player), [game.cell(g) for g in game.ghosts]
+
+
+def play(make, seed: int) -> tuple[float, int, list]:
+    """Juega TURNS turnos (reiniciando al terminar) y devuelve (segundos, turnos, finales)."""
+    actions = random.Random(seed)
+    rng = random.Random(seed)
+    game = make(rng)
+    finals = []
+    t0 = time.perf_counter()
+    for _ in range(TURNS):
+        if game.over:
+            finals.append(game.summary() if hasattr(game, "summary") else summary(game))
+            game = make(rng)
+        game.step(actions.choice(ACTIONS))
+    elapsed = time.perf_counter() - t0
+    finals.append(game.summary() if hasattr(game, "summary") else summary(game))
+    return elapsed, TURNS, finals
+
+
+def main() -> None:
+    compile_maze(PAGE_MAZE)
+    total = {"página": 0.0, "motor": 0.0}
+    for seed in range(SEEDS):
+        t_old, n, old = play(lambda rng: LegacyGame(PAGE_MAZE, rng), seed)
+        t_new, _, new = play(lambda rng: PacmanGame(PAGE_MAZE, rng), seed)
+        assert old == new, f"semilla {seed}: las reglas no coinciden"
+        total["página"] += t_old
+        total["motor"] += t_new
+    turns = TURNS * SEEDS
+    for name, t in total.items():
+        print(f"{name:7} {turns / t:10,.0f} turnos/s  ({t / turns * 1e6:5.1f} µs por turno)")
+    print(f"mismos resultados en {SEEDS} semillas × {TURNS} turnos")
+
+
+if __name__ == "__main__":
+    main()
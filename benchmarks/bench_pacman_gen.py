@@ -0,0 +1,76 @@
+"""Pac-Man en laberintos generados: tamaño vs latencia por turno y bytes.
+
+Para laberintos de ``games.pacman_gen`` cada vez más grandes mide cuánto
+tarda generarlos y compilarlos (grafo + tabla de distancias), cuánto pesa la
+tabla, los µs por turno del motor y lo que pesa pintar el tablero: el HTML
+completo del modo de respaldo (por rerun) y los argumentos del componente
+(el primer envío con el laberinto y el promedio por turno después).
+
+Uso: ``python -m benchmarks.bench_pacman_gen [--density 0.4] [--ghosts 4]``
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from games.pacman_board import BoardView, board_css, board_html
+from games.pacman_engine import ACTIONS, PacmanGame
+from games.pacman_gen import generate_maze, maze_density
+from games.pacman_levels import compile_level
+
+SIDES = (9, 21, 41, 61, 81)
+TURNS = 5000
+FRAMES = 300
+
+
+def turn_latency(level, seed: int = 0) -> float:
+    actions = random.Random(seed)
+    rng = random.Random(seed)
+    game = PacmanGame(level, rng)
+    t0 = time.perf_counter()
+    for _ in range(TURNS):
+        if game.over:
+            game = PacmanGame(level, rng)
+        game.step(actions.choice(ACTIONS))
+    return (time.perf_counter() - t0) / TURNS
+
+
+def render_bytes(level, seed: int = 0) -> tuple[int, int, float]:
+    """(HTML por rerun, primer envío del componente, bytes por turno después)."""
+    actions = random.Random(seed)
+    game = PacmanGame(level, random.Random(seed))
+    view = BoardView()
+    first = len(json.dumps(view.frame(game)))
+    html = len(board_css(level.cols)) + len(board_html(game))
+    total = 0
+    for _ in range(FRAMES):
+        game.step(actions.choice(ACTIONS))
+        total += len(json.dumps(view.frame(game)))
+    return html, first, total / FRAMES
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--density", type=float, default=0.4)
+    ap.add_argument("--ghosts", type=int, default=4)
+    args = ap.parse_args()
+
+    print(f"{'tamaño':>7} {'muros':>6} {'libres':>6} {'generar':>8} {'compilar':>9} {'tabla':>7} "
+          f"{'µs/turno':>8} {'html/rerun':>10} {'1er envío':>9} {'envío/turno':>11}")
+    for side in SIDES:
+        t0 = time.perf_counter()
+        maze = generate_maze(side, side, seed=side, density=args.density, ghosts=args.ghosts)
+        t_gen = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        level = compile_level(maze, f"gen_{side}")
+        t_compile = time.perf_counter() - t0
+        html, first, per_turn = render_bytes(level)
+        print(f"{f'{side}×{side}':>7} {maze_density(maze):6.0%} {level.graph.size:6d} "
+              f"{t_gen * 1e3:5.1f} ms {t_compile * 1e3:6.0f} ms {level.graph.dist.nbytes / 2**20:4.1f} MB "
+              f"{turn_latency(level) * 1e6:8.1f} {html:10,d} {first:9,d} {per_turn:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
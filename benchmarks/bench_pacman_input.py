@@ -0,0 +1,114 @@
+"""Reruns del servidor por cada 100 jugadas de Pac-Man: botones vs lotes.
+
+Con los botones de flecha cada jugada es un rerun por el clic y otro por el
+``st.rerun()`` que sigue. Con el componente las jugadas se encolan en el
+navegador y salen por lotes: uno en el siguiente cuadro de animación y,
+mientras el servidor lo procesa, las demás esperan al siguiente lote.
+
+El benchmark mide en la página (``AppTest``) cuánto tarda un rerun de cada
+tipo, comprueba que aplicar las jugadas por lotes deja la partida igual que
+aplicarlas una por una, y simula al navegador con distintos ritmos de
+teclado para contar los lotes (= reruns) por cada 100 jugadas.
+
+Uso: ``python -m benchmarks.bench_pacman_input``
+"""
+from __future__ import annotations
+
+import random
+
+from benchmarks._apptest import open_page, timed_run
+from benchmarks.bench_maze import PAGE_MAZE
+from games.pacman_board import MOVE_BATCH
+from games.pacman_engine import MOVE_LETTERS, PacmanGame
+from games.pacman_levels import DEFAULT_LEVEL, default_levels
+
+MOVES = 100
+SEED = 7
+FRAME_MS = 16          # requestAnimationFrame
+NETWORK_MS = 40        # ida y vuelta navegador <-> servidor
+# ms entre teclas: autorrepetición de una flecha apretada, alguien rápido, con calma
+KEY_INTERVALS = (33, 80, 200)
+BUTTONS = {"u": "⬆️", "d": "⬇️", "l": "⬅️", "r": "➡️"}
+
+
+def random_moves(n: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(MOVE_LETTERS) for _ in range(n))
+
+
+def button_rerun_ms(moves: str) -> float:
+    """ms por jugada con los botones (los dos reruns)."""
+    at = open_page("pages/6_Cuadro4.py")
+    at.secrets["PACMAN_BOARD_MODE"] = "html"
+    timed_run(at)
+    total = 0.0
+    for letter in moves:
+        next(b for b in at.button if b.label == BUTTONS[letter]).click()
+        total += timed_run(at)
+    return total * 1e3 / len(moves)
+
+
+def batch_rerun_ms(batches: list[str]) -> tuple[float, PacmanGame]:
+    """ms por rerun de lote en modo componente y la partida al final."""
+    at = open_page("pages/6_Cuadro4.py")
+    # La página reusa la partida si es del mismo nivel compilado
+    at.session_state["pm_game"] = PacmanGame(default_levels().get(DEFAULT_LEVEL), seed=SEED)
+    timed_run(at)
+    total = 0.0
+    for seq, moves in enumerate(batches, start=1):
+        at.session_state["pm_board"] = {"seq": seq, "moves": moves}
+        total += timed_run(at)
+    return total * 1e3 / len(batches), at.session_state["pm_game"]
+
+
+def simulate(interval_ms: float, rerun_ms: float, n: int = MOVES) -> list[int]:
+    """Tamaño de cada lote que manda el navegador con teclas cada ``interval_ms``."""
+    arrivals = [i * interval_ms for i in range(n)]
+    batches = []
+    sent = 0
+    ready_at = 0.0  # cuándo puede salir el siguiente lote (respuesta al anterior)
+    while sent < n:
+        # El lote sale en el cuadro siguiente a la primera tecla pendiente
+        t = max(arrivals[sent], ready_at) + FRAME_MS
+        size = 0
+        while sent < n and arrivals[sent] <= t and size < MOVE_BATCH:
+            sent += 1
+            size += 1
+        batches.append(size)
+        ready_at = t + NETWORK_MS + rerun_ms
+    return batches
+
+
+def split(moves: str, sizes: list[int]) -> list[str]:
+    out, i = [], 0
+    for size in sizes:
+        out.append(moves[i:i + size])
+        i += size
+    return out
+
+
+def snapshot(game: PacmanGame) -> tuple:
+    return game.score, game.lives, game.player, list(game.ghosts), bytes(game.items), game.turns
+
+
+def main() -> None:
+    moves = random_moves(MOVES)
+    t_button = button_rerun_ms(moves[:20])
+    # Tiempo de un rerun de lote con lotes típicos (unas pocas jugadas)
+    t_batch, _ = batch_rerun_ms(split(moves, [4] * (MOVES // 4)))
+    print(f"botones     {2 * MOVES:4d} reruns / {MOVES} jugadas  "
+          f"({t_button:5.1f} ms de servidor por jugada)")
+    # Las mismas jugadas una por una, con la misma semilla para los empates
+    expected = PacmanGame(PAGE_MAZE, seed=SEED)
+    for letter in moves:
+        expected.step(MOVE_LETTERS.index(letter))
+    for interval in KEY_INTERVALS:
+        sizes = simulate(interval, t_batch)
+        _, game = batch_rerun_ms(split(moves, sizes))
+        assert snapshot(game) == snapshot(expected), "los lotes no dan la misma partida"
+        print(f"lotes {interval:3d} ms {len(sizes):4d} reruns / {MOVES} jugadas  "
+              f"({t_batch:5.1f} ms por rerun, hasta {max(sizes)} jugadas por lote)")
+
+
+if __name__ == "__main__":
+    main()
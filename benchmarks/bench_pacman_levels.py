@@ -0,0 +1,77 @@
+"""Niveles de Pac-Man compilados: partida nueva, reaparecer y turnos.
+
+Para cada nivel de ``packs/pacman/`` mide cuánto tarda compilarlo (leer,
+validar, grafo y distancias; una vez por proceso) y compara lo que antes se
+hacía en cada ``init_game()`` y en cada vida perdida —recorrer el laberinto
+entero buscando jugador, fantasmas, pellets y muros— con lo de ahora: copiar
+el contenido inicial del nivel y volver a sus nodos de inicio.
+
+Uso: ``python -m benchmarks.bench_pacman_levels``
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from games import pacman_levels, pacman_maze
+from games.pacman_engine import ACTIONS, PacmanGame
+from games.pacman_levels import LevelIndex, default_levels
+
+REPEAT = 2000
+TURNS = 20000
+
+
+def find_positions(maze):
+    """Lo que hacía la página en cada partida nueva y en cada vida perdida."""
+    pellets, powers, walls = set(), set(), set()
+    player, ghosts = None, []
+    for r, line in enumerate(maze):
+        for c, ch in enumerate(line):
+            if ch == "#": walls.add((r, c))
+            elif ch == ".": pellets.add((r, c))
+            elif ch == "o": powers.add((r, c))
+            elif ch == "P": player = (r, c)
+            elif ch == "G": ghosts.append((r, c))
+    return player, ghosts, pellets, powers, walls
+
+
+def per_call(fn, n: int = REPEAT) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def turns_per_second(level) -> float:
+    actions = random.Random(0)
+    rng = random.Random(0)
+    game = PacmanGame(level, rng)
+    t0 = time.perf_counter()
+    for _ in range(TURNS):
+        if game.over:
+            game = PacmanGame(level, rng)
+        game.step(actions.choice(ACTIONS))
+    return TURNS / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    index = default_levels()
+    print(f"{'nivel':8} {'tamaño':>7} {'compilar':>9} {'escanear':>9} {'partida':>8} "
+          f"{'reaparecer':>10} {'turnos/s':>9}")
+    for level_id in index.ids():
+        pacman_levels._LEVELS.clear()
+        pacman_maze._GRAPHS.clear()
+        t0 = time.perf_counter()
+        level = LevelIndex().get(level_id)
+        t_compile = time.perf_counter() - t0
+        t_scan = per_call(lambda: find_positions(level.maze))
+        t_new = per_call(lambda: PacmanGame(level))
+        game = PacmanGame(level)
+        t_respawn = per_call(game.respawn)
+        print(f"{level_id:8} {f'{level.cols}×{level.rows}':>7} {t_compile * 1e3:6.1f} ms "
+              f"{t_scan * 1e6:6.1f} µs {t_new * 1e6:5.1f} µs {t_respawn * 1e6:7.2f} µs "
+              f"{turns_per_second(level):9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Costo de intercambio + "¿resuelto?" + "piezas en su lugar" por tamaño.
+
+Se simula una partida real: desde una baraja aleatoria, cada intercambio
+coloca la pieza que va en la siguiente casilla (como al armarlo por filas).
+La lista original compara ``order == SOLVED`` tras cada intercambio, y para
+mostrar las piezas en su lugar tendría que recorrer todo el tablero;
+``PuzzleState`` lleva ambas cosas con una cuenta incremental.
+
+Uso: ``python -m benchmarks.bench_puzzle``
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from games.puzzle import PuzzleState
+
+SIZES = (3, 4, 6, 10, 16, 20, 30, 40, 64)
+# Recorrer el tablero en cada intercambio es O(N⁴) por partida: más grande
+# tarda minutos y la columna lista+métrica queda en "—"
+METRIC_MAX_N = 40
+
+
+def solve_path(n: int) -> list[tuple[int, int]]:
+    state = PuzzleState.shuffled(n, random.Random(n))
+    order = list(state.order)
+    where = {tile: pos for pos, tile in enumerate(order)}
+    pairs = []
+    for pos in range(n * n):
+        src = where[pos]
+        if src != pos:
+            pairs.append((pos, src))
+            moved = order[pos]
+            order[pos], order[src] = pos, moved
+            where[moved] = src
+    return pairs
+
+
+def run_list(n: int, pairs, metric: bool) -> float:
+    solved = list(range(n * n))
+    order = list(PuzzleState.shuffled(n, random.Random(n)).order)
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        order[a], order[b] = order[b], order[a]
+        done = order == solved
+        if metric:
+            in_place = sum(1 for i, t in enumerate(order) if i == t)
+    assert done
+    return time.perf_counter() - t0
+
+
+def run_engine(n: int, pairs) -> float:
+    state = PuzzleState.shuffled(n, random.Random(n))
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        done = state.swap(a, b)
+        in_place = state.in_place
+    assert done
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    print("µs por intercambio (partida completa, mejor de 5)")
+    print(f"{'N':>4} {'piezas':>7} {'lista':>9} {'lista+métrica':>14} {'motor+métrica':>14}")
+    for n in SIZES:
+        pairs = solve_path(n)
+        k = len(pairs)
+        t_list = min(run_list(n, pairs, False) for _ in range(5)) / k * 1e6
+        t_engine = min(run_engine(n, pairs) for _ in range(5)) / k * 1e6
+        if n <= METRIC_MAX_N:
+            t_metric = min(run_list(n, pairs, True) for _ in range(5)) / k * 1e6
+            metric = f"{t_metric:14.3f}"
+        else:
+            metric = f"{'—':>14}"
+        print(f"{n:4d} {n * n:7d} {t_list:9.3f} {metric} {t_engine:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Bytes que baja un jugador que vuelve: media file manager vs ``/app/static``.
+
+Levanta en un hilo las mismas rutas de Streamlit (``/media`` y
+``/app/static``) con uvicorn y las pide con un "navegador" que cachea como
+uno real: sin ``Cache-Control`` ni ``Last-Modified`` no guarda nada; con
+``Last-Modified`` usa frescura heurística (10% de la antigüedad, RFC 9111
+§4.2.2). Cada visita es una sesión nueva que pide las imágenes de las
+páginas: 10 cartas de memoria, el sprite del rompecabezas y la foto final.
+
+Uso: ``python -m benchmarks.bench_static_assets``
+"""
+from __future__ import annotations
+
+import email.utils
+import os
+import socket
+import threading
+import time
+import urllib.request
+
+import uvicorn
+from starlette.applications import Starlette
+from streamlit.runtime.media_file_storage import MediaFileKind
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.web.server.starlette.starlette_routes import (
+    create_app_static_serving_routes,
+    create_media_routes,
+)
+
+from benchmarks._apptest import ROOT
+from games.static_assets import publish, stem
+from games.tiles import atlas_for_file
+from games.variants import thumbnail_for_file, variant_for_file
+
+VISITS_DAYS = (0, 1, 7, 30, 90)   # días desde la primera visita
+CARD_PX = 240
+REGISTER_REPEAT = 200
+
+
+def page_images() -> list[tuple[str, bytes, str]]:
+    photos = [os.path.join(ROOT, "assets", f"{i}.jpeg") for i in range(1, 11)]
+    out = []
+    for path in photos:
+        t = thumbnail_for_file(path, CARD_PX)
+        out.append((f"{stem(path)}_sq{CARD_PX}", t.data, t.mimetype))
+    atlas = atlas_for_file(os.path.join(ROOT, "assets", "rompecabezas.jpg"), 480, 6)
+    out.append(("pz_sprite", atlas.sprite, "image/jpeg"))
+    final = variant_for_file(os.path.join(ROOT, "assets", "11.png"), 1080)
+    out.append(("11_1080", final.data, final.mimetype))
+    return out
+
+
+def start_server(storage: MemoryMediaFileStorage) -> tuple[uvicorn.Server, str]:
+    routes = create_media_routes(storage, None) + create_app_static_serving_routes(
+        os.path.join(ROOT, "streamlit_app.py"), None
+    )
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(Starlette(routes=routes), log_level="error"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+class Browser:
+    """Caché HTTP mínima: guarda solo lo que los encabezados dejan reusar."""
+
+    def __init__(self):
+        self.fresh_until: dict[str, float] = {}
+
+    def get(self, url: str, now: float) -> tuple[int, int]:
+        """Devuelve (peticiones, bytes) para mostrar ``url`` en ``now``."""
+        if self.fresh_until.get(url, 0) > now:
+            return 0, 0
+        with urllib.request.urlopen(url) as resp:
+            body = resp.read()
+            headers = resp.headers
+        cc = headers.get("Cache-Control", "")
+        if "no-store" not in cc and "no-cache" not in cc:
+            if "max-age=" in cc:
+                self.fresh_until[url] = now + int(cc.split("max-age=")[1].split(",")[0])
+            elif headers.get("Last-Modified"):
+                date = email.utils.parsedate_to_datetime(headers["Date"]).timestamp()
+                modified = email.utils.parsedate_to_datetime(headers["Last-Modified"]).timestamp()
+                self.fresh_until[url] = now + (date - modified) / 10
+        return 1, len(body)
+
+
+def main() -> None:
+    images = page_images()
+    storage = MemoryMediaFileStorage("/media")
+    server, base = start_server(storage)
+
+    def media_urls() -> list[str]:
+        # Cada sesión vuelve a registrar sus imágenes (como st.image en cada rerun)
+        return [
+            f"{base}{storage.get_url(storage.load_and_get_id(data, mime, MediaFileKind.MEDIA))}"
+            for _, data, mime in images
+        ]
+
+    def static_urls() -> list[str]:
+        return [base + publish(data, mime, name) for name, data, mime in images]
+
+    total = sum(len(d) for _, d, _ in images)
+    print(f"{len(images)} imágenes por visita, {total / 1024:.0f} KB")
+    print(f"{'modo':7} " + " ".join(f"{f'día {d}':>13}" for d in VISITS_DAYS) + f" {'total KB':>9}")
+    for mode, urls_for in (("media", media_urls), ("static", static_urls)):
+        browser = Browser()
+        t0 = time.time()
+        cells, kb = [], 0.0
+        for day in VISITS_DAYS:
+            got = [browser.get(url, t0 + day * 86400) for url in urls_for()]
+            reqs, nbytes = sum(g[0] for g in got), sum(g[1] for g in got)
+            kb += nbytes / 1024
+            cells.append(f"{reqs:2d} req {nbytes / 1024:5.0f} KB")
+        print(f"{mode:7} " + " ".join(f"{c:>13}" for c in cells) + f" {kb:9.0f}")
+
+    # Costo en el script por rerun: registrar bytes vs devolver la URL ya publicada
+    for mode, urls_for in (("media", media_urls), ("static", static_urls)):
+        t0 = time.perf_counter()
+        for _ in range(REGISTER_REPEAT):
+            urls_for()
+        print(f"{mode:7} {(time.perf_counter() - t0) / REGISTER_REPEAT * 1e3:6.3f} ms por rerun para obtener las URLs")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
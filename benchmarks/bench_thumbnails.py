@@ -0,0 +1,58 @@
+"""Cartas de memoria al final de la partida: 20 cartas visibles por rerun.
+
+La página original hacía ``st.image(Image.open(path))`` por carta: decodificar
+la foto completa y que Streamlit la vuelva a codificar. Con
+``thumbnail_for_file`` la miniatura cuadrada se codifica una vez y los
+siguientes reruns (de cualquier sesión) son aciertos del caché.
+
+Uso: ``python -m benchmarks.bench_thumbnails``
+"""
+from __future__ import annotations
+
+import glob
+import io
+import os
+import time
+
+from PIL import Image
+
+from benchmarks._apptest import ROOT
+from games.variants import thumbnail_for_file, thumbnail_stats
+
+CARD_PX = (160, 240, 320)
+RERUNS = 5
+
+
+def full_decode_rerun(paths) -> float:
+    t0 = time.perf_counter()
+    for path in paths:
+        img = Image.open(path)
+        img.load()
+        # st.image con una imagen PIL la recodifica (JPEG si no tiene alfa)
+        img.convert("RGB").save(io.BytesIO(), format="JPEG")
+    return time.perf_counter() - t0
+
+
+def thumbnail_rerun(paths, size: int) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    sent = sum(len(thumbnail_for_file(path, size).data) for path in paths)
+    return time.perf_counter() - t0, sent
+
+
+def main() -> None:
+    photos = sorted(glob.glob(os.path.join(ROOT, "assets", "*.jpeg")))[:10]
+    cards = photos * 2  # 10 pares -> 20 cartas destapadas
+    sent_full = sum(os.path.getsize(p) for p in cards)
+
+    t_full = min(full_decode_rerun(cards) for _ in range(RERUNS)) * 1e3
+    print(f"original: {t_full:8.1f} ms por rerun, ~{sent_full / 1024:.0f} KB de fotos completas")
+    for size in CARD_PX:
+        t_first, _ = thumbnail_rerun(cards, size)
+        t_hit, sent = min(thumbnail_rerun(cards, size) for _ in range(RERUNS))
+        print(f"{size:4d} px: primer rerun {t_first * 1e3:8.1f} ms, luego {t_hit * 1e3:6.3f} ms, "
+              f"{sent / 1024:.0f} KB")
+    print(f"caché: {thumbnail_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Costo del rompecabezas por rerun: pipeline original vs atlas compartido.
+
+Uso: ``python -m benchmarks.bench_tiles [--repeat 20]``
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import statistics
+import time
+
+from PIL import Image, ImageOps
+
+from benchmarks._apptest import ROOT, open_page, timed_click, timed_run
+from games import tiles
+
+SIZE, N = 720, 6
+PATH = os.path.join(ROOT, "assets", "rompecabezas.jpg")
+
+
+def legacy_rerun() -> int:
+    """Lo que hacía cada rerun antes del atlas: decodificar, redimensionar,
+    recortar y que st.image volviera a codificar las 36 piezas."""
+    img = Image.open(PATH).convert("RGB").resize((SIZE, SIZE), Image.LANCZOS)
+    sent = 0
+    for i, t in enumerate(tiles.make_tiles(img, N)):
+        if i == 0:  # la casilla seleccionada
+            t = ImageOps.expand(t, border=4, fill=(255, 80, 80))
+        buf = io.BytesIO()
+        t.save(buf, format="JPEG")
+        sent += buf.tell()
+    return sent
+
+
+def atlas_rerun() -> int:
+    atlas = tiles.atlas_for_file(PATH, SIZE, N)
+    return sum(len(b) for b in atlas.tiles[1:]) + len(atlas.selected[0])
+
+
+def bench(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def swap_rerun(repeat: int) -> float:
+    """Mediana del rerun que produce un intercambio (segundo clic)."""
+    at = open_page("pages/3_Cuadro1.py")
+    # Los botones por pieza solo existen en el modo "tiles" (el de siempre es "sprite")
+    at.secrets["PUZZLE_BOARD_MODE"] = "tiles"
+    timed_run(at)
+    samples = []
+    for _ in range(repeat):
+        timed_click(at, "tile_btn_0")
+        samples.append(timed_click(at, "tile_btn_1"))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    t_legacy = bench(legacy_rerun, args.repeat)
+    tiles._ATLAS.clear()
+    t0 = time.perf_counter()
+    atlas_rerun()
+    t_cold = time.perf_counter() - t0
+    t_warm = bench(atlas_rerun, args.repeat)
+
+    print(f"imagen+piezas, pipeline original : {t_legacy * 1e3:8.2f} ms/rerun")
+    print(f"atlas, primera vez (frío)        : {t_cold * 1e3:8.2f} ms")
+    print(f"atlas, búsqueda (caliente)       : {t_warm * 1e3:8.3f} ms/rerun")
+    print(f"rerun completo de un intercambio : {swap_rerun(args.repeat) * 1e3:8.2f} ms (mediana)")
+    print(f"atlas: {tiles.atlas_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Bytes enviados y tiempo de decodificación por variante de cada imagen.
+
+Compara decodificar reducido (``draft``/``reduce``) contra decodificar a
+tamaño completo y luego redimensionar, que es lo que hacían las páginas.
+
+Uso: ``python -m benchmarks.bench_variants [--assets assets/1.jpeg ...]``
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import io
+import os
+import time
+
+from PIL import Image
+
+from benchmarks._apptest import ROOT
+from games.variants import WIDTHS, build_variant, pick_width
+
+SCREENS = (("teléfono", 360, 3.0), ("teléfono", 390, 2.0), ("tablet", 820, 2.0), ("escritorio", 1280, 1.0))
+
+
+def full_decode_ms(data: bytes, width: int) -> float:
+    t0 = time.perf_counter()
+    img = Image.open(io.BytesIO(data)).convert("RGB")
+    img.resize((width, max(1, img.height * width // img.width)), Image.LANCZOS)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--assets", nargs="*", default=None)
+    args = ap.parse_args()
+    paths = args.assets or sorted(glob.glob(os.path.join(ROOT, "assets", "*.*")))
+
+    print(f"{'imagen':18} {'ancho':>6} {'bytes':>9} {'reducido ms':>12} {'completo ms':>12}")
+    for path in paths:
+        if path.endswith(".gitkeep"):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.basename(path)
+        print(f"{name:18} {'orig':>6} {len(data):9d}")
+        for w in WIDTHS:
+            v = build_variant(data, w)
+            t_fast = best_of(lambda: build_variant(data, w).decode_ms)
+            t_full = best_of(lambda: full_decode_ms(data, w))
+            print(f"{'':18} {w:6d} {len(v.data):9d} {t_fast:12.2f} {t_full:12.2f}")
+
+    print("\nvariante elegida por pantalla (carta de memoria = ancho/5, rompecabezas = ancho)")
+    for label, width, dpr in SCREENS:
+        card = pick_width(max(140, width / 5), dpr)
+        board = pick_width(width, dpr, (360, 480, 720))
+        print(f"  {label:10} {width:5d}px @{dpr:.0f}x  carta={card:5d}  rompecabezas={board:4d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Utilidades compartidas por las páginas de los juegos.
+
+Todo lo que vive aquí se importa una sola vez por proceso, así que los
+cachés a nivel de módulo se comparten entre sesiones y reruns.
+"""
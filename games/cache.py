@@ -0,0 +1,105 @@
+"""Caché LRU en memoria, compartido por todo el proceso y acotado por tamaño."""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class BytesLRU:
+    """LRU acotado por bytes (no por número de entradas).
+
+    ``sizeof`` devuelve el peso aproximado de cada valor; cuando la suma pasa
+    de ``max_bytes`` se desalojan las entradas usadas hace más tiempo.
+    Es seguro llamarlo desde varios hilos (cada sesión de Streamlit corre en
+    el suyo).
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._data[key] = (value, size)
+            self.nbytes += size
+            # Nunca desalojamos la entrada recién puesta, aunque sola exceda el límite
+            while self.nbytes > self.max_bytes and len(self._data) > 1:
+                _, (_, s) = self._data.popitem(last=False)
+                self.nbytes -= s
+                self.evictions += 1
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            # Construimos fuera del lock: dos sesiones pueden construir a la vez
+            # la misma entrada, pero ninguna bloquea a las demás mientras tanto.
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+# path -> (mtime_ns, size, digest); evita leer y hashear el archivo en cada rerun
+_file_digests: dict[str, tuple[int, int, str]] = {}
+_file_digests_lock = threading.Lock()
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    info = os.stat(path)
+    with _file_digests_lock:
+        memo = _file_digests.get(path)
+    if memo and memo[0] == info.st_mtime_ns and memo[1] == info.st_size:
+        return memo[2]
+    with open(path, "rb") as f:
+        digest = content_digest(f.read())
+    with _file_digests_lock:
+        _file_digests[path] = (info.st_mtime_ns, info.st_size, digest)
+    return digest
@@ -0,0 +1,181 @@
+"""Collage de las fotos emparejadas, armado en segundo plano.
+
+Al empezar la partida ya se sabe qué fotos salen, así que el lienzo y la
+posición de cada una quedan fijos desde el principio. Cada pareja encontrada
+manda su foto a un pool de hilos que la pega en su casilla (a partir de la
+miniatura cuadrada ya cacheada) y el hilo que pega la última codifica el
+JPEG final. Cuando el jugador encuentra la última pareja solo falta esa
+casilla: el collage sale sin esperar a que se procese todo.
+
+Los collages terminados viven en un LRU del proceso con clave ``(hash de
+cada foto, layout)``: otra partida con las mismas fotos lo reutiliza.
+"""
+from __future__ import annotations
+
+import io
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from PIL import Image
+
+from games.cache import BytesLRU, file_digest
+from games.variants import thumbnail_for_file
+
+COLLAGE_TILE = 240        # px por foto
+COLLAGE_GAP = 8
+COLLAGE_MAX_PX = 2400     # con muchas fotos la casilla se achica para no pasar de esto
+COLLAGE_BACKGROUND = (255, 255, 255)
+COLLAGE_QUALITY = 85
+COLLAGE_WORKERS = 2
+COLLAGES_MAX_BYTES = 16 * 1024 * 1024
+# Lienzos de partidas en curso (~RGB sin comprimir); una partida abandonada
+# se desaloja y se rearma si vuelve
+JOBS_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CollageLayout:
+    cols: int
+    rows: int
+    tile: int
+    gap: int
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return (
+            self.cols * self.tile + (self.cols + 1) * self.gap,
+            self.rows * self.tile + (self.rows + 1) * self.gap,
+        )
+
+    def origin(self, slot: int) -> tuple[int, int]:
+        r, c = divmod(slot, self.cols)
+        return self.gap + c * (self.tile + self.gap), self.gap + r * (self.tile + self.gap)
+
+
+def collage_layout(n: int, tile: int = COLLAGE_TILE, gap: int = COLLAGE_GAP,
+                   max_px: int = COLLAGE_MAX_PX) -> CollageLayout:
+    """Grilla casi cuadrada para ``n`` fotos que no pasa de ``max_px`` de ancho."""
+    cols = max(1, math.ceil(math.sqrt(n)))
+    rows = max(1, math.ceil(n / cols))
+    tile = max(32, min(tile, (max_px - (cols + 1) * gap) // cols))
+    return CollageLayout(cols, rows, tile, gap)
+
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=COLLAGE_WORKERS, thread_name_prefix="collage")
+        return _pool
+
+
+class CollageJob:
+    """Un collage en construcción: ``add`` es idempotente y no bloquea."""
+
+    def __init__(self, key, paths: tuple[str, ...], layout: CollageLayout):
+        self.key = key
+        self.paths = paths
+        self.layout = layout
+        self.slots = {path: i for i, path in enumerate(paths)}
+        self.canvas = Image.new("RGB", layout.size, COLLAGE_BACKGROUND)
+        self.data: bytes | None = None
+        self._futures: dict[int, Future] = {}
+        self._pasted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self.canvas.width * self.canvas.height * 3
+
+    @property
+    def pasted(self) -> int:
+        return self._pasted
+
+    @property
+    def complete(self) -> bool:
+        return self.data is not None
+
+    def add(self, path: str) -> None:
+        slot = self.slots[path]
+        with self._lock:
+            if slot in self._futures or self.data is not None:
+                return
+            self._futures[slot] = _executor().submit(self._paste, slot)
+
+    def ensure(self, paths) -> None:
+        """Manda a pegar las fotos de ``paths`` que falten (una vez cada una)."""
+        for path in paths:
+            self.add(path)
+
+    def _paste(self, slot: int) -> None:
+        thumb = thumbnail_for_file(self.paths[slot], self.layout.tile)
+        with Image.open(io.BytesIO(thumb.data)) as tile:
+            tile = tile.convert("RGB")
+        with self._lock:
+            self.canvas.paste(tile, self.layout.origin(slot))
+            self._pasted += 1
+            last = self._pasted == len(self.paths)
+        if last:
+            self._encode()
+
+    def _encode(self) -> None:
+        buf = io.BytesIO()
+        self.canvas.save(buf, format="JPEG", quality=COLLAGE_QUALITY, optimize=True)
+        self.data = buf.getvalue()
+        _COLLAGES.put(self.key, self.data)
+
+    def result(self, timeout: float | None = None) -> bytes | None:
+        """El JPEG final, esperando hasta ``timeout`` a las casillas pendientes.
+
+        ``None`` si todavía faltan fotos por agregar o no terminó a tiempo.
+        """
+        if self.data is not None:
+            return self.data
+        with self._lock:
+            futures = list(self._futures.values())
+        if len(futures) < len(self.paths):
+            return None
+        done, _ = wait(futures, timeout=timeout)
+        for f in done:
+            f.result()  # propaga errores de lectura de las fotos
+        return self.data
+
+
+_COLLAGES = BytesLRU(COLLAGES_MAX_BYTES)
+_JOBS = BytesLRU(JOBS_MAX_BYTES, sizeof=lambda j: j.nbytes)
+
+
+def collage_key(paths, layout: CollageLayout) -> tuple:
+    return (tuple(file_digest(p) for p in paths), layout)
+
+
+def collage_job(paths, layout: CollageLayout | None = None) -> CollageJob:
+    """El collage de ``paths`` (en este orden), compartido por el proceso.
+
+    Si ya se terminó uno con las mismas fotos y layout, viene completo.
+    """
+    paths = tuple(paths)
+    layout = layout or collage_layout(len(paths))
+    key = collage_key(paths, layout)
+
+    def create() -> CollageJob:
+        job = CollageJob(key, paths, layout)
+        data = _COLLAGES.get(key)
+        if data is not None:
+            job.data = data
+        return job
+
+    job = _JOBS.get_or_create(key, create)
+    if job.data is None and key in _COLLAGES:
+        job.data = _COLLAGES.get(key)
+    return job
+
+
+def collage_stats() -> dict:
+    return {"collages": _COLLAGES.stats(), "jobs": _JOBS.stats()}
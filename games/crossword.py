@@ -0,0 +1,275 @@
+"""Layout del crucigrama (colocación, compactado y numeración), sin Streamlit.
+
+La colocación la hace ``games.crossword_engine``; aquí se numera la grilla.
+
+El layout depende solo del contenido de las pistas, así que se calcula una
+vez por hash de ``CLUES`` y se comparte entre sesiones; opcionalmente se
+guarda como JSON para que los siguientes arranques del servidor lo lean en
+vez de regenerarlo.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unicodedata
+from dataclasses import dataclass
+from functools import cached_property
+
+from games.crossword_engine import H, V, EngineError, construct, search
+
+# Sube este número si cambia el algoritmo: invalida los JSON ya guardados
+LAYOUT_VERSION = 3
+LAYOUT_SEED = 0
+LAYOUT_BUDGET = 2.0   # s como máximo para construir un layout
+
+DEFAULT_ARTIFACT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "crossword"
+)
+
+
+class LayoutError(ValueError):
+    pass
+
+
+def normalize_answer(s: str) -> str:
+    s = s.lower()
+    s = "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")  # sin acentos
+    s = "".join(ch for ch in s if "a" <= ch <= "z")  # solo letras
+    return s
+
+
+@dataclass(frozen=True)
+class Layout:
+    digest: str
+    rows: int
+    cols: int
+    grid: tuple               # una fila ``bytes`` por fila de la grilla; 0 = casilla negra
+    num_map: dict             # (r, c) -> número de la palabra que empieza ahí
+    across_list: list         # [(número, palabra, pista)]
+    down_list: list           # [(número, palabra, pista)]
+
+    @cached_property
+    def solution(self) -> dict:
+        """(r, c) -> letra; vista en diccionario de ``grid``."""
+        return {(r, c): chr(b) for r, row in enumerate(self.grid) for c, b in enumerate(row) if b}
+
+    def is_letter(self, r: int, c: int) -> bool:
+        return self.grid[r][c] != 0
+
+    def mask(self) -> str:
+        """``rows*cols`` caracteres por filas: "1" con letra, "0" negra."""
+        return b"".join(row.translate(_MASK) for row in self.grid).decode("ascii")
+
+    def to_json(self) -> dict:
+        return {
+            "version": LAYOUT_VERSION,
+            "digest": self.digest,
+            "rows": self.rows,
+            "cols": self.cols,
+            "grid": [row.replace(b"\0", b".").decode("ascii") for row in self.grid],
+            "num_map": [[r, c, n] for (r, c), n in sorted(self.num_map.items())],
+            "across": [list(x) for x in self.across_list],
+            "down": [list(x) for x in self.down_list],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Layout":
+        if data.get("version") != LAYOUT_VERSION:
+            raise LayoutError("layout guardado con otra versión del generador")
+        return cls(
+            digest=data["digest"],
+            rows=data["rows"],
+            cols=data["cols"],
+            grid=tuple(row.encode("ascii").replace(b".", b"\0") for row in data["grid"]),
+            num_map={(r, c): n for r, c, n in data["num_map"]},
+            across_list=[tuple(x) for x in data["across"]],
+            down_list=[tuple(x) for x in data["down"]],
+        )
+
+
+# 0 -> "0", cualquier letra -> "1"
+_MASK = bytes([ord("0")] + [ord("1")] * 255)
+
+
+def clues_digest(across, down, seeds: int = 1) -> str:
+    payload = json.dumps([LAYOUT_VERSION, seeds, list(map(list, across)), list(map(list, down))],
+                         ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def number_placements(placements, rows: int, cols: int):
+    """Grilla densa y numeración directo de las palabras colocadas.
+
+    Una pasada por las letras colocadas llena la grilla (``bytearray`` por
+    fila) y los números salen de ordenar los inicios de palabra por (fila,
+    columna); cada entrada ya trae su pista, sin buscarla por texto. El motor
+    garantiza que no hay palabras accidentales, así que el resultado coincide
+    con ``number_grid``.
+    """
+    grid = [bytearray(cols) for _ in range(rows)]
+    starts: dict = {}
+    for p in placements:
+        if p.orient == H:
+            grid[p.row][p.col:p.col + len(p.word)] = p.word.encode("ascii")
+        else:
+            for i, ch in enumerate(p.word.encode("ascii")):
+                grid[p.row + i][p.col] = ch
+        starts.setdefault((p.row, p.col), []).append(p)
+
+    num_map = {}
+    across_list = []
+    down_list = []
+    for number, pos in enumerate(sorted(starts), start=1):
+        num_map[pos] = number
+        for p in starts[pos]:
+            (across_list if p.orient == H else down_list).append((number, p.word, p.clue))
+    across_list.sort()
+    down_list.sort()
+    return tuple(bytes(row) for row in grid), num_map, across_list, down_list
+
+
+def number_grid(solution: dict, rows: int, cols: int):
+    """Numeración de "across" y "down" recorriendo la grilla ``(r, c) -> letra``.
+
+    Es la versión original (por diccionario); se conserva para validar que
+    una grilla no tenga palabras accidentales y como referencia en los
+    benchmarks.
+    """
+    def is_letter(r, c): return (r, c) in solution
+
+    def starts_across(r, c):
+        if not is_letter(r, c): return False
+        if c > 0 and is_letter(r, c-1): return False
+        if c+1 < cols and is_letter(r, c+1): return True
+        return False
+
+    def starts_down(r, c):
+        if not is_letter(r, c): return False
+        if r > 0 and is_letter(r-1, c): return False
+        if r+1 < rows and is_letter(r+1, c): return True
+        return False
+
+    def collect_word(r, c, orient):
+        s = []
+        rr, cc = r, c
+        while 0 <= rr < rows and 0 <= cc < cols and is_letter(rr, cc):
+            s.append(solution[(rr, cc)])
+            if orient == "H":
+                if cc+1 >= cols or not is_letter(rr, cc+1): break
+                cc += 1
+            else:
+                if rr+1 >= rows or not is_letter(rr+1, cc): break
+                rr += 1
+        return "".join(s)
+
+    num_map = {}
+    across_list = []
+    down_list = []
+    counter = 1
+
+    for r in range(rows):
+        for c in range(cols):
+            started = False
+            if starts_across(r, c):
+                w = collect_word(r, c, "H")
+                across_list.append((counter, w))
+                num_map[(r, c)] = counter
+                counter += 1
+                started = True
+            if starts_down(r, c):
+                w = collect_word(r, c, "V")
+                if not started:
+                    num_map[(r, c)] = counter
+                    counter += 1
+                down_list.append((num_map[(r, c)], w))
+    return num_map, across_list, down_list
+
+
+def build_layout(across, down, digest: str | None = None, seeds: int = 1,
+                 budget: float = LAYOUT_BUDGET) -> Layout:
+    """Coloca las palabras con el motor indexado y numera la grilla resultante.
+
+    ``across`` y ``down`` fijan la orientación de cada palabra; el motor ya
+    devuelve las posiciones compactadas al bounding box. Con ``seeds > 1``
+    se prueban varias semillas en paralelo y se queda la de mejor puntaje.
+    """
+    entries = [(q, w, H) for q, w in across] + [(q, w, V) for q, w in down]
+    try:
+        if seeds > 1:
+            result = search(entries, seeds=seeds, budget=budget)
+        else:
+            result = construct(entries, seed=LAYOUT_SEED, budget=budget)
+    except EngineError as e:
+        raise LayoutError(str(e)) from e
+    return layout_from_result(result, digest or clues_digest(across, down, seeds))
+
+
+def layout_from_result(result, digest: str) -> Layout:
+    grid, num_map, across_list, down_list = number_placements(result.placements, result.rows, result.cols)
+    return Layout(
+        digest=digest,
+        rows=result.rows,
+        cols=result.cols,
+        grid=grid,
+        num_map=num_map,
+        across_list=across_list,
+        down_list=down_list,
+    )
+
+
+# ===================================================================================
+# Caché: memoria del proceso (todas las sesiones) + JSON opcional en disco
+# ===================================================================================
+_LAYOUTS: dict[str, Layout] = {}
+_LAYOUTS_LOCK = threading.Lock()
+
+
+def load_layout_file(path: str) -> Layout | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return Layout.from_json(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_layout_file(layout: Layout, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(layout.to_json(), f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def layout_for(across, down, artifact_dir: str | None = None, seeds: int = 1,
+               budget: float = LAYOUT_BUDGET, artifact_path: str | None = None) -> Layout:
+    """Layout de estas pistas, calculado una sola vez por contenido.
+
+    Con ``artifact_dir`` también se lee/escribe ``<digest>.json`` ahí, así que
+    un servidor recién arrancado no tiene que regenerarlo; ``artifact_path``
+    fija el archivo (p. ej. junto a un paquete) y se reescribe si el digest
+    guardado no coincide. ``seeds`` entra en el digest (cambiarlo regenera);
+    ``budget`` no.
+    """
+    digest = clues_digest(across, down, seeds)
+    with _LAYOUTS_LOCK:
+        layout = _LAYOUTS.get(digest)
+    if layout is not None:
+        return layout
+
+    path = artifact_path
+    if path is None and artifact_dir:
+        path = os.path.join(artifact_dir, f"{digest}.json")
+    layout = load_layout_file(path) if path else None
+    if layout is None or layout.digest != digest:
+        layout = build_layout(across, down, digest, seeds, budget)
+        if path:
+            try:
+                save_layout_file(layout, path)
+            except OSError:
+                pass  # sin disco escribible seguimos con el caché en memoria
+    with _LAYOUTS_LOCK:
+        _LAYOUTS[digest] = layout
+    return layout
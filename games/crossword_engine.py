@@ -0,0 +1,479 @@
+"""Motor de construcción de crucigramas con índice de cruces y backtracking.
+
+- La ocupación vive en un lienzo denso (``bytearray`` de W×H): letra por
+  celda y, aparte, qué orientaciones ya pasan por ella.
+- Un índice letra -> celdas da en O(1) todos los puntos donde una palabra
+  nueva puede cruzar a las ya puestas.
+- Las palabras se colocan de la más larga a la más corta probando primero
+  las posiciones con más cruces (y que menos agrandan la grilla); si una
+  palabra no cabe se deshace la anterior y se prueba su siguiente opción.
+- Todo corre contra un presupuesto de tiempo: si se acaba, lo que falte se
+  coloca en modo voraz. Con la misma semilla el resultado es el mismo
+  mientras el presupuesto alcance; si se corta, hasta dónde llegó el
+  backtracking depende del reloj y el resultado puede cambiar.
+- ``search`` prueba K semillas en paralelo (un proceso por núcleo) y se
+  queda con el layout de mejor puntaje que haya terminado a tiempo.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+H, V = "H", "V"
+_BIT = {H: 1, V: 2}
+
+# Cuántas opciones por palabra se prueban antes de retroceder más arriba
+BEAM = 4
+# Cuántas palabras (de las que faltan) se miran para elegir la siguiente
+LOOKAHEAD = 8
+
+# Pesos del puntaje de un layout: más cruces y más densidad suman, más área
+# y palabras aisladas restan
+SCORE_WEIGHTS = {"crossings": 10.0, "density": 100.0, "area": 0.1, "isolated": 50.0}
+
+
+class EngineError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Placement:
+    word: str
+    clue: str
+    row: int
+    col: int
+    orient: str   # "H" o "V"
+
+    def cells(self):
+        dr, dc = (0, 1) if self.orient == H else (1, 0)
+        for i, ch in enumerate(self.word):
+            yield self.row + dr * i, self.col + dc * i, ch
+
+
+@dataclass(frozen=True)
+class EngineResult:
+    placements: tuple[Placement, ...]   # ya desplazadas a (0, 0)
+    rows: int
+    cols: int
+    crossings: int
+    isolated: int         # palabras que no cruzan a ninguna otra
+    elapsed: float
+    timed_out: bool
+    seed: int
+
+    @property
+    def letters(self) -> int:
+        return len({(r, c) for p in self.placements for r, c, _ in p.cells()})
+
+    @property
+    def density(self) -> float:
+        return self.letters / (self.rows * self.cols)
+
+    @property
+    def area(self) -> int:
+        return self.rows * self.cols
+
+
+class Board:
+    """Lienzo W×H con ocupación densa e índice letra -> celdas."""
+
+    def __init__(self, width: int, height: int):
+        self.w = width
+        self.h = height
+        self.cells = bytearray(width * height)   # 0 = vacía, si no ord(letra)
+        self.used = bytearray(width * height)    # bits de orientación (H=1, V=2)
+        self.index: dict[int, list[int]] = {}   # ord(letra) -> [idx]
+        self.bbox = None                         # (r0, c0, r1, c1) inclusivo
+        self.placed: list[tuple[Placement, list[int], tuple | None]] = []
+        self.crossings = 0
+
+    # ---------- consultas ----------
+    def check(self, word: str, r: int, c: int, orient: str) -> int:
+        """-1 si no se puede colocar; si se puede, cuántas letras cruza."""
+        L = len(word)
+        w = self.w
+        if orient == H:
+            if r < 1 or r > self.h - 2 or c < 1 or c + L > w - 1:
+                return -1
+            step, side = 1, w
+        else:
+            if c < 1 or c > w - 2 or r < 1 or r + L > self.h - 1:
+                return -1
+            step, side = w, 1
+        start = r * w + c
+        cells, used = self.cells, self.used
+        # Antes y después de la palabra tiene que haber hueco
+        if cells[start - step] or cells[start + L * step]:
+            return -1
+        bit = _BIT[orient]
+        crossings = 0
+        idx = start
+        for ch in word.encode("ascii"):
+            cur = cells[idx]
+            if cur:
+                if cur != ch or used[idx] & bit:
+                    return -1
+                crossings += 1
+            elif cells[idx - side] or cells[idx + side]:
+                # Celda nueva pegada a otra palabra paralela
+                return -1
+            idx += step
+        if crossings == L:
+            return -1
+        return crossings
+
+    def isolated(self) -> int:
+        """Palabras colocadas que no cruzan a ninguna otra."""
+        count = 0
+        for p, _, _ in self.placed:
+            step = 1 if p.orient == H else self.w
+            start = p.row * self.w + p.col
+            if not any(self.used[start + i * step] == 3 for i in range(len(p.word))):
+                count += 1
+        return count
+
+    def growth(self, word: str, r: int, c: int, orient: str) -> int:
+        """Cuánto crece el área del bounding box al colocar la palabra."""
+        r1 = r + (len(word) - 1 if orient == V else 0)
+        c1 = c + (len(word) - 1 if orient == H else 0)
+        if self.bbox is None:
+            return (r1 - r + 1) * (c1 - c + 1)
+        br0, bc0, br1, bc1 = self.bbox
+        old = (br1 - br0 + 1) * (bc1 - bc0 + 1)
+        new = (max(br1, r1) - min(br0, r) + 1) * (max(bc1, c1) - min(bc0, c) + 1)
+        return new - old
+
+    def crossing_candidates(self, word: str, orient_hint: str | None):
+        """Posiciones legales que cruzan al menos una letra ya colocada."""
+        seen = set()
+        out = []
+        w = self.w
+        orients = (orient_hint,) if orient_hint else (H, V)
+        for i, ch in enumerate(word.encode("ascii")):
+            for idx in self.index.get(ch, ()):
+                r, c = divmod(idx, w)
+                for orient in orients:
+                    if self.used[idx] & _BIT[orient]:
+                        continue
+                    start = (r, c - i, orient) if orient == H else (r - i, c, orient)
+                    if start in seen:
+                        continue
+                    seen.add(start)
+                    x = self.check(word, *start)
+                    if x > 0:
+                        out.append((x, -self.growth(word, *start), start))
+        return out
+
+    def free_candidates(self, word: str, orient_hint: str | None):
+        """Posiciones legales sin cruces (para palabras que no cruzan con nada)."""
+        out = []
+        orients = (orient_hint,) if orient_hint else (H, V)
+        if self.bbox is None:
+            r0, c0 = self.h // 2, max(1, (self.w - len(word)) // 2)
+            for orient in orients:
+                if self.check(word, r0, c0, orient) >= 0:
+                    out.append((0, 0, (r0, c0, orient)))
+            return out
+        br0, bc0, br1, bc1 = self.bbox
+        L = len(word)
+        for orient in orients:
+            for r in range(max(1, br0 - L - 1), min(self.h - 1, br1 + 3)):
+                for c in range(max(1, bc0 - L - 1), min(self.w - 1, bc1 + 3)):
+                    if self.check(word, r, c, orient) == 0:
+                        out.append((0, -self.growth(word, r, c, orient), (r, c, orient)))
+        return out
+
+    # ---------- cambios ----------
+    def place(self, word: str, clue: str, r: int, c: int, orient: str) -> int:
+        step = 1 if orient == H else self.w
+        bit = _BIT[orient]
+        idx = r * self.w + c
+        new = []
+        crossings = 0
+        for ch in word.encode("ascii"):
+            if self.cells[idx]:
+                crossings += 1
+            else:
+                self.cells[idx] = ch
+                self.index.setdefault(ch, []).append(idx)
+                new.append(idx)
+            self.used[idx] |= bit
+            idx += step
+        r1 = r + (len(word) - 1 if orient == V else 0)
+        c1 = c + (len(word) - 1 if orient == H else 0)
+        old_bbox = self.bbox
+        if old_bbox is None:
+            self.bbox = (r, c, r1, c1)
+        else:
+            br0, bc0, br1, bc1 = old_bbox
+            self.bbox = (min(br0, r), min(bc0, c), max(br1, r1), max(bc1, c1))
+        self.crossings += crossings
+        self.placed.append((Placement(word, clue, r, c, orient), new, old_bbox))
+        return crossings
+
+    def undo(self) -> None:
+        placement, new, old_bbox = self.placed.pop()
+        step = 1 if placement.orient == H else self.w
+        bit = _BIT[placement.orient]
+        idx = placement.row * self.w + placement.col
+        for _ in placement.word:
+            self.used[idx] &= ~bit
+            idx += step
+        # Las celdas nuevas se agregaron al final de cada lista del índice
+        for idx in reversed(new):
+            self.index[self.cells[idx]].pop()
+            self.cells[idx] = 0
+        self.crossings -= len(placement.word) - len(new)
+        self.bbox = old_bbox
+
+
+def _canvas_side(words) -> int:
+    total = sum(len(w) for w in words)
+    longest = max(len(w) for w in words)
+    return int(math.sqrt(total) * 2.5) + 2 * longest + 6
+
+
+def construct(entries, seed: int = 0, budget: float = 1.0) -> EngineResult:
+    """Construye un crucigrama con ``entries = [(pista, palabra, orient|None)]``.
+
+    ``orient`` fija la orientación de esa palabra ("H"/"V") o la deja libre
+    (``None``). ``budget`` es el tiempo máximo en segundos.
+    """
+    entries = [(clue, word, orient) for clue, word, orient in entries]
+    if not entries:
+        raise EngineError("No hay palabras para colocar.")
+    for clue, word, _ in entries:
+        if not word or not word.isascii() or not word.isalpha():
+            raise EngineError(f"La respuesta '{word}' debe ser solo letras a-z.")
+
+    t0 = time.perf_counter()
+    deadline = t0 + budget
+    rng = random.Random(seed)
+    # De la más larga a la más corta; la semilla desempata
+    order = sorted(entries, key=lambda e: (-len(e[1]), rng.random()))
+    side = _canvas_side([w for _, w, _ in entries])
+    board = Board(side, side)
+
+    def candidates(entry, first: bool):
+        clue, word, orient = entry
+        cands = board.free_candidates(word, orient) if first else board.crossing_candidates(word, orient)
+        # Más cruces primero, luego menos crecimiento; la semilla desempata
+        cands.sort(key=lambda x: (x[0], x[1], rng.random()), reverse=True)
+        return cands
+
+    # ---------- backtracking iterativo ----------
+    # En cada nivel se elige la siguiente palabra (por largo) que sí puede
+    # cruzar con lo ya puesto; con orientaciones fijas esto evita, p. ej.,
+    # intentar dos verticales seguidas que nunca se cruzan.
+    n = len(order)
+    remaining = list(range(n))
+    stack: list[list] = []   # por nivel: [palabra, candidatos, siguiente, colocada, suelta]
+    backtracks_left = 50 * n
+    timed_out = False
+    depth = 0
+    while depth < n:
+        if time.perf_counter() > deadline:
+            timed_out = True
+            break
+        if depth == len(stack):
+            chosen, cands = remaining[0], []
+            if not board.placed:
+                cands = candidates(order[chosen], True)
+            else:
+                for i in remaining[:LOOKAHEAD]:
+                    cands = candidates(order[i], False)
+                    if cands:
+                        chosen = i
+                        break
+            remaining.remove(chosen)
+            stack.append([chosen, cands, 0, False, False])
+        frame = stack[depth]
+        if frame[3]:
+            board.undo()
+            frame[3] = False
+        chosen, cands, nxt = frame[0], frame[1], frame[2]
+        if nxt < len(cands) and nxt < BEAM:
+            _, _, (r, c, orient) = cands[nxt]
+            clue, word, _ = order[chosen]
+            board.place(word, clue, r, c, orient)
+            frame[2] = nxt + 1
+            frame[3] = True
+            frame[4] = False
+            depth += 1
+        elif depth == 0:
+            break  # se agotó todo el árbol
+        elif backtracks_left > 0:
+            # Sin opciones aquí: probamos la siguiente opción del nivel anterior
+            backtracks_left -= 1
+            stack.pop()
+            bisect.insort(remaining, chosen)
+            depth -= 1
+        else:
+            # Sin retrocesos disponibles: esta palabra se coloca suelta al final
+            frame[4] = True
+            depth += 1
+
+    # ---------- lo que quedó: voraz (cruzando si se puede) y luego sueltas ----------
+    pending = [order[f[0]] for f in stack if not f[3]] + [order[i] for i in remaining]
+    loose = []
+    for entry in pending:
+        cands = candidates(entry, not board.placed)
+        if cands and (cands[0][0] > 0 or not board.placed):
+            _, _, (r, c, orient) = cands[0]
+            board.place(entry[1], entry[0], r, c, orient)
+        else:
+            loose.append(entry)
+    for entry in loose:
+        cands = candidates(entry, True)
+        if not cands:
+            raise EngineError(f"No pude colocar '{entry[1]}'.")
+        _, _, (r, c, orient) = cands[0]
+        board.place(entry[1], entry[0], r, c, orient)
+
+    # ---------- normaliza al bounding box ----------
+    r0, c0, r1, c1 = board.bbox
+    placements = tuple(
+        Placement(p.word, p.clue, p.row - r0, p.col - c0, p.orient) for p, _, _ in board.placed
+    )
+    return EngineResult(
+        placements=placements,
+        rows=r1 - r0 + 1,
+        cols=c1 - c0 + 1,
+        crossings=board.crossings,
+        isolated=board.isolated(),
+        elapsed=time.perf_counter() - t0,
+        timed_out=timed_out,
+        seed=seed,
+    )
+
+
+# ===================================================================================
+# Búsqueda con varias semillas
+# ===================================================================================
+def score(result: EngineResult, weights: dict = SCORE_WEIGHTS) -> float:
+    return (
+        weights["crossings"] * result.crossings
+        + weights["density"] * result.density
+        - weights["area"] * result.area
+        - weights["isolated"] * result.isolated
+    )
+
+
+def _better(a: EngineResult | None, b: EngineResult, weights: dict) -> bool:
+    """¿``b`` le gana a ``a``? A igual puntaje gana la semilla más baja."""
+    if a is None:
+        return True
+    sa, sb = score(a, weights), score(b, weights)
+    return sb > sa or (sb == sa and b.seed < a.seed)
+
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido por todo el proceso (todas las sesiones).
+
+    Se usa ``spawn``: hacer ``fork`` de un servidor con hilos (Streamlit)
+    puede dejar locks tomados en el hijo.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _POOL
+
+
+def search(entries, seeds: int = 8, budget: float = 2.0, weights: dict = SCORE_WEIGHTS,
+           parallel: bool = True) -> EngineResult:
+    """Corre ``construct`` con las semillas ``0..seeds-1`` y devuelve la mejor.
+
+    ``budget`` es el tiempo total en segundos: al agotarse se devuelve la
+    mejor de las que ya terminaron (cada corrida además tiene ``budget``
+    como tope propio, así que al menos una siempre termina). Las corridas
+    que no empezaron se cancelan; las que ya corren no se pueden parar
+    desde afuera y se dejan terminar, pero su backtracking se corta en el
+    mismo plazo que la búsqueda y las que arrancan después no hacen nada,
+    así que el pool queda libre enseguida (salvo el relleno voraz). Con
+    ``parallel=False`` (o si no se puede crear el pool) las semillas se
+    prueban en este proceso, una tras otra.
+    """
+    entries = [tuple(e) for e in entries]
+    seeds = max(1, seeds)
+    deadline = time.perf_counter() + budget
+    if seeds == 1 or not parallel:
+        return _search_serial(entries, seeds, deadline, weights)
+    try:
+        pool = _pool()
+        until = time.time() + budget
+        futures = {pool.submit(_run_seed, entries, seed, until) for seed in range(seeds)}
+        best = _collect(futures, deadline, weights)
+        if best is not None:
+            return best
+    except BrokenExecutor:
+        _reset_pool()
+    except (OSError, RuntimeError):
+        pass
+    return _search_serial(entries, seeds, deadline, weights)
+
+
+def _run_seed(entries, seed: int, until: float) -> EngineResult | None:
+    """Una semilla en el pool, con el plazo de la búsqueda (``time.time()``,
+    que sí se compara entre procesos) y no un ``budget`` entero desde que
+    arranca: las que esperaron turno no alargan la búsqueda y, si arrancan
+    con el plazo vencido, nadie espera su resultado."""
+    left = until - time.time()
+    if left <= 0:
+        return None
+    return construct(entries, seed, left)
+
+
+def _collect(futures, deadline: float, weights: dict) -> EngineResult | None:
+    best = None
+    pending = futures
+    try:
+        while pending:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0 and best is not None:
+                break
+            # Hasta tener un resultado se espera sin límite (cada corrida ya tiene tope)
+            done, pending = wait(pending, timeout=max(timeout, 0) if best is not None else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()  # EngineError se propaga: todas fallarían igual
+                if result is not None and _better(best, result, weights):
+                    best = result
+    finally:
+        # Solo se cancelan las que no empezaron; las que corren paran en ``until``
+        for future in pending:
+            future.cancel()
+    return best
+
+
+def _reset_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def _search_serial(entries, seeds: int, deadline: float, weights: dict) -> EngineResult:
+    best = None
+    for seed in range(seeds):
+        remaining = deadline - time.perf_counter()
+        if best is not None and remaining <= 0:
+            break
+        result = construct(entries, seed, max(remaining, 0.0))
+        if _better(best, result, weights):
+            best = result
+    return best
@@ -0,0 +1,134 @@
+"""Progreso del crucigrama por palabra, sin Streamlit.
+
+``WordIndex`` (uno por layout, compartido entre sesiones) dice qué palabras
+pasan por cada casilla: como mucho una horizontal y una vertical.
+``CrosswordState`` (uno por sesión) guarda la letra escrita en cada casilla y
+cuántas letras correctas lleva cada palabra, así que cambiar una casilla
+actualiza a lo sumo dos contadores y "¿resuelto?" es una comparación, sin
+recorrer la grilla.
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from dataclasses import dataclass
+
+NO_WORD = 0xFFFF  # casilla sin palabra en esa dirección
+
+
+@dataclass(frozen=True)
+class Word:
+    number: int
+    orient: str       # "H" o "V"
+    answer: str
+    cells: tuple      # índices r * cols + c
+
+
+class WordIndex:
+    """Casilla -> (palabra horizontal, palabra vertical) de un layout."""
+
+    def __init__(self, rows: int, cols: int, grid, num_map: dict, across_list, down_list):
+        self.rows = rows
+        self.cols = cols
+        # Letra correcta por casilla (0 = sin letra); ``grid`` son filas de bytes
+        self.answer = bytes(b"".join(grid))
+        self.letters = len(self.answer) - self.answer.count(0)
+
+        start = {n: (r, c) for (r, c), n in num_map.items()}
+        words = []
+        for orient, entries in (("H", across_list), ("V", down_list)):
+            dr, dc = (0, 1) if orient == "H" else (1, 0)
+            for number, answer, _clue in entries:
+                r, c = start[number]
+                cells = tuple((r + dr * i) * cols + c + dc * i for i in range(len(answer)))
+                words.append(Word(number, orient, answer, cells))
+        if len(words) >= NO_WORD:
+            raise ValueError(f"demasiadas palabras ({len(words)})")
+        self.words = tuple(words)
+        self.by_number = {(w.orient, w.number): i for i, w in enumerate(self.words)}
+
+        self.across = array("H", [NO_WORD]) * (rows * cols)
+        self.down = array("H", [NO_WORD]) * (rows * cols)
+        for i, word in enumerate(self.words):
+            target = self.across if word.orient == "H" else self.down
+            for idx in word.cells:
+                target[idx] = i
+
+    @classmethod
+    def from_layout(cls, layout) -> "WordIndex":
+        return cls(layout.rows, layout.cols, layout.grid, layout.num_map,
+                   layout.across_list, layout.down_list)
+
+    def words_at(self, r: int, c: int) -> tuple[int, ...]:
+        idx = r * self.cols + c
+        return tuple(w for w in (self.across[idx], self.down[idx]) if w != NO_WORD)
+
+
+_INDEXES: dict[str, WordIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def word_index_for(layout) -> WordIndex:
+    """``WordIndex`` del layout, construido una sola vez por digest."""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(layout.digest)
+        if index is None:
+            index = _INDEXES[layout.digest] = WordIndex.from_layout(layout)
+        return index
+
+
+class CrosswordState:
+    __slots__ = ("index", "letters", "word_correct", "words_done", "correct")
+
+    def __init__(self, index: WordIndex):
+        self.index = index
+        self.letters = bytearray(index.rows * index.cols)       # lo escrito (0 = vacía)
+        self.word_correct = array("H", [0]) * len(index.words)  # letras bien por palabra
+        self.words_done = 0
+        self.correct = 0                                        # casillas bien en total
+
+    @property
+    def solved(self) -> bool:
+        return self.correct == self.index.letters
+
+    @property
+    def total(self) -> int:
+        return self.index.letters
+
+    def word_done(self, i: int) -> bool:
+        return self.word_correct[i] == len(self.index.words[i].answer)
+
+    def set(self, r: int, c: int, ch: str) -> bool:
+        """Escribe ``ch`` ("" borra) en (r, c); devuelve si el crucigrama quedó resuelto."""
+        index = self.index
+        idx = r * index.cols + c
+        new = ord(ch) if ch else 0
+        old = self.letters[idx]
+        if new == old or not index.answer[idx]:
+            return self.correct == index.letters
+        self.letters[idx] = new
+        delta = (new == index.answer[idx]) - (old == index.answer[idx])
+        if delta:
+            self.correct += delta
+            for i in (index.across[idx], index.down[idx]):
+                if i == NO_WORD:
+                    continue
+                was_done = self.word_done(i)
+                self.word_correct[i] += delta
+                self.words_done += self.word_done(i) - was_done
+        return self.correct == index.letters
+
+    def clear(self) -> None:
+        self.letters = bytearray(len(self.letters))
+        self.word_correct = array("H", [0]) * len(self.index.words)
+        self.words_done = 0
+        self.correct = 0
+
+    def __getstate__(self):
+        return (self.index, bytes(self.letters), self.word_correct.tobytes(), self.words_done, self.correct)
+
+    def __setstate__(self, state):
+        self.index, letters, word_correct, self.words_done, self.correct = state
+        self.letters = bytearray(letters)
+        self.word_correct = array("H")
+        self.word_correct.frombytes(word_correct)
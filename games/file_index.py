@@ -0,0 +1,89 @@
+"""Índice perezoso de un directorio de archivos de datos (paquetes, niveles).
+
+Listar el directorio solo mira nombres; cada archivo se lee la primera vez
+que se pide su id y se vuelve a leer solo si cambió (mtime y tamaño). Las
+subclases dicen qué archivos cuentan (``_item_id``), cómo se leen
+(``_load``) y qué error levantar; ``_remember``/``_recall`` guardan lo leído
+en un ``dict`` salvo que la subclase lo deje en un caché acotado.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+
+class FileIndex:
+    error: type[Exception] = ValueError
+    noun = "archivo"            # para los mensajes: "No existe el <noun> ..."
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._paths: dict[str, str] | None = None            # id -> archivo
+        self._loaded: dict[str, tuple[tuple, Any]] = {}      # id -> ((mtime, tamaño), valor)
+        self._lock = threading.Lock()
+
+    # ---------- a definir por cada índice ----------
+    def _item_id(self, entry: os.DirEntry) -> str | None:
+        """El id de ``entry`` o ``None`` si no es un archivo de este índice."""
+        raise NotImplementedError
+
+    def _load(self, path: str) -> Any:
+        raise NotImplementedError
+
+    def _remember(self, item_id: str, stamp: tuple, value: Any) -> None:
+        with self._lock:
+            self._loaded[item_id] = (stamp, value)
+
+    def _recall(self, item_id: str, stamp: tuple) -> Any:
+        with self._lock:
+            cached = self._loaded.get(item_id)
+        return cached[1] if cached is not None and cached[0] == stamp else None
+
+    # ---------- índice ----------
+    def _scan(self) -> dict[str, str]:
+        with self._lock:
+            if self._paths is None:
+                paths = {}
+                try:
+                    entries = sorted(os.scandir(self.directory), key=lambda e: e.name)
+                except FileNotFoundError:
+                    entries = []
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    item_id = self._item_id(entry)
+                    if item_id is not None:
+                        paths.setdefault(item_id, entry.path)
+                self._paths = paths
+            return self._paths
+
+    def ids(self) -> list[str]:
+        return list(self._scan())
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._scan()
+
+    def __len__(self) -> int:
+        return len(self._scan())
+
+    def get(self, item_id: str) -> Any:
+        """El valor de ``item_id``; se vuelve a leer solo si el archivo cambió."""
+        path = self._scan().get(item_id)
+        if path is None:
+            raise self.error(f"No existe el {self.noun} '{item_id}' en {self.directory}")
+        try:
+            info = os.stat(path)
+        except OSError as e:
+            raise self.error(f"No se pudo leer el {self.noun} {path}: {e}") from e
+        stamp = (info.st_mtime_ns, info.st_size)
+        value = self._recall(item_id, stamp)
+        if value is None:
+            value = self._load(path)
+            self._remember(item_id, stamp, value)
+        return value
+
+    def refresh(self) -> None:
+        """Vuelve a listar el directorio (archivos nuevos o borrados)."""
+        with self._lock:
+            self._paths = None
@@ -0,0 +1,216 @@
+// Grilla del crucigrama como un solo elemento. Las letras se escriben en el
+// navegador (el cursor avanza solo por la palabra activa) y la grilla completa
+// viaja al servidor una sola vez, al enviar: {seq, values}.
+(function () {
+  "use strict";
+
+  var state = {
+    root: null, grid: null, inputs: [], mask: "", rows: 0, cols: 0,
+    submit: null, status: null, dir: "H", active: -1, locked: false,
+    values: null,        // lo último enviado o recibido
+    serverValues: null,  // lo último que mandó el servidor
+  };
+
+  function clean(ch) {
+    ch = (ch || "").toLowerCase().normalize("NFD").replace(/[^a-z]/g, "");
+    return ch.slice(-1);
+  }
+
+  function isLetter(idx, r, c) {
+    // r/c opcionales: evitan que idx ± 1 salte de fila
+    if (r !== undefined && (r < 0 || r >= state.rows || c < 0 || c >= state.cols)) return false;
+    return idx >= 0 && idx < state.mask.length && state.mask[idx] === "1";
+  }
+
+  function neighbour(idx, dir, delta) {
+    var r = Math.floor(idx / state.cols), c = idx % state.cols;
+    if (dir === "H") c += delta; else r += delta;
+    var next = r * state.cols + c;
+    return isLetter(next, r, c) ? next : -1;
+  }
+
+  function hasWord(idx, dir) {
+    return neighbour(idx, dir, -1) >= 0 || neighbour(idx, dir, 1) >= 0;
+  }
+
+  function wordCells(idx, dir) {
+    var cells = [idx], i = idx;
+    while ((i = neighbour(i, dir, -1)) >= 0) cells.unshift(i);
+    i = idx;
+    while ((i = neighbour(i, dir, 1)) >= 0) cells.push(i);
+    return cells;
+  }
+
+  function highlight() {
+    var word = state.active >= 0 ? wordCells(state.active, state.dir) : [];
+    state.inputs.forEach(function (input) {
+      if (input) input.parentNode.classList.remove("word");
+    });
+    word.forEach(function (idx) { state.inputs[idx].parentNode.classList.add("word"); });
+  }
+
+  function focusCell(idx) {
+    if (idx < 0) return;
+    state.inputs[idx].focus();
+    state.inputs[idx].select();
+  }
+
+  function build(root, args) {
+    root.innerHTML = "";
+    var grid = document.createElement("div");
+    grid.className = "cw-grid";
+    grid.style.gridTemplateColumns = "repeat(" + args.cols + ", 1fr)";
+    var numbers = {};
+    (args.numbers || []).forEach(function (pair) { numbers[pair[0]] = pair[1]; });
+    var inputs = [];
+    for (var idx = 0; idx < args.rows * args.cols; idx++) {
+      var cell = document.createElement("div");
+      if (args.mask[idx] !== "1") {
+        cell.className = "cw-block";
+        inputs.push(null);
+      } else {
+        cell.className = "cw-cell";
+        if (numbers[idx] !== undefined) {
+          var num = document.createElement("span");
+          num.className = "cw-num";
+          num.textContent = numbers[idx];
+          cell.appendChild(num);
+        }
+        var input = document.createElement("input");
+        input.className = "cw-input";
+        input.maxLength = 2;  // deja escribir encima; clean() se queda con la última
+        input.autocomplete = "off";
+        input.setAttribute("autocapitalize", "off");
+        input.spellcheck = false;
+        input.dataset.idx = idx;
+        cell.appendChild(input);
+        inputs.push(input);
+      }
+      grid.appendChild(cell);
+    }
+    grid.addEventListener("focusin", onFocus);
+    grid.addEventListener("mousedown", onMouseDown);
+    grid.addEventListener("input", onInput);
+    grid.addEventListener("keydown", onKeyDown);
+
+    var bar = document.createElement("div");
+    bar.className = "cw-bar";
+    var submit = document.createElement("button");
+    submit.className = "cw-submit";
+    submit.type = "button";
+    submit.addEventListener("click", send);
+    var status = document.createElement("span");
+    status.className = "cw-status";
+    bar.appendChild(submit);
+    bar.appendChild(status);
+
+    root.appendChild(grid);
+    root.appendChild(bar);
+    state.root = root;
+    state.grid = grid;
+    state.inputs = inputs;
+    state.submit = submit;
+    state.status = status;
+    state.mask = args.mask;
+    state.rows = args.rows;
+    state.cols = args.cols;
+    state.active = -1;
+    state.values = null;
+    state.serverValues = null;
+  }
+
+  function onFocus(event) {
+    var idx = Number(event.target.dataset.idx);
+    if (isNaN(idx)) return;
+    if (!hasWord(idx, state.dir)) state.dir = state.dir === "H" ? "V" : "H";
+    state.active = idx;
+    highlight();
+  }
+
+  function onMouseDown(event) {
+    // Clic sobre la casilla activa: cambia de horizontal a vertical
+    var idx = Number(event.target.dataset.idx);
+    if (idx === state.active && hasWord(idx, state.dir === "H" ? "V" : "H")) {
+      state.dir = state.dir === "H" ? "V" : "H";
+      highlight();
+    }
+  }
+
+  function onInput(event) {
+    var input = event.target, idx = Number(input.dataset.idx);
+    input.value = clean(input.value);
+    markDirty();
+    if (input.value) focusCell(neighbour(idx, state.dir, 1));
+  }
+
+  var ARROWS = {
+    ArrowLeft: ["H", -1], ArrowRight: ["H", 1], ArrowUp: ["V", -1], ArrowDown: ["V", 1],
+  };
+
+  function onKeyDown(event) {
+    var idx = Number(event.target.dataset.idx);
+    if (isNaN(idx)) return;
+    if (event.key === "Enter") {
+      event.preventDefault();
+      send();
+    } else if (event.key === "Backspace" && !event.target.value) {
+      // Casilla vacía: retrocede por la palabra y borra la anterior
+      event.preventDefault();
+      var prev = neighbour(idx, state.dir, -1);
+      if (prev >= 0) {
+        state.inputs[prev].value = "";
+        markDirty();
+        focusCell(prev);
+      }
+    } else if (ARROWS[event.key]) {
+      event.preventDefault();
+      var move = ARROWS[event.key];
+      state.dir = move[0];
+      var next = neighbour(idx, move[0], move[1]);
+      if (next >= 0) focusCell(next); else highlight();
+    }
+  }
+
+  function currentValues() {
+    return state.inputs.map(function (input) {
+      return input && input.value ? input.value : " ";
+    }).join("");
+  }
+
+  function markDirty() {
+    state.status.textContent = currentValues() === state.values ? "" : "Cambios sin enviar";
+  }
+
+  function send() {
+    if (state.locked) return;
+    state.values = currentValues();
+    state.status.textContent = "";
+    Streamlit.api.setValue({ seq: Streamlit.api.nextSeq(), values: state.values });
+  }
+
+  function render(root, args, api) {
+    if (state.mask !== args.mask || state.cols !== args.cols || !root.contains(state.grid)) {
+      build(root, args);
+    }
+    // Solo se pisan las casillas si el servidor cambió algo (p. ej. "Borrar
+    // entradas"); así no se pierde lo que se escribió mientras volvía el rerun.
+    if (args.values !== state.serverValues) {
+      var echo = args.values === state.values;  // el rerun de nuestro propio envío
+      state.serverValues = args.values;
+      state.values = args.values;
+      if (!echo) {
+        state.inputs.forEach(function (input, idx) {
+          if (input) input.value = clean(args.values[idx]);
+        });
+      }
+    }
+    state.locked = !!args.locked;
+    state.inputs.forEach(function (input) { if (input) input.disabled = state.locked; });
+    state.submit.textContent = args.submit_label || "Enviar";
+    state.submit.disabled = state.locked;
+    markDirty();
+    api.setHeight();
+  }
+
+  Streamlit.widgets.crossword_grid = { render: render };
+})();
@@ -0,0 +1,97 @@
+// Juego de memoria en el navegador: destapar, la espera de 0.8 s y el volteo
+// de un par que no coincide pasan aquí, sin reruns. Al servidor solo llega
+// cada par destapado {seq, a, b} para validarlo y contar movimientos. Las
+// imágenes se cargan una vez al empezar la partida (args.game).
+(function () {
+  "use strict";
+
+  var MISMATCH_MS = 800;
+
+  var state = {
+    grid: null, cards: [], deck: [], game: null, first: -1, busy: false,
+    matched: [], locked: false,
+  };
+
+  function build(root, args) {
+    root.innerHTML = "";
+    var grid = document.createElement("div");
+    grid.className = "mg-grid";
+    grid.style.gridTemplateColumns = "repeat(" + args.cols + ", 1fr)";
+    var cards = [];
+    args.deck.forEach(function (imgId, idx) {
+      var card = document.createElement("div");
+      card.className = "mg-card";
+      card.dataset.idx = idx;
+      var inner = document.createElement("div");
+      inner.className = "mg-inner";
+      var back = document.createElement("div");
+      back.className = "mg-face mg-back";
+      back.textContent = "?";
+      var front = document.createElement("img");
+      front.className = "mg-face mg-front";
+      front.src = args.images[imgId];
+      front.alt = "";
+      front.draggable = false;
+      inner.appendChild(back);
+      inner.appendChild(front);
+      card.appendChild(inner);
+      grid.appendChild(card);
+      cards.push(card);
+    });
+    grid.addEventListener("click", onClick);
+    root.appendChild(grid);
+    state.grid = grid;
+    state.cards = cards;
+    state.deck = args.deck.slice();
+    state.matched = args.deck.map(function () { return false; });
+    state.game = args.game;
+    state.first = -1;
+    state.busy = false;
+  }
+
+  function flip(idx, up) {
+    state.cards[idx].classList.toggle("up", up);
+  }
+
+  function onClick(event) {
+    var card = event.target.closest(".mg-card");
+    if (!card || state.locked || state.busy) return;
+    var idx = Number(card.dataset.idx);
+    if (state.matched[idx] || idx === state.first) return;
+    flip(idx, true);
+    if (state.first < 0) {
+      state.first = idx;  // la primera carta no sale del navegador
+      return;
+    }
+    var a = state.first, b = idx;
+    state.first = -1;
+    Streamlit.api.setValue({ seq: Streamlit.api.nextSeq(), a: a, b: b });
+    if (state.deck[a] === state.deck[b]) {
+      state.matched[a] = state.matched[b] = true;
+      state.cards[a].classList.add("matched");
+      state.cards[b].classList.add("matched");
+    } else {
+      state.busy = true;
+      setTimeout(function () {
+        flip(a, false);
+        flip(b, false);
+        state.busy = false;
+      }, MISMATCH_MS);
+    }
+  }
+
+  function render(root, args, api) {
+    if (state.game !== args.game || !root.contains(state.grid)) build(root, args);
+    // Lo que el servidor ya validó manda (p. ej. al volver a la página)
+    (args.matched || []).forEach(function (idx) {
+      state.matched[idx] = true;
+      flip(idx, true);
+      state.cards[idx].classList.add("matched");
+    });
+    state.locked = !!args.locked;
+    state.grid.classList.toggle("locked", state.locked);
+    api.setHeight();
+  }
+
+  Streamlit.widgets.memory_game = { render: render };
+})();
@@ -0,0 +1,174 @@
+// Tablero de Pac-Man que se pinta por casillas. El laberinto (muros y
+// pellets) llega una vez por partida en args.layout; cada turno trae solo el
+// jugador, los fantasmas y las casillas que cambiaron (args.changed), sobre la
+// revisión args.base. Si este iframe no tiene esa revisión (se volvió a crear
+// o se perdió un render) pide al servidor el laberinto completo con resync.
+//
+// Las jugadas (flechas/WASD, deslizar el dedo o los botones del pad) se
+// encolan aquí y salen como una tira de letras "udlr" en {seq, moves}: una en
+// el siguiente cuadro de animación y, mientras el servidor procesa ese lote,
+// las siguientes se juntan en el próximo. Un rerun aplica el lote completo
+// y su render (args.ack) libera el envío del siguiente.
+(function () {
+  "use strict";
+
+  var ITEM_CLASS = { " ": "", ".": "pellet", "o": "power" };
+  var KEYS = {
+    ArrowUp: "u", ArrowDown: "d", ArrowLeft: "l", ArrowRight: "r",
+    w: "u", s: "d", a: "l", d: "r", W: "u", S: "d", A: "l", D: "r",
+  };
+  var PAD = [["", "u", ""], ["l", "d", "r"]];
+  var PAD_LABEL = { u: "⬆️", d: "⬇️", l: "⬅️", r: "➡️" };
+  var MAX_BATCH = 32;        // lo mismo acota el servidor
+  var INFLIGHT_MS = 3000;    // sin respuesta en este tiempo, se manda lo que haya
+
+  var state = {
+    board: null, cells: [], game: null, rev: -1, asked: null,
+    actors: [], locked: false, queue: "", inflight: 0, sentAt: 0, frame: 0,
+    listening: false,
+  };
+
+  function enqueue(letter) {
+    if (state.locked || !letter) return;
+    state.queue += letter;
+    schedule();
+  }
+
+  function waiting() {
+    return state.inflight && Date.now() - state.sentAt < INFLIGHT_MS;
+  }
+
+  function schedule() {
+    if (state.frame || !state.queue || waiting()) return;
+    state.frame = requestAnimationFrame(flush);
+  }
+
+  function flush() {
+    state.frame = 0;
+    if (!state.queue || state.locked || waiting()) return;
+    var moves = state.queue.slice(0, MAX_BATCH);
+    state.queue = state.queue.slice(MAX_BATCH);
+    state.inflight = Streamlit.api.nextSeq();
+    state.sentAt = Date.now();
+    Streamlit.api.setValue({ seq: state.inflight, moves: moves });
+  }
+
+  function listen(root) {
+    if (state.listening) return;
+    state.listening = true;
+    document.addEventListener("keydown", function (event) {
+      var letter = KEYS[event.key];
+      if (!letter) return;
+      event.preventDefault();  // que las flechas no muevan la página
+      enqueue(letter);
+    });
+    var start = null;
+    root.addEventListener("touchstart", function (event) {
+      var t = event.touches[0];
+      start = { x: t.clientX, y: t.clientY };
+    }, { passive: true });
+    root.addEventListener("touchend", function (event) {
+      if (!start) return;
+      var t = event.changedTouches[0];
+      var dx = t.clientX - start.x, dy = t.clientY - start.y;
+      start = null;
+      if (Math.max(Math.abs(dx), Math.abs(dy)) < 20) return;
+      enqueue(Math.abs(dx) > Math.abs(dy) ? (dx > 0 ? "r" : "l") : (dy > 0 ? "d" : "u"));
+    });
+  }
+
+  function buildPad(root) {
+    var pad = document.createElement("div");
+    pad.className = "pm-pad";
+    PAD.forEach(function (row) {
+      row.forEach(function (letter) {
+        var btn = document.createElement(letter ? "button" : "span");
+        if (letter) {
+          btn.className = "pm-key";
+          btn.type = "button";
+          btn.textContent = PAD_LABEL[letter];
+          btn.addEventListener("click", function () { enqueue(letter); });
+        }
+        pad.appendChild(btn);
+      });
+    });
+    root.appendChild(pad);
+  }
+
+  function build(root, args) {
+    root.innerHTML = "";
+    var board = document.createElement("div");
+    board.className = "pm-board";
+    board.style.gridTemplateColumns = "repeat(" + args.cols + ", " + args.cell + "px)";
+    board.style.gridAutoRows = args.cell + "px";
+    var cells = [];
+    for (var i = 0; i < args.layout.length; i++) {
+      var cell = document.createElement("div");
+      var code = args.layout.charAt(i);
+      cell.className = code === "#" ? "pm-cell pm-wall" : "pm-cell pm-floor";
+      setItem(cell, code);
+      board.appendChild(cell);
+      cells.push(cell);
+    }
+    root.appendChild(board);
+    buildPad(root);
+    listen(root);
+    state.board = board;
+    state.cells = cells;
+    state.actors = [];
+  }
+
+  function setItem(cell, code) {
+    cell.classList.remove("pellet", "power");
+    if (ITEM_CLASS[code]) cell.classList.add(ITEM_CLASS[code]);
+  }
+
+  function placeActors(args) {
+    state.actors.forEach(function (cell) { cell.innerHTML = ""; });
+    state.actors = [];
+    var put = function (idx, cls) {
+      var cell = state.cells[idx];
+      if (!cell || cell.firstChild) return;  // dos fantasmas juntos: se ve el primero
+      var actor = document.createElement("div");
+      actor.className = cls;
+      cell.appendChild(actor);
+      state.actors.push(cell);
+    };
+    put(args.player, "pm-pacman");
+    args.ghosts.forEach(function (idx, i) { put(idx, i === 1 ? "pm-ghost blue" : "pm-ghost"); });
+    state.board.classList.toggle("fright", !!args.fright);
+    state.board.classList.toggle("locked", state.locked);
+  }
+
+  function render(root, args, api) {
+    // args.ack es el último evento que aplicó el servidor: si ya incluye el
+    // lote en vuelo, sale el siguiente (antes no, para no pisar el valor)
+    if (state.inflight && args.ack >= state.inflight) state.inflight = 0;
+    state.locked = !!args.locked;
+    if (state.locked) state.queue = "";
+    schedule();
+    if (args.layout) {
+      build(root, args);
+    } else if (state.game !== args.game || !root.contains(state.board) || args.base !== state.rev) {
+      if (args.rev === state.rev && state.game === args.game && root.contains(state.board)) {
+        placeActors(args);  // el mismo envío repetido por un rerun sin cambios
+        return;
+      }
+      if (state.asked !== args.rev) {
+        state.asked = args.rev;
+        state.inflight = api.nextSeq();
+        state.sentAt = Date.now();
+        api.setValue({ seq: state.inflight, resync: true });
+      }
+      return;
+    } else {
+      args.changed.forEach(function (change) { setItem(state.cells[change[0]], change[1]); });
+    }
+    state.game = args.game;
+    state.rev = args.rev;
+    placeActors(args);
+    api.setHeight();
+  }
+
+  Streamlit.widgets.pacman_board = { render: render };
+})();
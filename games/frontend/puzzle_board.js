@@ -0,0 +1,77 @@
+// Tablero del rompecabezas como un solo elemento: una sola imagen (sprite) y
+// cada casilla la muestra con background-position. La selección es local (CSS);
+// solo el segundo clic manda al servidor el intercambio {seq, a, b}.
+(function () {
+  "use strict";
+
+  var state = { board: null, cells: [], sel: null, n: 0, order: [], locked: false };
+
+  function build(root, n) {
+    root.innerHTML = "";
+    var board = document.createElement("div");
+    board.className = "pz-board";
+    board.style.gridTemplateColumns = "repeat(" + n + ", 1fr)";
+    var cells = [];
+    for (var pos = 0; pos < n * n; pos++) {
+      var cell = document.createElement("div");
+      cell.className = "pz-cell";
+      cell.dataset.pos = pos;
+      board.appendChild(cell);
+      cells.push(cell);
+    }
+    board.addEventListener("click", onClick);
+    root.appendChild(board);
+    state.board = board;
+    state.cells = cells;
+    state.n = n;
+    state.sel = null;
+  }
+
+  function onClick(event) {
+    var cell = event.target.closest(".pz-cell");
+    if (!cell || state.locked) return;
+    var pos = Number(cell.dataset.pos);
+    if (state.sel === null) {
+      state.sel = pos;
+      cell.classList.add("selected");
+      return;
+    }
+    var a = state.sel;
+    state.cells[a].classList.remove("selected");
+    state.sel = null;
+    if (a !== pos) {
+      // Intercambio optimista: se ve al instante y el rerun trae el mismo orden
+      var order = state.order;
+      var tmp = order[a]; order[a] = order[pos]; order[pos] = tmp;
+      paint(a); paint(pos);
+      Streamlit.api.setValue({ seq: Streamlit.api.nextSeq(), a: a, b: pos });
+    }
+  }
+
+  function paint(pos) {
+    var n = state.n, span = n > 1 ? n - 1 : 1, tile = state.order[pos];
+    state.cells[pos].style.backgroundPosition =
+      ((tile % n) / span * 100) + "% " + (Math.floor(tile / n) / span * 100) + "%";
+  }
+
+  function render(root, args, api) {
+    var n = args.n;
+    if (state.n !== n || !root.contains(state.board)) build(root, n);
+    state.locked = !!args.locked;
+    state.board.classList.toggle("locked", state.locked);
+    state.order = args.order.slice();
+    var image = "url(" + args.sprite + ")";
+    var size = (n * 100) + "% " + (n * 100) + "%";
+    for (var pos = 0; pos < n * n; pos++) {
+      var style = state.cells[pos].style;
+      if (style.backgroundImage !== image) {
+        style.backgroundImage = image;
+        style.backgroundSize = size;
+      }
+      paint(pos);
+    }
+    api.setHeight();
+  }
+
+  Streamlit.widgets.puzzle_board = { render: render };
+})();
@@ -0,0 +1,61 @@
+// Protocolo mínimo de componentes de Streamlit (equivale a streamlit-component-lib,
+// sin React ni build). Cada widget se registra en Streamlit.widgets[kind] con
+// render(root, args, api) y el servidor elige cuál usar con el argumento "kind".
+(function () {
+  "use strict";
+
+  function send(type, data) {
+    window.parent.postMessage(
+      Object.assign({ isStreamlitMessage: true, type: type }, data || {}), "*");
+  }
+
+  var lastHeight = -1;
+  var api = {
+    setValue: function (value) {
+      send("streamlit:setComponentValue", { value: value, dataType: "json" });
+    },
+    setHeight: function (height) {
+      height = Math.ceil(height === undefined ? document.body.scrollHeight : height);
+      if (height !== lastHeight) {
+        lastHeight = height;
+        send("streamlit:setFrameHeight", { height: height });
+      }
+    },
+    // Número de evento creciente; el servidor lo usa para no aplicar dos
+    // veces el mismo valor, que Streamlit repite en cada rerun.
+    nextSeq: (function () {
+      var seq = Date.now();
+      return function () { return ++seq; };
+    })(),
+  };
+
+  var Streamlit = {
+    widgets: {},
+    api: api,
+    start: function (root) {
+      var current = null;
+      window.addEventListener("message", function (event) {
+        var data = event.data;
+        if (!data || data.type !== "streamlit:render") return;
+        var args = data.args || {};
+        var widget = Streamlit.widgets[args.kind];
+        if (!widget) {
+          root.textContent = "Widget desconocido: " + args.kind;
+          api.setHeight();
+          return;
+        }
+        if (current !== args.kind) {
+          root.innerHTML = "";
+          current = args.kind;
+        }
+        widget.render(root, args, api);
+      });
+      if (window.ResizeObserver) {
+        new ResizeObserver(function () { api.setHeight(); }).observe(document.body);
+      }
+      send("streamlit:componentReady", { apiVersion: 1 });
+    },
+  };
+
+  window.Streamlit = Streamlit;
+})();
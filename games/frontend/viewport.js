@@ -0,0 +1,37 @@
+// Reporta al servidor el ancho disponible y la densidad de la pantalla para
+// que elija la variante de imagen adecuada. Solo manda algo si cambió
+// respecto a lo que el servidor ya sabe (args.known), así no provoca reruns
+// de más; los cambios de tamaño se agrupan con un pequeño retraso.
+(function () {
+  "use strict";
+
+  var known = null, timer = null;
+
+  function measure() {
+    return {
+      width: Math.round(document.documentElement.clientWidth || window.innerWidth),
+      screen: Math.round(window.screen ? window.screen.width : 0),
+      dpr: Math.round((window.devicePixelRatio || 1) * 100) / 100,
+    };
+  }
+
+  function report() {
+    var now = measure();
+    if (known && known.width === now.width && known.dpr === now.dpr) return;
+    known = now;
+    Streamlit.api.setValue(now);
+  }
+
+  function render(root, args, api) {
+    known = args.known || null;
+    api.setHeight(0);
+    report();
+  }
+
+  window.addEventListener("resize", function () {
+    clearTimeout(timer);
+    timer = setTimeout(report, 300);
+  });
+
+  Streamlit.widgets.viewport = { render: render };
+})();
@@ -0,0 +1,237 @@
+"""Caché HTTP en disco para imágenes remotas (p. ej. ``PUZZLE_IMAGE_URL``).
+
+- Dentro del TTL se sirve la copia local sin tocar la red.
+- Pasado el TTL se sigue sirviendo la copia vieja y un hilo en segundo plano
+  revalida con ``If-None-Match`` / ``If-Modified-Since`` (304 = sigue igual).
+- Solo la primera descarga de una URL bloquea al script, y siempre con
+  timeout de conexión, timeout de lectura y tamaño máximo.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, replace
+
+from games.cache import content_digest
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http")
+DEFAULT_TTL = 3600             # s antes de revalidar
+DEFAULT_CONNECT_TIMEOUT = 3.0  # s para conectar (y para cada lectura bloqueante)
+DEFAULT_READ_TIMEOUT = 10.0    # s como máximo para bajar el cuerpo completo
+DEFAULT_MAX_BYTES = 15 * 1024 * 1024
+RETRY_DELAY = 60.0             # s sin reintentar una revalidación que falló
+CHUNK = 64 * 1024
+
+
+class FetchError(OSError):
+    pass
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    path: str                 # cuerpo en disco
+    digest: str               # blake2b del cuerpo, sirve de clave para otros cachés
+    size: int
+    fetched_at: float         # última vez que el servidor confirmó este contenido
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class HttpCache:
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIR,
+        ttl: float = DEFAULT_TTL,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_bytes = max_bytes
+        self._entries: dict[str, CachedResponse] = {}
+        self._refreshing: dict[str, threading.Thread] = {}
+        self._retry_after: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ---------- API ----------
+    def get(self, url: str) -> CachedResponse:
+        """Entrada cacheada de ``url``; solo bloquea si nunca se descargó."""
+        entry = self._entry(url)
+        if entry is None:
+            return self._fetch(url, None)
+        if time.time() - entry.fetched_at >= self.ttl:
+            self._refresh_in_background(url, entry)
+        return entry
+
+    def fetch_bytes(self, url: str) -> bytes:
+        return self.get(url).read()
+
+    def wait_for_refresh(self, url: str, timeout: float | None = None) -> None:
+        with self._lock:
+            thread = self._refreshing.get(url)
+        if thread is not None:
+            thread.join(timeout)
+
+    # ---------- disco ----------
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def _entry(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None:
+            return entry
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if os.path.getsize(body_path) != meta["size"]:
+                return None
+            entry = CachedResponse(path=body_path, **meta)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def _store(self, entry: CachedResponse, body: bytes | None) -> CachedResponse:
+        os.makedirs(self.directory, exist_ok=True)
+        body_path, meta_path = self._paths(entry.url)
+        if body is not None:
+            _atomic_write(body_path, body)
+        meta = {
+            "url": entry.url, "digest": entry.digest, "size": entry.size,
+            "fetched_at": entry.fetched_at, "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        entry = replace(entry, path=body_path)
+        with self._lock:
+            self._entries[entry.url] = entry
+        return entry
+
+    # ---------- red ----------
+    def _fetch(self, url: str, cached: CachedResponse | None) -> CachedResponse:
+        req = urllib.request.Request(url, headers={"User-Agent": "lets-play/1.0"})
+        if cached is not None:
+            if cached.etag:
+                req.add_header("If-None-Match", cached.etag)
+            if cached.last_modified:
+                req.add_header("If-Modified-Since", cached.last_modified)
+        try:
+            resp = urllib.request.urlopen(req, timeout=self.connect_timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                return self._store(replace(cached, fetched_at=time.time()), None)
+            raise FetchError(f"HTTP {e.code} al pedir {url}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise FetchError(f"Falló la petición a {url}: {e}") from e
+
+        with resp:
+            length = resp.headers.get("Content-Length")
+            if length and length.isdigit() and int(length) > self.max_bytes:
+                raise FetchError(f"{url} pesa {length} bytes (máximo {self.max_bytes})")
+            body = self._read_body(resp, url)
+            headers = resp.headers
+
+        entry = CachedResponse(
+            url=url,
+            path="",
+            digest=content_digest(body),
+            size=len(body),
+            fetched_at=time.time(),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        return self._store(entry, body)
+
+    def _read_body(self, resp, url: str) -> bytes:
+        deadline = time.monotonic() + self.read_timeout
+        chunks, total = [], 0
+        try:
+            while True:
+                # read1 devuelve lo que ya llegó sin esperar a juntar CHUNK bytes:
+                # un servidor que manda de a poco no estira el plazo total
+                chunk = resp.read1(CHUNK)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > self.max_bytes:
+                    raise FetchError(f"{url} supera el máximo de {self.max_bytes} bytes")
+                if time.monotonic() > deadline:
+                    raise FetchError(f"{url} tardó más de {self.read_timeout}s en descargarse")
+                chunks.append(chunk)
+        except OSError as e:  # timeout del socket entre lecturas
+            if isinstance(e, FetchError):
+                raise
+            raise FetchError(f"Lectura interrumpida de {url}: {e}") from e
+        return b"".join(chunks)
+
+    def _refresh_in_background(self, url: str, cached: CachedResponse) -> None:
+        with self._lock:
+            if url in self._refreshing or time.time() < self._retry_after.get(url, 0.0):
+                return
+            thread = threading.Thread(
+                target=self._refresh, args=(url, cached), name="http-cache-refresh", daemon=True
+            )
+            self._refreshing[url] = thread
+        thread.start()
+
+    def _refresh(self, url: str, cached: CachedResponse) -> None:
+        try:
+            self._fetch(url, cached)
+        except OSError as e:
+            # FetchError (red) o un error al guardar (disco lleno): nos
+            # quedamos con la copia vieja y no reintentamos durante un rato
+            _LOGGER.warning("No se pudo revalidar %s: %s", url, e)
+            with self._lock:
+                self._retry_after[url] = time.time() + RETRY_DELAY
+        finally:
+            with self._lock:
+                self._refreshing.pop(url, None)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+_default: HttpCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> HttpCache:
+    """Caché compartido por todo el proceso (todas las sesiones)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpCache()
+        return _default
@@ -0,0 +1,120 @@
+"""Estado del juego de memoria, sin Streamlit.
+
+El mazo son los ids de pareja por carta (``array``) y una bandera por carta
+(``bytearray``); ``faces`` dice qué imagen del directorio le tocó a cada
+pareja. El servidor solo valida pares destapados y lleva la cuenta, las
+cartas boca arriba de forma transitoria viven en el navegador (o en
+``revealed`` en el modo clásico). Con 200 parejas el estado pesa ~1.7 KB.
+"""
+from __future__ import annotations
+
+import os
+import random
+import re
+import threading
+from array import array
+
+MATCHED = 1
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+
+# directorio -> (mtime_ns, archivos); listar solo cuando cambia el directorio
+_listings: dict[str, tuple[int, tuple[str, ...]]] = {}
+_listings_lock = threading.Lock()
+
+
+def _natural_key(name: str):
+    # "2.jpeg" antes que "10.jpeg"
+    return [int(t) if t.isdigit() else t.lower() for t in re.split(r"(\d+)", name)]
+
+
+def deck_images(directory: str) -> tuple[str, ...]:
+    """Imágenes de ``directory`` en orden natural, cacheadas por ``mtime``."""
+    mtime = os.stat(directory).st_mtime_ns
+    with _listings_lock:
+        memo = _listings.get(directory)
+    if memo and memo[0] == mtime:
+        return memo[1]
+    with os.scandir(directory) as it:
+        names = [e.name for e in it if e.is_file() and e.name.lower().endswith(IMAGE_SUFFIXES)]
+    files = tuple(os.path.join(directory, n) for n in sorted(names, key=_natural_key))
+    with _listings_lock:
+        _listings[directory] = (mtime, files)
+    return files
+
+
+class MemoryGame:
+    __slots__ = ("deck", "flags", "faces", "pairs", "matches", "moves")
+
+    def __init__(self, deck, faces=None):
+        self.deck = array("H", deck)
+        if len(self.deck) % 2 or sorted(self.deck) != sorted(list(range(len(self.deck) // 2)) * 2):
+            raise ValueError("el mazo debe tener exactamente dos cartas de cada imagen 0..N-1")
+        self.pairs = len(self.deck) // 2
+        self.faces = array("H", range(self.pairs) if faces is None else faces)
+        if len(self.faces) != self.pairs:
+            raise ValueError("faces debe tener una imagen por pareja")
+        self.flags = bytearray(len(self.deck))
+        self.matches = 0
+        self.moves = 0
+
+    @classmethod
+    def new(cls, pairs: int, rng: random.Random | None = None, images: int | None = None) -> "MemoryGame":
+        """Mazo barajado de ``pairs`` parejas.
+
+        Con ``images`` (cuántas imágenes hay disponibles) cada partida usa
+        ``pairs`` de ellas elegidas al azar; sin él, las primeras ``pairs``.
+        """
+        rng = rng or random
+        if images is not None and images < pairs:
+            raise ValueError(f"hacen falta {pairs} imágenes y solo hay {images}")
+        faces = rng.sample(range(images), pairs) if images is not None else None
+        deck = list(range(pairs)) * 2
+        rng.shuffle(deck)
+        return cls(deck, faces)
+
+    @property
+    def size(self) -> int:
+        return len(self.deck)
+
+    @property
+    def solved(self) -> bool:
+        return self.matches == self.pairs
+
+    def is_matched(self, idx: int) -> bool:
+        return bool(self.flags[idx] & MATCHED)
+
+    def matched_cards(self) -> list[int]:
+        return [i for i, f in enumerate(self.flags) if f & MATCHED]
+
+    def matched_pairs(self) -> set[int]:
+        return {self.deck[i] for i, f in enumerate(self.flags) if f & MATCHED}
+
+    def reveal_pair(self, a: int, b: int) -> bool | None:
+        """Destapa las cartas ``a`` y ``b``; devuelve si son pareja.
+
+        ``None`` si la jugada no es válida (misma carta, fuera del mazo o ya
+        emparejada): no cuenta como movimiento.
+        """
+        n = len(self.deck)
+        if a == b or not (0 <= a < n and 0 <= b < n) or (self.flags[a] | self.flags[b]) & MATCHED:
+            return None
+        self.moves += 1
+        if self.deck[a] != self.deck[b]:
+            return False
+        self.flags[a] |= MATCHED
+        self.flags[b] |= MATCHED
+        self.matches += 1
+        return True
+
+    def __getstate__(self):
+        # Los arrays como bytes: pickle de un array('H') lo convierte en lista
+        return (self.deck.tobytes(), self.faces.tobytes(), bytes(self.flags), self.matches, self.moves)
+
+    def __setstate__(self, state):
+        deck, faces, flags, self.matches, self.moves = state
+        self.deck = array("H")
+        self.deck.frombytes(deck)
+        self.faces = array("H")
+        self.faces.frombytes(faces)
+        self.flags = bytearray(flags)
+        self.pairs = len(self.deck) // 2
@@ -0,0 +1,148 @@
+"""Paquetes de crucigramas en archivos de datos (``packs/crossword/``).
+
+Cada paquete es un ``<id>.json`` o ``<id>.csv`` y su layout precompilado vive
+al lado, en ``<id>.layout.json``; solo se regenera si cambia el hash de las
+pistas. El índice se arma listando nombres de archivo (sin abrirlos): un
+paquete se lee la primera vez que se pide, y pedirlo por id es un acceso a
+diccionario.
+
+Formatos::
+
+    {"title": "...", "across": [{"clue": "...", "answer": "..."}], "down": [...]}
+
+    orient,clue,answer        (CSV con encabezado; orient es H o V)
+
+Uso: ``python -m games.packs`` precompila los layouts de todos los paquetes.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+from games.crossword import LAYOUT_BUDGET, H, V, Layout, clues_digest, layout_for, normalize_answer
+from games.file_index import FileIndex
+
+PACKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "packs", "crossword")
+PACK_SUFFIXES = (".json", ".csv")
+LAYOUT_SUFFIX = ".layout.json"
+DEFAULT_PACK = "cuadro2"
+
+
+class PackError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Pack:
+    id: str
+    title: str
+    path: str
+    across: tuple     # ((pista, respuesta normalizada), ...)
+    down: tuple
+
+    @property
+    def layout_path(self) -> str:
+        return self.layout_file()
+
+    def layout_file(self, seeds: int = 1) -> str:
+        """``<id>.layout.json`` (el que va en el repo) o, con varias semillas,
+        ``<id>.s<K>.layout.json``: así cambiar ``CROSSWORD_SEEDS`` no pisa el
+        layout precompilado de una semilla."""
+        stem = self.id if seeds == 1 else f"{self.id}.s{seeds}"
+        return os.path.join(os.path.dirname(self.path), stem + LAYOUT_SUFFIX)
+
+    def digest(self, seeds: int = 1) -> str:
+        return clues_digest(self.across, self.down, seeds)
+
+
+def _entries(pack_id: str, rows) -> tuple:
+    out = []
+    for clue, answer in rows:
+        if not isinstance(clue, str) or not isinstance(answer, str):
+            raise PackError(f"[{pack_id}] Pista y respuesta tienen que ser texto: {clue!r} → {answer!r}")
+        word = normalize_answer(answer)
+        if not word:
+            raise PackError(f"[{pack_id}] La respuesta de la pista '{clue}' quedó vacía tras normalizar. Revísala.")
+        out.append((clue, word))
+    return tuple(out)
+
+
+def parse_pack(path: str) -> Pack:
+    pack_id, ext = os.path.splitext(os.path.basename(path))
+    if ext not in PACK_SUFFIXES:
+        raise PackError(f"Formato de paquete desconocido: {path}")
+    try:
+        if ext == ".json":
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            title = data.get("title", pack_id)
+            across = [(e["clue"], e["answer"]) for e in data.get("across", [])]
+            down = [(e["clue"], e["answer"]) for e in data.get("down", [])]
+        else:
+            title = pack_id
+            across, down = [], []
+            with open(path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    orient = (row["orient"] or "").strip().upper()
+                    if orient not in (H, V):
+                        raise ValueError(f"orient debe ser H o V, no '{row['orient']}'")
+                    (across if orient == H else down).append((row["clue"], row["answer"]))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise PackError(f"No se pudo leer el paquete {path}: {e}") from e
+    if not across and not down:
+        raise PackError(f"[{pack_id}] El paquete no tiene pistas.")
+    return Pack(pack_id, title, path, _entries(pack_id, across), _entries(pack_id, down))
+
+
+class PackIndex(FileIndex):
+    error = PackError
+    noun = "paquete"
+
+    def __init__(self, directory: str = PACKS_DIR):
+        super().__init__(directory)
+
+    def _item_id(self, entry: os.DirEntry) -> str | None:
+        if entry.name.endswith(LAYOUT_SUFFIX):
+            return None
+        stem, ext = os.path.splitext(entry.name)
+        return stem if ext in PACK_SUFFIXES else None
+
+    def _load(self, path: str) -> Pack:
+        return parse_pack(path)
+
+    def get(self, pack_id: str) -> Pack:
+        """Paquete ``pack_id``; se vuelve a leer solo si el archivo cambió."""
+        return super().get(pack_id)
+
+    def layout(self, pack: Pack, seeds: int = 1, budget: float = LAYOUT_BUDGET) -> Layout:
+        """Layout del paquete, leído de ``pack.layout_file(seeds)`` si el hash coincide."""
+        return layout_for(pack.across, pack.down, artifact_path=pack.layout_file(seeds),
+                          seeds=seeds, budget=budget)
+
+
+_default: PackIndex | None = None
+_default_lock = threading.Lock()
+
+
+def default_packs() -> PackIndex:
+    """Índice de ``packs/crossword/`` compartido por todo el proceso."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = PackIndex()
+        return _default
+
+
+def main() -> None:
+    index = default_packs()
+    for pack_id in index.ids():
+        pack = index.get(pack_id)
+        layout = index.layout(pack)
+        print(f"{pack_id}: {layout.rows}×{layout.cols} -> {os.path.relpath(pack.layout_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Estrategias de los fantasmas de Pac-Man.
+
+* ``greedy`` (la de siempre): cada fantasma da un paso hacia el jugador (o
+  lejos, con power) según la distancia real del laberinto; empates al azar
+  con el RNG de la partida.
+* ``expectimax`` / ``minimax``: cada fantasma busca varias jugadas adelante,
+  alternando su paso con el del jugador. En ``expectimax`` el jugador se
+  mueve al azar (promedio de sus salidas); en ``minimax`` juega lo mejor
+  para él. Las hojas valen la distancia real fantasma–jugador y atraparlo
+  (o ser atrapado, con power) vale más cuanto antes pase.
+
+La búsqueda es por profundización iterativa con un presupuesto en ms por
+turno repartido entre los fantasmas: primero la profundidad 1 (que es el
+paso greedy y siempre termina), después 2, 3… y al acabarse el tiempo se
+usa la mejor jugada de la última profundidad completa. Así cada turno tarda
+lo mismo sin importar cuántos fantasmas haya. ``budget_ms=None`` con
+``max_depth`` fija da una búsqueda que no depende del reloj (repetible).
+
+``make_ai(nombre, **params)`` arma una estrategia; ``spec()`` la describe
+para volver a armarla (al deserializar la partida o en una grabación).
+"""
+from __future__ import annotations
+
+import time
+
+CAPTURE = 10_000      # valor de atrapar al jugador (menos un punto por ply)
+DEFAULT_BUDGET_MS = 5.0
+MAX_DEPTH = 64
+CHECK_EVERY = 32      # nodos (visitas, estén o no en la tabla) entre lecturas del reloj
+
+
+class _Timeout(Exception):
+    pass
+
+
+class GreedyGhosts:
+    """Un paso por distancia real: lo que siempre hicieron los fantasmas."""
+
+    name = "greedy"
+    deterministic = True
+
+    def spec(self) -> tuple[str, dict]:
+        return self.name, {}
+
+    def move(self, game) -> None:
+        dist = game.graph.dist_view
+        player = game.player
+        neighbors = game.graph.neighbors
+        flee = game.power > 0
+        choice = game.rng.choice
+        ghosts = game.ghosts
+        for i, g in enumerate(ghosts):
+            options = neighbors[g]
+            if not options:
+                continue
+            ds = [dist[player, v] for v in options]
+            target = max(ds) if flee else min(ds)
+            best = [v for v, d in zip(options, ds) if d == target]
+            ghosts[i] = best[0] if len(best) == 1 else choice(best)
+
+
+class SearchGhosts:
+    """Búsqueda por profundización iterativa con presupuesto de tiempo."""
+
+    deterministic = False
+
+    def __init__(self, name: str = "expectimax", budget_ms: float | None = DEFAULT_BUDGET_MS,
+                 max_depth: int = MAX_DEPTH):
+        if name not in ("expectimax", "minimax"):
+            raise ValueError(f"Estrategia de búsqueda desconocida: {name}")
+        self.name = name
+        self.budget_ms = budget_ms
+        self.max_depth = max_depth
+        self.deterministic = budget_ms is None
+        self.depths: list[int] = []   # profundidad completa de cada fantasma en el último turno
+        self.nodes = 0                # nodos visitados en el último turno
+
+    def spec(self) -> tuple[str, dict]:
+        return self.name, {"budget_ms": self.budget_ms, "max_depth": self.max_depth}
+
+    def move(self, game) -> None:
+        ghosts = game.ghosts
+        self.depths = []
+        self.nodes = 0
+        if not len(ghosts):
+            return
+        t0 = time.perf_counter()
+        share = None if self.budget_ms is None else self.budget_ms / 1e3 / len(ghosts)
+        for i, g in enumerate(ghosts):
+            deadline = None if share is None else t0 + share * (i + 1)
+            ghosts[i] = self._best_move(game, g, deadline)
+
+    def _best_move(self, game, ghost: int, deadline: float | None) -> int:
+        options = game.graph.neighbors[ghost]
+        if not options:
+            self.depths.append(0)
+            return ghost
+        best = None
+        reached = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                values = self._root_values(game, options, depth, deadline)
+            except _Timeout:
+                break
+            top = max(values)
+            best = [v for v, val in zip(options, values) if val == top]
+            reached = depth
+            if abs(top) >= CAPTURE - self.max_depth:
+                break  # ya encontró la captura (o no hay escape): más hondo no cambia
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.depths.append(reached)
+        if best is None:  # ni la profundidad 1 cupo: paso greedy
+            best = self._greedy_best(game, options)
+        return best[0] if len(best) == 1 else game.rng.choice(best)
+
+    def _greedy_best(self, game, options) -> list[int]:
+        dist = game.graph.dist_view
+        sign = 1 if game.power > 0 else -1
+        values = [sign * dist[game.player, v] for v in options]
+        top = max(values)
+        return [v for v, val in zip(options, values) if val == top]
+
+    def _root_values(self, game, options, depth: int, deadline: float | None) -> list[float]:
+        """Valor (para el fantasma) de cada salida, buscando ``depth`` rondas."""
+        dist = game.graph.dist_view
+        neighbors = game.graph.neighbors
+        flee = game.power > 0   # con power el fantasma huye: los valores cambian de signo
+        sign = 1 if flee else -1
+        expect = self.name == "expectimax"
+        # Claves enteras (fantasma, jugador, rondas que faltan): una tabla de
+        # ints y floats no la recorre el recolector de basura, que con tuplas
+        # llegaba a frenar la búsqueda varios ms en medio del turno
+        memo: dict[int, float] = {}
+        size = game.graph.size
+        stride = depth + 1
+        nodes = 0
+
+        def tick() -> None:
+            # Cada visita cuenta, también las que salen de la tabla y los
+            # turnos del fantasma: ningún tramo de la búsqueda pasa sin reloj
+            nonlocal nodes
+            nodes += 1
+            if deadline is not None and nodes % CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                raise _Timeout
+
+        def leaf(g: int, p: int) -> float:
+            return sign * dist[g, p]
+
+        def caught(ply: int) -> float:
+            # Antes es mejor (o peor, si el fantasma está huyendo)
+            value = CAPTURE - ply
+            return -value if flee else value
+
+        def player_turn(g: int, p: int, left: int, ply: int) -> float:
+            tick()
+            key = (g * size + p) * stride + left
+            cached = memo.get(key)
+            if cached is not None:
+                return cached
+            values = []
+            for q in neighbors[p] or (p,):
+                if q == g:
+                    values.append(caught(ply))
+                elif left == 0:
+                    values.append(leaf(g, q))
+                else:
+                    values.append(ghost_turn(g, q, left, ply + 1))
+            value = sum(values) / len(values) if expect else min(values)
+            memo[key] = value
+            return value
+
+        def ghost_turn(g: int, p: int, left: int, ply: int) -> float:
+            tick()
+            best = None
+            for v in neighbors[g] or (g,):
+                value = caught(ply) if v == p else player_turn(v, p, left - 1, ply)
+                if best is None or value > best:
+                    best = value
+            return best
+
+        values = []
+        try:
+            for v in options:
+                if v == game.player:
+                    values.append(caught(0))
+                else:
+                    values.append(player_turn(v, game.player, depth - 1, 1))
+        finally:
+            self.nodes += nodes
+            # player_turn y ghost_turn se apuntan entre sí (un ciclo que solo
+            # suelta el recolector, con la tabla adentro): cortarlo la libera ya
+            player_turn = ghost_turn = None
+        return values
+
+
+GREEDY = GreedyGhosts()
+STRATEGIES = ("greedy", "expectimax", "minimax")
+
+
+def make_ai(name: str = "greedy", **params):
+    """La estrategia ``name`` (una de ``STRATEGIES``) con sus parámetros."""
+    if name == "greedy":
+        return GREEDY
+    if name in ("expectimax", "minimax"):
+        return SearchGhosts(name, **params)
+    raise ValueError(f"Estrategia de fantasmas desconocida: {name}")
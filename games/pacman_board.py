@@ -0,0 +1,188 @@
+"""Tablero de Pac-Man: plantilla HTML y cambios por turno para el componente.
+
+Dos formas de pintar el mismo tablero:
+
+* ``BoardView`` arma los argumentos del componente ``pacman_board``. El
+  laberinto (muros y pellets) viaja una sola vez por partida; los turnos
+  siguientes mandan solo el jugador, los fantasmas y las casillas cuyo
+  contenido cambió desde el último envío. El CSS vive en ``widgets.css`` y el
+  navegador lo carga una vez.
+* ``board_html`` es el respaldo sin componente: el HTML completo a partir de
+  una plantilla precompilada por laberinto (los muros ya vienen armados) y un
+  ``dict`` nodo → fantasma, sin recorrer la lista de fantasmas por casilla.
+"""
+from __future__ import annotations
+
+import os
+import weakref
+from dataclasses import dataclass
+
+from games.pacman_engine import EMPTY, PELLET, POWER, PacmanGame
+from games.pacman_maze import MazeGraph
+
+BOARD_CELL = 30  # px por casilla
+BOARD_GAP = 6
+# Jugadas como máximo por evento del componente (el navegador parte los lotes)
+MOVE_BATCH = 32
+
+# Código del motor -> letra de la casilla en el texto del componente
+ITEM_CODES = {EMPTY: " ", PELLET: ".", POWER: "o"}
+WALL_CODE = "#"
+
+# Piezas del HTML de respaldo (las mismas clases que usaba la página)
+_WALL_HTML = '<div class="cell wall"></div>'
+_ITEM_HTML = {
+    EMPTY: '<div class="cell floor"></div>',
+    PELLET: '<div class="cell floor pellet"></div>',
+    POWER: '<div class="cell floor power"></div>',
+}
+_PACMAN_HTML = '<div class="cell floor"><div class="pacman"></div></div>'
+_GHOST_HTML = ('<div class="cell floor"><div class="ghost"></div></div>',
+               '<div class="cell floor"><div class="ghost blue"></div></div>')
+
+
+@dataclass(frozen=True, eq=False)
+class BoardTemplate:
+    rows: int
+    cols: int
+    cell_of: tuple[int, ...]      # nodo -> índice de casilla r * cols + c
+    slots: tuple[str | int, ...]  # por casilla: HTML fijo del muro o nodo libre
+
+
+# Una plantilla por grafo compilado, mientras el grafo viva: no retiene grafos
+# (ni sus tablas de distancias) que los cachés de niveles ya soltaron
+_TEMPLATES: weakref.WeakKeyDictionary[MazeGraph, BoardTemplate] = weakref.WeakKeyDictionary()
+
+
+def board_template(graph: MazeGraph) -> BoardTemplate:
+    """La plantilla del laberinto de ``graph`` (una por grafo compilado)."""
+    template = _TEMPLATES.get(graph)
+    if template is None:
+        template = _TEMPLATES[graph] = _build_template(graph)
+    return template
+
+
+def _build_template(graph: MazeGraph) -> BoardTemplate:
+    cell_of = tuple(r * graph.cols + c for r, c in graph.cells)
+    slots: list[str | int] = [_WALL_HTML] * (graph.rows * graph.cols)
+    for node, cell in enumerate(cell_of):
+        slots[cell] = node
+    return BoardTemplate(graph.rows, graph.cols, cell_of, tuple(slots))
+
+
+def board_css(cols: int, cell: int = BOARD_CELL) -> str:
+    """El ``<style>`` del tablero de respaldo (el componente usa ``widgets.css``)."""
+    return f"""
+    <style>
+    .board {{
+        display: grid;
+        grid-template-columns: repeat({cols}, {cell}px);
+        grid-auto-rows: {cell}px;
+        gap: {BOARD_GAP}px;
+        user-select: none;
+    }}
+    .cell {{
+        width: {cell}px; height: {cell}px; border-radius: 7px;
+        display:flex; align-items:center; justify-content:center;
+        background: #111;  /* por defecto bloqueada */
+    }}
+    .floor {{ background: #0b132b; }}
+    .wall  {{ background: #1d4ed8; }} /* azul muro */
+    .pellet::after {{
+        content:''; width:8px; height:8px; border-radius:50%; background:#fef08a;
+        box-shadow: 0 0 6px #fde68a;
+    }}
+    .power::after {{
+        content:''; width:14px; height:14px; border-radius:50%; background:#fbbf24;
+        box-shadow: 0 0 10px #f59e0b;
+    }}
+    .pacman {{
+        width: 70%; height: 70%; border-radius: 50%; background: #facc15; /* amarillo */
+        box-shadow: inset -6px -6px 0 rgba(0,0,0,.12);
+    }}
+    .ghost {{
+        width: 70%; height: 70%; background:#ef4444; border-radius: 16px 16px 6px 6px;
+        position:relative; overflow:hidden;
+    }}
+    .ghost.blue {{ background:#22d3ee; }}
+    .fright .ghost {{ filter: hue-rotate(40deg) saturate(0.6) brightness(1.1); }}
+    </style>
+    """
+
+
+def board_html(game: PacmanGame, template: BoardTemplate | None = None) -> str:
+    """El tablero completo como HTML (modo de respaldo)."""
+    template = template or board_template(game.graph)
+    ghost_at: dict[int, int] = {}
+    for i, g in enumerate(game.ghosts):
+        ghost_at.setdefault(g, i)  # dos fantasmas juntos: se ve el primero
+    player = game.player
+    items = game.items
+    html = ['<div class="board {}">'.format("fright" if game.power > 0 else "")]
+    for slot in template.slots:
+        if isinstance(slot, str):
+            html.append(slot)
+        elif slot == player:
+            html.append(_PACMAN_HTML)
+        elif slot in ghost_at:
+            html.append(_GHOST_HTML[ghost_at[slot] == 1])
+        else:
+            html.append(_ITEM_HTML[items[slot]])
+    html.append("</div>")
+    return "".join(html)
+
+
+def board_layout(game: PacmanGame, template: BoardTemplate) -> str:
+    """Muros y contenido de cada casilla, una letra por casilla (por filas)."""
+    layout = [WALL_CODE] * (template.rows * template.cols)
+    for node, cell in enumerate(template.cell_of):
+        layout[cell] = ITEM_CODES[game.items[node]]
+    return "".join(layout)
+
+
+class BoardView:
+    """Lo que el componente ya tiene pintado de una partida.
+
+    ``frame`` devuelve los argumentos del siguiente render: el laberinto
+    completo la primera vez (o si el navegador pidió resincronizar) y después
+    solo las casillas cuyo contenido cambió. ``rev`` cuenta los envíos con
+    cambios; el navegador aplica un envío solo si su ``base`` es la revisión
+    que tiene y, si no (iframe nuevo, mensaje perdido), pide ``resync``.
+    """
+
+    def __init__(self):
+        self.game = os.urandom(4).hex()  # el componente rearma el tablero al cambiar
+        self.rev = 0
+        self.items: bytes | None = None
+
+    def resync(self) -> None:
+        self.items = None
+
+    def frame(self, game: PacmanGame) -> dict:
+        template = board_template(game.graph)
+        cell_of = template.cell_of
+        layout = None
+        changed = []
+        base = self.rev
+        if self.items is None or len(self.items) != len(game.items):
+            layout = board_layout(game, template)
+            base = None
+            self.rev += 1
+        elif self.items != game.items:
+            changed = [
+                [cell_of[node], ITEM_CODES[now]]
+                for node, (was, now) in enumerate(zip(self.items, game.items))
+                if was != now
+            ]
+            self.rev += 1
+        self.items = bytes(game.items)
+        return {
+            "game": self.game,
+            "rev": self.rev,
+            "base": base,
+            "layout": layout,
+            "changed": changed,
+            "player": cell_of[game.player],
+            "ghosts": [cell_of[g] for g in game.ghosts],
+            "fright": game.power > 0,
+        }
@@ -0,0 +1,220 @@
+"""Reglas de Pac-Man sin Streamlit: ``PacmanGame.step(acción)``.
+
+Las mismas reglas que tenía la página (mover al jugador, comer, fantasmas que
+persiguen o huyen, colisiones, vidas, power), sobre un nivel compilado de
+``games.pacman_levels``; cómo se mueven los fantasmas lo decide una
+estrategia de ``games.pacman_ai``. Las posiciones son nodos del grafo
+(enteros), los muros son el grafo mismo y pellets/power pellets van en un
+``bytearray`` con un byte por nodo más un contador de los que quedan: comer
+es O(1) y "¿ganó?" es comparar con cero. Empezar una partida copia el
+contenido inicial del nivel y reaparecer vuelve a sus nodos de inicio, sin
+volver a leer el laberinto. Corre decenas de miles de turnos por segundo sin
+Streamlit, así que se puede perfilar y reproducir fuera de la página.
+"""
+from __future__ import annotations
+
+import os
+import random
+from array import array
+
+from games.pacman_ai import GREEDY, make_ai
+from games.pacman_levels import EMPTY, PELLET, POWER, Level, compile_level
+from games.pacman_maze import DIRS
+
+# Acciones: índice en DIRS (el mismo orden que MazeGraph.exits); STAY no mueve
+ACTIONS = tuple(DIRS)
+ACTION_CODES = {name: i for i, name in enumerate(ACTIONS)}
+STAY = len(ACTIONS)
+# Una letra por acción (mismo orden): así viajan las jugadas desde el navegador
+MOVE_LETTERS = "udlr"
+
+PELLET_POINTS = 10
+POWER_POINTS = 50
+GHOST_POINTS = 200
+POWER_TURNS = 15
+START_LIVES = 3
+
+# Lo que pasó en un turno (``step`` devuelve la suma de estas banderas)
+MOVED = 1
+ATE_PELLET = 2
+ATE_POWER = 4
+ATE_GHOST = 8
+DIED = 16
+WON = 32
+GAME_OVER = 64
+
+
+def new_seed() -> int:
+    return int.from_bytes(os.urandom(4), "big")
+
+
+class PacmanGame:
+    __slots__ = (
+        "level", "graph", "player", "ghosts", "items", "remaining",
+        "score", "lives", "power", "moves", "turns", "game_over", "win", "rng", "seed", "log",
+        "_ai", "replayable",
+    )
+
+    def __init__(self, level, rng: random.Random | None = None, seed: int | None = None, ai=GREEDY):
+        """``level`` es un ``Level`` o las filas de texto de un laberinto.
+
+        Los empates de los fantasmas salen de un ``random.Random(seed)`` propio
+        de la partida (semilla nueva si no se da), así que ``seed`` y ``log``
+        (un byte por turno con el código de la acción) alcanzan para repetirla
+        exactamente. Con ``rng`` explícito ``seed`` queda en ``None``.
+        ``ai`` mueve a los fantasmas (ver ``games.pacman_ai``); se puede
+        cambiar entre turnos, pero entonces (o si una búsqueda con tiempo
+        límite juega un turno) ``replayable`` queda en ``False`` para siempre:
+        una grabación guarda una sola estrategia sin reloj.
+        """
+        self.level = level if isinstance(level, Level) else compile_level(level)
+        self.graph = self.level.graph
+        if rng is None:
+            seed = new_seed() if seed is None else seed
+            rng = random.Random(seed)
+        self.rng = rng
+        self.seed = seed
+        self.log = bytearray()
+        self._ai = ai
+        self.replayable = True
+        self.items = bytearray(self.level.items)
+        self.remaining = self.level.pellets
+        self.player = self.level.spawn
+        self.ghosts = array("H", self.level.homes)
+        self.score = 0
+        self.lives = START_LIVES
+        self.power = 0      # turnos que quedan de "power"
+        self.moves = 0      # pasos que de verdad movieron al jugador
+        self.turns = 0
+        self.game_over = False
+        self.win = False
+
+    @property
+    def maze(self) -> tuple[str, ...]:
+        return self.level.maze
+
+    @property
+    def ai(self):
+        return self._ai
+
+    @ai.setter
+    def ai(self, ai) -> None:
+        if self.turns and ai.spec() != self._ai.spec():
+            self.replayable = False
+        self._ai = ai
+
+    @property
+    def over(self) -> bool:
+        return self.game_over or self.win
+
+    def cell(self, node: int) -> tuple[int, int]:
+        return self.graph.cells[node]
+
+    def item_at(self, rc: tuple[int, int]) -> int:
+        node = self.graph.node(rc)
+        return self.items[node] if node >= 0 else EMPTY
+
+    # ====== Turno ======
+    def step(self, action) -> int:
+        """Un turno: mueve al jugador (``action`` es nombre, código o ``STAY``),
+        luego los fantasmas, y resuelve colisiones. Devuelve banderas."""
+        if self.game_over or self.win:
+            return 0
+        if isinstance(action, str):
+            action = ACTION_CODES.get(action, STAY)
+        elif not 0 <= action < STAY:
+            action = STAY
+        self.log.append(action)
+        self.turns += 1
+        events = self._step_player(action)
+        if self.remaining == 0:
+            self.win = True
+            return events | WON
+        ai = self._ai
+        if not ai.deterministic:
+            self.replayable = False
+        ai.move(self)
+        events |= self._check_collisions()
+        if self.power > 0:
+            self.power -= 1
+        return events
+
+    def play(self, moves: str) -> int:
+        """Aplica en orden una tira de ``MOVE_LETTERS`` (letras desconocidas
+        cuentan como ``STAY``) hasta que la partida termine. Devuelve la suma
+        de las banderas de todos los turnos."""
+        events = 0
+        for letter in moves:
+            if self.game_over or self.win:
+                break
+            action = MOVE_LETTERS.find(letter)
+            events |= self.step(action if action >= 0 else STAY)
+        return events
+
+    def _step_player(self, action: int) -> int:
+        if not 0 <= action < STAY:
+            return 0
+        nxt = self.graph.exits[self.player][action]
+        if nxt < 0:
+            return 0  # golpea muro, no se mueve
+        self.player = nxt
+        self.moves += 1
+        item = self.items[nxt]
+        if item == EMPTY:
+            return MOVED
+        self.items[nxt] = EMPTY
+        self.remaining -= 1
+        if item == PELLET:
+            self.score += PELLET_POINTS
+            return MOVED | ATE_PELLET
+        self.score += POWER_POINTS
+        self.power = POWER_TURNS
+        return MOVED | ATE_POWER
+
+    def _check_collisions(self) -> int:
+        events = 0
+        eaten = []
+        for i, g in enumerate(self.ghosts):
+            if g != self.player:
+                continue
+            if self.power > 0:
+                eaten.append(i)
+                self.score += GHOST_POINTS
+                events |= ATE_GHOST
+            else:
+                self.lives -= 1
+                if self.lives <= 0:
+                    self.game_over = True
+                    events |= GAME_OVER
+                self.respawn()
+                return events | DIED
+        for i in eaten:
+            self.ghosts[i] = self.level.homes[i]
+        return events
+
+    def respawn(self) -> None:
+        """Jugador y fantasmas a su inicio, sin tocar los pellets."""
+        self.player = self.level.spawn
+        self.ghosts = array("H", self.level.homes)
+        self.power = 0
+
+    def __getstate__(self):
+        # El nivel compilado (grafo y tabla de distancias) se vuelve a pedir al caché
+        return ((self.level.maze, self.level.id, self.level.title), self.player,
+                self.ghosts.tobytes(), bytes(self.items), self.remaining, self.score, self.lives,
+                self.power, self.moves, self.turns, self.game_over, self.win,
+                self.rng.getstate(), self.seed, bytes(self.log), self._ai.spec(), self.replayable)
+
+    def __setstate__(self, state):
+        (level, self.player, ghosts, items, self.remaining, self.score, self.lives, self.power,
+         self.moves, self.turns, self.game_over, self.win, rng_state, self.seed, log, ai,
+         self.replayable) = state
+        self.level = compile_level(*level)
+        self.graph = self.level.graph
+        self.ghosts = array("H")
+        self.ghosts.frombytes(ghosts)
+        self.items = bytearray(items)
+        self.log = bytearray(log)
+        self._ai = make_ai(ai[0], **ai[1])
+        self.rng = random.Random()
+        self.rng.setstate(rng_state)
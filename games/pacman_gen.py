@@ -0,0 +1,169 @@
+"""Laberintos de Pac-Man generados con semilla, del tamaño que sea.
+
+Las casillas en (impar, impar) son "cuartos" y las que quedan entre dos
+cuartos son paredes que se pueden abrir. Primero un árbol de expansión al
+azar (Kruskal con union-find) conecta todos los cuartos; después se abre una
+pared más en cada callejón sin salida (en Pac-Man un callejón es una trampa)
+y se siguen abriendo paredes al azar hasta bajar a la densidad de muros
+pedida: a menos muros, más ciclos. Las esquinas entre cuartos siempre son
+muro, así que el resultado tiene la forma de pasillos con columnas del
+tablero de la página.
+
+La salida es el mismo texto de ``packs/pacman/`` (lista de filas con ``#``,
+``.``, ``o``, ``P`` y ``G``): la misma semilla y parámetros dan siempre el
+mismo laberinto, y ``compile_level`` lo acepta tal cual.
+
+Uso: ``python -m games.pacman_gen 41 61 --seed 3 --ghosts 4 --id grande``
+escribe ``packs/pacman/grande.txt``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+
+from games.pacman_levels import LEVEL_SUFFIX, LEVELS_DIR
+
+MIN_SIDE = 5
+DEFAULT_DENSITY = 0.4     # fracción de muros (con el borde); el árbol solo deja ~0.5
+DEFAULT_GHOSTS = 2
+DEFAULT_POWERS = 4
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def generate_maze(rows: int, cols: int, seed: int = 0, density: float = DEFAULT_DENSITY,
+                  ghosts: int = DEFAULT_GHOSTS, powers: int = DEFAULT_POWERS) -> list[str]:
+    """Laberinto de ``rows × cols`` conectado, sin callejones y con ciclos.
+
+    ``density`` es la fracción de casillas que quedan como muro (se abren
+    paredes hasta llegar a ella o hasta que no quede ninguna por abrir).
+    ``ghosts`` fantasmas empiezan cerca del centro, el jugador abajo al
+    medio y ``powers`` power pellets en los cuartos más cercanos a las
+    esquinas; el resto de las casillas libres lleva pellet.
+    """
+    if rows < MIN_SIDE or cols < MIN_SIDE:
+        raise ValueError(f"El laberinto tiene que medir al menos {MIN_SIDE}×{MIN_SIDE}.")
+    rng = random.Random(seed)
+    grid = [bytearray(b"#" * cols) for _ in range(rows)]
+    room_rows = range(1, rows - 1, 2)
+    room_cols = range(1, cols - 1, 2)
+    rooms = [(r, c) for r in room_rows for c in room_cols]
+    if len(rooms) < ghosts + 1:
+        raise ValueError(f"Un laberinto de {rows}×{cols} no tiene lugar para {ghosts} fantasmas.")
+    index = {rc: i for i, rc in enumerate(rooms)}
+    for r, c in rooms:
+        grid[r][c] = ord(".")
+
+    # Paredes entre cuartos vecinos: (pared, cuarto a, cuarto b)
+    walls = []
+    for r, c in rooms:
+        if (r, c + 2) in index:
+            walls.append(((r, c + 1), index[r, c], index[r, c + 2]))
+        if (r + 2, c) in index:
+            walls.append(((r + 1, c), index[r, c], index[r + 2, c]))
+    rng.shuffle(walls)
+
+    # Árbol de expansión: todo conectado
+    parent = list(range(len(rooms)))
+    closed = []
+    degree = [0] * len(rooms)
+    for wall, a, b in walls:
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra == rb:
+            closed.append((wall, a, b))
+            continue
+        parent[ra] = rb
+        grid[wall[0]][wall[1]] = ord(".")
+        degree[a] += 1
+        degree[b] += 1
+
+    # Sin callejones: cada cuarto con una sola salida abre otra pared
+    by_room: dict[int, list[int]] = {}
+    for i, (_, a, b) in enumerate(closed):
+        by_room.setdefault(a, []).append(i)
+        by_room.setdefault(b, []).append(i)
+    opened = set()
+    for room in range(len(rooms)):
+        if degree[room] != 1:
+            continue
+        options = [i for i in by_room.get(room, ()) if i not in opened]
+        if options:
+            i = rng.choice(options)
+            opened.add(i)
+            (wr, wc), a, b = closed[i]
+            grid[wr][wc] = ord(".")
+            degree[a] += 1
+            degree[b] += 1
+
+    # Más ciclos hasta la densidad pedida
+    wall_count = sum(row.count(b"#") for row in grid)
+    target = int(density * rows * cols)
+    for i, ((wr, wc), _, _) in enumerate(closed):
+        if wall_count <= target:
+            break
+        if i in opened:
+            continue
+        grid[wr][wc] = ord(".")
+        wall_count -= 1
+
+    # Jugador abajo al medio, fantasmas al centro, power pellets en las esquinas
+    def nearest(r: float, c: float, taken: set) -> tuple[int, int]:
+        return min((rc for rc in rooms if rc not in taken),
+                   key=lambda rc: ((rc[0] - r) ** 2 + (rc[1] - c) ** 2, rc))
+
+    taken: set[tuple[int, int]] = set()
+    player = nearest(rows * 0.75, cols / 2, taken)
+    taken.add(player)
+    grid[player[0]][player[1]] = ord("P")
+    for _ in range(ghosts):
+        r, c = nearest(rows / 2, cols / 2, taken)
+        taken.add((r, c))
+        grid[r][c] = ord("G")
+    corners = [(0, 0), (0, cols), (rows, 0), (rows, cols)]
+    for k in range(min(powers, len(rooms) - len(taken))):
+        r, c = nearest(*corners[k % 4], taken)
+        taken.add((r, c))
+        grid[r][c] = ord("o")
+    return [row.decode("ascii") for row in grid]
+
+
+def maze_density(maze) -> float:
+    return sum(row.count("#") for row in maze) / (len(maze) * len(maze[0]))
+
+
+def level_text(maze, title: str = "") -> str:
+    """El laberinto como archivo de ``packs/pacman/`` (con título opcional)."""
+    head = f"; {title}\n" if title else ""
+    return head + "\n".join(maze) + "\n"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Genera un nivel de Pac-Man en packs/pacman/")
+    ap.add_argument("rows", type=int)
+    ap.add_argument("cols", type=int)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--density", type=float, default=DEFAULT_DENSITY)
+    ap.add_argument("--ghosts", type=int, default=DEFAULT_GHOSTS)
+    ap.add_argument("--powers", type=int, default=DEFAULT_POWERS)
+    ap.add_argument("--id", default="", help="nombre del nivel (por defecto gen_<filas>x<columnas>_<semilla>)")
+    args = ap.parse_args()
+
+    maze = generate_maze(args.rows, args.cols, seed=args.seed, density=args.density,
+                         ghosts=args.ghosts, powers=args.powers)
+    level_id = args.id or f"gen_{args.rows}x{args.cols}_{args.seed}"
+    title = (f"Generado: {args.rows}×{args.cols}, semilla {args.seed}, "
+             f"{maze_density(maze):.0%} de muros, {args.ghosts} fantasmas")
+    path = os.path.join(LEVELS_DIR, level_id + LEVEL_SUFFIX)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(level_text(maze, title))
+    print(f"{os.path.relpath(path)} ({title})")
+
+
+if __name__ == "__main__":
+    main()
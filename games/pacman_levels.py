@@ -0,0 +1,212 @@
+"""Niveles de Pac-Man en archivos de texto (``packs/pacman/``).
+
+Cada nivel es un ``<id>.txt`` con el laberinto tal cual se ve::
+
+    ; Título del nivel            (líneas con ";" al principio: comentarios;
+    ###########                   la primera es el título)
+    #P...o..G.#
+    ###########
+
+``#`` muro, ``.`` pellet, ``o`` power pellet, ``P`` inicio del jugador (uno),
+``G`` inicio de un fantasma (al menos uno) y espacio: pasillo vacío. Las filas
+cortas se completan con espacios (un editor pudo borrar los del final) y todas
+las casillas libres tienen que estar conectadas (si no, habría pellets
+imposibles de comer).
+
+Un nivel se valida y compila una sola vez por proceso en un ``Level``
+inmutable (grafo con distancias, contenido inicial por nodo y puntos de
+inicio) que comparten todas las sesiones: empezar una partida es copiar un
+``bytes`` y reaparecer tras perder una vida es volver a los nodos guardados.
+El índice (``games.file_index``, el mismo de ``games.packs``) lista el
+directorio sin abrir los archivos y no guarda niveles: los pide al caché.
+
+Uso: ``python -m games.pacman_levels`` valida y compila todos los niveles.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+from games.cache import BytesLRU
+from games.file_index import FileIndex
+from games.pacman_maze import MAZES_MAX_BYTES, UNREACHABLE, WALL, MazeGraph, compile_maze
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "packs", "pacman")
+LEVEL_SUFFIX = ".txt"
+DEFAULT_LEVEL = "cuadro4"
+COMMENT = ";"
+
+# Contenido de cada casilla
+EMPTY, PELLET, POWER = 0, 1, 2
+ITEM_CHARS = {".": PELLET, "o": POWER}
+PLAYER, GHOST = "P", "G"
+LEVEL_CHARS = frozenset(WALL + " " + "".join(ITEM_CHARS) + PLAYER + GHOST)
+
+
+class LevelError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, eq=False)
+class Level:
+    id: str
+    title: str
+    maze: tuple[str, ...]
+    graph: MazeGraph
+    spawn: int                  # nodo de inicio del jugador
+    homes: tuple[int, ...]      # nodo de inicio de cada fantasma
+    items: bytes                # contenido inicial por nodo (EMPTY / PELLET / POWER)
+    pellets: int                # casillas con algo que comer
+
+    @property
+    def rows(self) -> int:
+        return self.graph.rows
+
+    @property
+    def cols(self) -> int:
+        return self.graph.cols
+
+
+def parse_level(text: str, level_id: str = "") -> tuple[str, tuple[str, ...]]:
+    """(título, filas) de un archivo de nivel; valida forma y caracteres."""
+    title = ""
+    rows = []
+    for line in text.splitlines():
+        if line.startswith(COMMENT):
+            if not title and not rows:
+                title = line[len(COMMENT):].strip()
+            continue
+        if line.strip() or rows:
+            rows.append(line)
+    while rows and not rows[-1].strip():
+        rows.pop()
+    if not rows:
+        raise LevelError(f"[{level_id}] El nivel no tiene laberinto.")
+    width = max(len(r) for r in rows)
+    rows = [row.ljust(width) for row in rows]
+    for i, row in enumerate(rows):
+        bad = set(row) - LEVEL_CHARS
+        if bad:
+            raise LevelError(f"[{level_id}] Caracteres desconocidos en la fila {i + 1}: {''.join(sorted(bad))!r}")
+    return title or level_id, tuple(rows)
+
+
+def compile_level(maze, level_id: str = "", title: str = "") -> Level:
+    """Nivel compilado de ``maze`` (filas de texto), una vez por proceso.
+
+    Comprueba que haya un solo ``P``, al menos un ``G`` y que todas las
+    casillas libres se alcancen desde el inicio del jugador.
+    """
+    maze = tuple(maze)
+    return _LEVELS.get_or_create((maze, level_id, title), lambda: _build_level(maze, level_id, title))
+
+
+def _build_level(maze: tuple[str, ...], level_id: str, title: str) -> Level:
+    graph = compile_maze(maze)
+    spawns = []
+    homes = []
+    items = bytearray(graph.size)
+    for node, (r, c) in enumerate(graph.cells):
+        ch = maze[r][c]
+        if ch == PLAYER:
+            spawns.append(node)
+        elif ch == GHOST:
+            homes.append(node)
+        else:
+            items[node] = ITEM_CHARS.get(ch, EMPTY)
+    if len(spawns) != 1:
+        raise LevelError(f"[{level_id}] El nivel necesita exactamente un '{PLAYER}' (tiene {len(spawns)}).")
+    if not homes:
+        raise LevelError(f"[{level_id}] El nivel necesita al menos un fantasma '{GHOST}'.")
+    spawn = spawns[0]
+    unreachable = (graph.dist[spawn] == UNREACHABLE).nonzero()[0]
+    if unreachable.size:
+        r, c = graph.cells[int(unreachable[0])]
+        raise LevelError(
+            f"[{level_id}] {unreachable.size} casillas libres no se alcanzan desde el inicio "
+            f"(la primera en fila {r + 1}, columna {c + 1})."
+        )
+    items = bytes(items)
+    return Level(
+        id=level_id,
+        title=title or level_id,
+        maze=maze,
+        graph=graph,
+        spawn=spawn,
+        homes=tuple(homes),
+        items=items,
+        pellets=len(items) - items.count(EMPTY),
+    )
+
+
+_LEVELS = BytesLRU(MAZES_MAX_BYTES, sizeof=lambda level: level.graph.dist.nbytes)
+
+
+def load_level(path: str) -> Level:
+    level_id = os.path.splitext(os.path.basename(path))[0]
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError as e:
+        raise LevelError(f"No se pudo leer el nivel {path}: {e}") from e
+    title, maze = parse_level(text, level_id)
+    return compile_level(maze, level_id, title)
+
+
+class LevelIndex(FileIndex):
+    error = LevelError
+    noun = "nivel"
+
+    def __init__(self, directory: str = LEVELS_DIR):
+        super().__init__(directory)
+
+    def _item_id(self, entry: os.DirEntry) -> str | None:
+        stem, ext = os.path.splitext(entry.name)
+        return stem if ext == LEVEL_SUFFIX else None
+
+    def _load(self, path: str) -> Level:
+        return load_level(path)
+
+    # Los niveles compilados (grafo + tabla de distancias) viven solo en
+    # ``_LEVELS``, acotado por bytes: el índice guarda la clave, no el nivel,
+    # y si el caché lo desalojó se vuelve a leer el archivo
+    def _remember(self, level_id: str, stamp: tuple, level: Level) -> None:
+        super()._remember(level_id, stamp, (level.maze, level.id, level.title))
+
+    def _recall(self, level_id: str, stamp: tuple) -> Level | None:
+        key = super()._recall(level_id, stamp)
+        return None if key is None else _LEVELS.get(key)
+
+    def get(self, level_id: str) -> Level:
+        """Nivel ``level_id`` compilado; se vuelve a leer solo si el archivo cambió."""
+        return super().get(level_id)
+
+
+_default: LevelIndex | None = None
+_default_lock = threading.Lock()
+
+
+def default_levels() -> LevelIndex:
+    """Índice de ``packs/pacman/`` compartido por todo el proceso."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = LevelIndex()
+        return _default
+
+
+def level_stats() -> dict:
+    return _LEVELS.stats()
+
+
+def main() -> None:
+    index = default_levels()
+    for level_id in index.ids():
+        level = index.get(level_id)
+        print(f"{level_id}: {level.rows}×{level.cols}, {level.graph.size} casillas libres, "
+              f"{level.pellets} para comer, {len(level.homes)} fantasmas — {level.title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Laberinto de Pac-Man compilado: grafo de casillas y distancias reales.
+
+Cada casilla libre es un nodo con sus vecinos precalculados, y ``dist`` es la
+tabla de distancias de camino más corto entre todos los pares (NumPy,
+``uint16``). Con eso perseguir o huir es mirar ``dist[vecino, jugador]``
+para cada salida: los fantasmas ya no se quedan pegados a un muro por creer
+que la distancia Manhattan los acerca.
+
+La tabla se arma con un BFS desde todos los orígenes a la vez, vectorizado
+sobre pares ``(origen, nodo)``. Se compila una vez por laberinto y se
+comparte entre sesiones.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+from games.cache import BytesLRU
+
+WALL = "#"
+# Orden fijo de las direcciones; un vecino se identifica por su dirección
+DIRS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+UNREACHABLE = np.iinfo(np.uint16).max
+# Un laberinto de 64×64 con ~2400 casillas libres ocupa ~11 MB de tabla
+MAZES_MAX_BYTES = 96 * 1024 * 1024
+
+
+@dataclass(frozen=True, eq=False)
+class MazeGraph:
+    rows: int
+    cols: int
+    cells: tuple[tuple[int, int], ...]        # nodo -> (r, c)
+    node_of: tuple[int, ...]                  # r * cols + c -> nodo, -1 si es muro
+    neighbors: tuple[tuple[int, ...], ...]    # nodo -> nodos vecinos (orden de DIRS)
+    exits: tuple[tuple[int, ...], ...]        # nodo -> vecino por dirección, -1 si hay muro
+    dist: np.ndarray                          # (n, n) uint16, UNREACHABLE si no hay camino
+
+    @property
+    def size(self) -> int:
+        return len(self.cells)
+
+    @cached_property
+    def dist_view(self) -> memoryview:
+        """``dist`` como memoryview: ``dist_view[a, b]`` da un int de Python
+        sin pasar por un escalar de NumPy (lo que usa el motor en cada turno)."""
+        return memoryview(self.dist)
+
+    def node(self, rc: tuple[int, int]) -> int:
+        r, c = rc
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return -1
+        return self.node_of[r * self.cols + c]
+
+    def is_open(self, rc: tuple[int, int]) -> bool:
+        return self.node(rc) >= 0
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        return int(self.dist[self.node(a), self.node(b)])
+
+
+def maze_cells(maze) -> tuple[int, int, list[tuple[int, int]]]:
+    rows = len(maze)
+    cols = max(len(line) for line in maze) if rows else 0
+    cells = [
+        (r, c)
+        for r in range(rows)
+        for c in range(cols)
+        if c < len(maze[r]) and maze[r][c] != WALL
+    ]
+    return rows, cols, cells
+
+
+def all_pairs_bfs(neighbors) -> np.ndarray:
+    """Distancias de camino más corto entre todos los nodos (grafo sin pesos).
+
+    BFS desde todos los orígenes a la vez: el frente es un vector de pares
+    ``(origen, nodo)`` codificados como índice plano en ``dist``. Cada paso
+    expande el frente a los vecinos, descarta lo ya visitado y quita
+    duplicados con un arreglo de "reclamos" (el último que escribe gana), sin
+    ordenar. Cada par se expande una sola vez: O(n² · grado) en total.
+    """
+    n = len(neighbors)
+    if n == 0:
+        return np.zeros((0, 0), dtype=np.uint16)
+    # Vecinos rellenados con la columna fantasma n, que nunca está sin visitar
+    degree = max(len(nb) for nb in neighbors)
+    nbr = np.full((n, max(degree, 1)), n, dtype=np.intp)
+    for u, nb in enumerate(neighbors):
+        nbr[u, :len(nb)] = nb
+    dist = np.full((n, n + 1), UNREACHABLE, dtype=np.uint16)
+    dist[:, n] = 0
+    flat = dist.reshape(-1)
+    claim = np.empty(flat.size, dtype=np.intp)
+    src = node = np.arange(n)
+    dist[src, node] = 0
+    d = 0
+    while src.size:
+        d += 1
+        cand = ((src * (n + 1))[:, None] + nbr[node]).ravel()
+        cand = cand[flat[cand] == UNREACHABLE]
+        flat[cand] = d
+        idx = np.arange(cand.size)
+        claim[cand] = idx
+        cand = cand[claim[cand] == idx]
+        src, node = np.divmod(cand, n + 1)
+    return np.ascontiguousarray(dist[:, :n])
+
+
+def build_graph(maze) -> MazeGraph:
+    rows, cols, cells = maze_cells(maze)
+    node_of = [-1] * (rows * cols)
+    for i, (r, c) in enumerate(cells):
+        node_of[r * cols + c] = i
+    exits = []
+    for r, c in cells:
+        row = []
+        for dr, dc in DIRS.values():
+            nr, nc = r + dr, c + dc
+            row.append(node_of[nr * cols + nc] if 0 <= nr < rows and 0 <= nc < cols else -1)
+        exits.append(tuple(row))
+    neighbors = tuple(tuple(v for v in row if v >= 0) for row in exits)
+    return MazeGraph(
+        rows=rows,
+        cols=cols,
+        cells=tuple(cells),
+        node_of=tuple(node_of),
+        neighbors=neighbors,
+        exits=tuple(exits),
+        dist=all_pairs_bfs(neighbors),
+    )
+
+
+_GRAPHS = BytesLRU(MAZES_MAX_BYTES, sizeof=lambda g: g.dist.nbytes)
+
+
+def compile_maze(maze) -> MazeGraph:
+    """El grafo de ``maze`` (lista de filas de texto), compilado una vez por proceso."""
+    key = tuple(maze)
+    return _GRAPHS.get_or_create(key, lambda: build_graph(key))
+
+
+def maze_stats() -> dict:
+    return _GRAPHS.stats()
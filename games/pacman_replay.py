@@ -0,0 +1,267 @@
+"""Partidas de Pac-Man grabadas: semilla + un byte por turno.
+
+Cada ``PacmanGame`` guarda su semilla y el código de cada acción en
+``game.log``; con eso y el nivel la partida se repite idéntica. Un
+``Replay`` es eso más el resultado esperado (puntaje, vidas, turnos), un
+presupuesto de µs por turno y la estrategia de los fantasmas: las búsquedas
+de ``games.pacman_ai`` solo se pueden grabar con profundidad fija, porque
+con tiempo límite lo que deciden depende del reloj. En disco es un JSON en
+``packs/pacman/replays/`` con las jugadas como texto, una letra por turno
+(``udlr`` y ``.`` para quedarse quieto).
+
+Las grabaciones sirven de corpus: ``python -m games.pacman_replay`` repite
+todas sin Streamlit a toda velocidad, comprueba que el final coincida y que
+el tiempo por turno no pase del presupuesto, y termina con error si alguna
+falla. ``--record <nivel>`` agrega una partida jugada por ``autoplay``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from games.cache import content_digest
+from games.pacman_ai import MAX_DEPTH, STRATEGIES, make_ai
+from games.pacman_engine import MOVE_LETTERS, STAY, PacmanGame
+from games.pacman_levels import EMPTY, LEVELS_DIR, Level, default_levels
+
+REPLAYS_DIR = os.path.join(LEVELS_DIR, "replays")
+REPLAY_SUFFIX = ".json"
+# Código de acción -> letra en el archivo (STAY es ".")
+LOG_LETTERS = MOVE_LETTERS + "."
+_TO_CODES = bytes.maketrans(LOG_LETTERS.encode("ascii"), bytes(range(len(LOG_LETTERS))))
+_TO_LETTERS = bytes.maketrans(bytes(range(len(LOG_LETTERS))), LOG_LETTERS.encode("ascii"))
+DEFAULT_BUDGET_US = 200.0
+REPEAT = 3
+
+
+class ReplayError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Replay:
+    level: str          # id del nivel en packs/pacman/
+    maze: str           # hash del laberinto: si el nivel cambió, la grabación ya no vale
+    seed: int
+    moves: bytes        # un byte por turno (código de acción)
+    score: int
+    lives: int
+    win: bool
+    budget_us: float = DEFAULT_BUDGET_US
+    ghosts: str = "greedy"          # estrategia de los fantasmas (games.pacman_ai)
+    ghost_depth: int | None = None  # profundidad fija de la búsqueda (sin reloj)
+
+    @property
+    def turns(self) -> int:
+        return len(self.moves)
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    replay: Replay
+    game: PacmanGame
+    us_per_turn: float
+
+    @property
+    def mismatches(self) -> list[str]:
+        r, g = self.replay, self.game
+        out = []
+        for name, want, got in (("puntaje", r.score, g.score), ("vidas", r.lives, g.lives),
+                                ("turnos", r.turns, g.turns), ("ganó", r.win, g.win)):
+            if want != got:
+                out.append(f"{name}: esperaba {want}, dio {got}")
+        return out
+
+    @property
+    def slow(self) -> bool:
+        return self.us_per_turn > self.replay.budget_us
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches and not self.slow
+
+
+def maze_digest(level: Level) -> str:
+    return content_digest("\n".join(level.maze).encode("utf-8"))
+
+
+def record(game: PacmanGame, budget_us: float = DEFAULT_BUDGET_US) -> Replay:
+    """La grabación de ``game`` tal como está ahora."""
+    if game.seed is None:
+        raise ReplayError("La partida usa un RNG externo: no se puede repetir.")
+    if not game.replayable or not game.ai.deterministic:
+        raise ReplayError("Los fantasmas cambiaron de estrategia o buscaron con tiempo límite: "
+                          "la partida no se puede repetir.")
+    name, params = game.ai.spec()
+    return Replay(
+        level=game.level.id, maze=maze_digest(game.level), seed=game.seed,
+        moves=bytes(game.log), score=game.score, lives=game.lives, win=game.win,
+        budget_us=budget_us, ghosts=name, ghost_depth=params.get("max_depth"),
+    )
+
+
+def dumps(replay: Replay) -> str:
+    data = asdict(replay)
+    data["moves"] = replay.moves.translate(_TO_LETTERS).decode("ascii")
+    return json.dumps(data, ensure_ascii=False, indent=1)
+
+
+def loads(text: str) -> Replay:
+    try:
+        data = json.loads(text)
+        moves = data.pop("moves").encode("ascii")
+        bad = set(moves) - set(LOG_LETTERS.encode("ascii"))
+        if bad:
+            raise ValueError(f"letras desconocidas en las jugadas: {bytes(sorted(bad))!r}")
+        if data.get("ghosts", "greedy") not in STRATEGIES:
+            raise ValueError(f"estrategia de fantasmas desconocida: {data['ghosts']}")
+        return Replay(moves=moves.translate(_TO_CODES), **data)
+    except (ValueError, KeyError, TypeError, AttributeError, UnicodeError) as e:
+        raise ReplayError(f"Grabación inválida: {e}") from e
+
+
+def load_replay(path: str) -> Replay:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return loads(f.read())
+    except OSError as e:
+        raise ReplayError(f"No se pudo leer la grabación {path}: {e}") from e
+
+
+def replay_level(replay: Replay) -> Level:
+    level = default_levels().get(replay.level)
+    if maze_digest(level) != replay.maze:
+        raise ReplayError(f"El nivel '{replay.level}' cambió desde que se grabó la partida.")
+    return level
+
+
+def start(replay: Replay, level: Level | None = None) -> PacmanGame:
+    """La partida de ``replay`` en el turno 0 (para avanzarla con ``step``)."""
+    if replay.ghosts == "greedy":
+        ai = make_ai()
+    else:
+        ai = make_ai(replay.ghosts, budget_ms=None, max_depth=replay.ghost_depth or MAX_DEPTH)
+    return PacmanGame(level or replay_level(replay), seed=replay.seed, ai=ai)
+
+
+def replay_game(replay: Replay, level: Level | None = None, turns: int | None = None) -> PacmanGame:
+    """Repite ``replay`` sin Streamlit hasta ``turns`` (por defecto, todos)."""
+    game = start(replay, level)
+    step = game.step
+    for code in replay.moves[:turns]:
+        step(code)
+    return game
+
+
+def check(replay: Replay, repeat: int = REPEAT) -> ReplayResult:
+    """Repite la grabación ``repeat`` veces; se queda con la más rápida."""
+    level = replay_level(replay)
+    best = float("inf")
+    game = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        game = replay_game(replay, level)
+        best = min(best, time.perf_counter() - t0)
+    return ReplayResult(replay, game, best / max(1, replay.turns) * 1e6)
+
+
+def replay_ids(directory: str = REPLAYS_DIR) -> list[str]:
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    return [n[:-len(REPLAY_SUFFIX)] for n in names if n.endswith(REPLAY_SUFFIX)]
+
+
+def replay_path(replay_id: str, directory: str = REPLAYS_DIR) -> str:
+    """Archivo de la grabación ``replay_id``: el id es un nombre, no una ruta."""
+    if (not replay_id or replay_id.startswith(".") or "/" in replay_id
+            or os.sep in replay_id or (os.altsep and os.altsep in replay_id)):
+        raise ReplayError(f"Nombre de grabación inválido: {replay_id!r}")
+    return os.path.join(directory, replay_id + REPLAY_SUFFIX)
+
+
+def get_replay(replay_id: str, directory: str = REPLAYS_DIR) -> Replay:
+    """La grabación ``replay_id`` de ``directory``; solo ids que ya están ahí
+    (como los niveles y los paquetes), nunca una ruta armada desde afuera."""
+    if replay_id not in replay_ids(directory):
+        raise ReplayError(f"No existe la grabación '{replay_id}' en {directory}")
+    return load_replay(replay_path(replay_id, directory))
+
+
+def autoplay(level: Level, seed: int, max_turns: int = 5000, noise: float = 0.1,
+             ai=None) -> PacmanGame:
+    """Un jugador simple para llenar el corpus: va al pellet más cercano por
+    distancia real, se aleja de un fantasma a dos casillas o menos (salvo con
+    power) y a veces se equivoca. Todo sale de ``seed``."""
+    game = PacmanGame(level, seed=seed, ai=ai or make_ai())
+    choose = random.Random(seed ^ 0x5EED)
+    dist = level.graph.dist
+    exits = level.graph.exits
+    while not game.over and game.turns < max_turns:
+        options = [a for a in range(STAY) if exits[game.player][a] >= 0]
+        if choose.random() < noise:
+            game.step(choose.choice(options))
+            continue
+        here = dist[game.player]
+        near_ghost = min(int(here[g]) for g in game.ghosts)
+        if near_ghost <= 2 and game.power == 0:
+            best = max(options, key=lambda a: min(int(dist[exits[game.player][a], g]) for g in game.ghosts))
+        else:
+            food = np.frombuffer(bytes(game.items), dtype=np.uint8) != EMPTY
+            target = int(np.argmin(np.where(food, here, np.iinfo(here.dtype).max)))
+            best = min(options, key=lambda a: int(dist[exits[game.player][a], target]))
+        game.step(best)
+    return game
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Corpus de partidas grabadas de Pac-Man")
+    ap.add_argument("--record", metavar="NIVEL", help="graba una partida de autoplay en ese nivel")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--id", default="", help="nombre de la grabación (por defecto <nivel>_<semilla>)")
+    ap.add_argument("--ghosts", choices=STRATEGIES, default="greedy")
+    ap.add_argument("--depth", type=int, default=4, help="profundidad fija de la búsqueda de los fantasmas")
+    ap.add_argument("--budget-us", type=float, default=DEFAULT_BUDGET_US, help="µs por turno al repetirla")
+    args = ap.parse_args()
+
+    if args.record:
+        ai = make_ai() if args.ghosts == "greedy" else make_ai(args.ghosts, budget_ms=None, max_depth=args.depth)
+        game = autoplay(default_levels().get(args.record), args.seed, ai=ai)
+        replay = record(game, args.budget_us)
+        os.makedirs(REPLAYS_DIR, exist_ok=True)
+        path = replay_path(args.id or f"{args.record}_{args.seed}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(dumps(replay) + "\n")
+        print(f"{os.path.relpath(path)}: {replay.turns} turnos, puntaje {replay.score}, "
+              f"vidas {replay.lives}{', ganó' if replay.win else ''}")
+        return
+
+    failed = 0
+    for replay_id in replay_ids():
+        try:
+            result = check(get_replay(replay_id))
+        except ReplayError as e:
+            print(f"FALLA {replay_id}: {e}")
+            failed += 1
+            continue
+        problems = result.mismatches
+        if result.slow:
+            problems.append(f"{result.us_per_turn:.1f} µs por turno (presupuesto {result.replay.budget_us:.0f})")
+        status = "ok   " if not problems else "FALLA"
+        failed += bool(problems)
+        print(f"{status} {replay_id:20} {result.replay.turns:6d} turnos "
+              f"{result.us_per_turn:6.1f} µs/turno  puntaje {result.game.score}"
+              + (f"  — {'; '.join(problems)}" if problems else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Estado del rompecabezas de intercambio, sin Streamlit.
+
+La permutación vive en un ``array`` compacto y se lleva la cuenta de piezas
+fuera de su lugar, así que un intercambio actualiza "resuelto" y "piezas en
+su lugar" en O(1) en vez de comparar la lista completa contra ``SOLVED``.
+"""
+from __future__ import annotations
+
+import random
+from array import array
+
+MIN_N = 2
+MAX_N = 255  # N*N piezas caben en el typecode "I"
+
+
+class PuzzleState:
+    __slots__ = ("n", "order", "misplaced", "moves")
+
+    def __init__(self, n: int, order=None):
+        if not MIN_N <= n <= MAX_N:
+            raise ValueError(f"N debe estar entre {MIN_N} y {MAX_N}, no {n}")
+        self.n = n
+        self.order = array("I", range(n * n) if order is None else order)
+        if sorted(self.order) != list(range(n * n)):
+            raise ValueError("order no es una permutación de 0..N*N-1")
+        self.misplaced = sum(1 for pos, tile in enumerate(self.order) if pos != tile)
+        self.moves = 0
+
+    @classmethod
+    def shuffled(cls, n: int, rng: random.Random | None = None) -> "PuzzleState":
+        """Permutación aleatoria que nunca sale resuelta.
+
+        En vez de barajar hasta que difiera de la solución, si la baraja sale
+        resuelta (probabilidad 1/(N*N)!) basta con un intercambio.
+        """
+        order = list(range(n * n))
+        (rng or random).shuffle(order)
+        state = cls(n, order)
+        if state.solved:
+            state._swap(0, 1)
+        return state
+
+    @property
+    def size(self) -> int:
+        return len(self.order)
+
+    @property
+    def solved(self) -> bool:
+        return self.misplaced == 0
+
+    @property
+    def in_place(self) -> int:
+        return len(self.order) - self.misplaced
+
+    def _swap(self, a: int, b: int) -> None:
+        order = self.order
+        ta, tb = order[a], order[b]
+        # Solo cambian las casillas a y b: se corrige la cuenta con 4 comparaciones
+        self.misplaced += (tb != a) + (ta != b) - (ta != a) - (tb != b)
+        order[a], order[b] = tb, ta
+
+    def swap(self, a: int, b: int) -> bool:
+        """Intercambia las casillas ``a`` y ``b``; devuelve si quedó resuelto.
+
+        Casillas iguales o fuera del tablero no hacen nada (ni cuentan como
+        movimiento): un índice negativo daría la vuelta y descuadraría
+        ``misplaced``.
+        """
+        size = self.size
+        if a != b and 0 <= a < size and 0 <= b < size:
+            self._swap(a, b)
+            self.moves += 1
+        return self.misplaced == 0
+
+    def tile_at(self, pos: int) -> int:
+        return self.order[pos]
+
+    def __getstate__(self):
+        return (self.n, self.order.tobytes(), self.misplaced, self.moves)
+
+    def __setstate__(self, state):
+        self.n, raw, self.misplaced, self.moves = state
+        self.order = array("I")
+        self.order.frombytes(raw)
@@ -0,0 +1,159 @@
+"""Imágenes ya procesadas como archivos estáticos con nombre por contenido.
+
+Con ``server.enableStaticServing`` Streamlit sirve ``static/`` en
+``/app/static/``. Cada variante, miniatura o sprite se escribe una sola vez
+como ``static/img/<nombre>.<hash><ext>``: la URL cambia si cambia el
+contenido, así que nunca hay que invalidar nada y el script solo manda un
+texto en vez de registrar los bytes en el media file manager en cada rerun.
+
+Streamlit no deja poner ``Cache-Control`` a esos archivos, pero sí manda
+``Last-Modified`` (la fecha del archivo). Sin ``Cache-Control`` el navegador
+aplica frescura heurística (~10% de la antigüedad), por eso los archivos se
+fechan en ``STATIC_MTIME``: años de caché sin volver a preguntar. Como el
+nombre lleva el hash, eso nunca sirve una imagen vieja. Detrás de un proxy se
+puede agregar ``Cache-Control: public, max-age=31536000, immutable`` para
+``/app/static/img/``.
+
+Uso: ``python -m games.static_assets`` pre-genera las variantes de
+``assets/`` y borra las que ya no corresponden a ninguna imagen.
+"""
+from __future__ import annotations
+
+import mimetypes
+import os
+import threading
+
+import streamlit as st
+
+from games.cache import content_digest
+from games.variants import WIDTHS, thumbnail_for_file, variant_for_file
+from games.widgets import media_url
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT, "assets")
+STATIC_DIR = os.path.join(ROOT, "static", "img")
+STATIC_URL = "/app/static/img/"
+# 2000-01-01: solo la usa la frescura heurística del navegador (ver arriba)
+STATIC_MTIME = 946684800
+ASSET_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+# (carpeta, archivo) ya escritos por este proceso: el rerun no toca el disco
+_published: set[tuple[str, str]] = set()
+_published_lock = threading.Lock()
+
+
+def static_enabled() -> bool:
+    """Si las páginas deben usar URLs estáticas (``ASSET_MODE`` = "media" lo apaga)."""
+    if st.secrets.get("ASSET_MODE", "static") != "static":
+        return False
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def static_name(data: bytes, mimetype: str, name: str) -> str:
+    ext = mimetypes.guess_extension(mimetype) or ".bin"
+    if ext == ".jpe":
+        ext = ".jpg"
+    return f"{name}.{content_digest(data)[:16]}{ext}"
+
+
+def publish(data: bytes, mimetype: str, name: str, static_dir: str = STATIC_DIR) -> str:
+    """Escribe ``data`` en ``static/img`` (si no estaba) y devuelve su URL."""
+    filename = static_name(data, mimetype, name)
+    key = (static_dir, filename)
+    with _published_lock:
+        if key in _published:
+            return STATIC_URL + filename
+    path = os.path.join(static_dir, filename)
+    if not os.path.exists(path):
+        os.makedirs(static_dir, exist_ok=True)
+        # Escritura atómica: otra sesión puede estar publicando lo mismo
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    os.utime(path, (STATIC_MTIME, STATIC_MTIME))
+    with _published_lock:
+        _published.add(key)
+    return STATIC_URL + filename
+
+
+def asset_url(data: bytes, mimetype: str, name: str) -> str:
+    """URL estática con hash si está habilitada; si no, la del media file manager.
+
+    Si no se puede escribir en ``static/`` (disco de solo lectura) también
+    cae al media file manager en vez de romper la página.
+    """
+    if static_enabled():
+        try:
+            return publish(data, mimetype, name)
+        except OSError:
+            pass
+    return media_url(data, mimetype, name)
+
+
+def asset_files(assets_dir: str = ASSETS_DIR) -> list[str]:
+    return sorted(
+        os.path.join(assets_dir, f)
+        for f in os.listdir(assets_dir)
+        if f.lower().endswith(ASSET_SUFFIXES)
+    )
+
+
+def stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def variant_url(path: str, width: int) -> str:
+    """URL de ``variant_for_file(path, width)`` (mismo nombre que pre-genera ``main``)."""
+    v = variant_for_file(path, width)
+    return asset_url(v.data, v.mimetype, f"{stem(path)}_{width}")
+
+
+def thumbnail_url(path: str, size: int) -> str:
+    """URL de ``thumbnail_for_file(path, size)``."""
+    t = thumbnail_for_file(path, size)
+    return asset_url(t.data, t.mimetype, f"{stem(path)}_sq{size}")
+
+
+def publish_assets(assets_dir: str = ASSETS_DIR, static_dir: str = STATIC_DIR) -> set[str]:
+    """Publica las variantes y miniaturas de ``assets/`` en todos los anchos.
+
+    Devuelve los nombres de archivo publicados.
+    """
+    names = set()
+    for path in asset_files(assets_dir):
+        for width in WIDTHS:
+            v = variant_for_file(path, width)
+            t = thumbnail_for_file(path, width)
+            names.add(os.path.basename(publish(v.data, v.mimetype, f"{stem(path)}_{width}", static_dir)))
+            names.add(os.path.basename(publish(t.data, t.mimetype, f"{stem(path)}_sq{width}", static_dir)))
+    return names
+
+
+def prune(keep: set[str], static_dir: str = STATIC_DIR) -> int:
+    """Borra de ``static_dir`` lo que no esté en ``keep``; devuelve cuántos.
+
+    Lo que se genera en tiempo de ejecución (sprites del rompecabezas) se
+    vuelve a escribir la próxima vez que una página lo pida.
+    """
+    removed = 0
+    for f in os.listdir(static_dir):
+        if f.startswith(".") or f in keep:
+            continue
+        os.remove(os.path.join(static_dir, f))
+        with _published_lock:
+            _published.discard((static_dir, f))
+        removed += 1
+    return removed
+
+
+def main() -> None:
+    names = publish_assets()
+    removed = prune(names)
+    total = sum(os.path.getsize(os.path.join(STATIC_DIR, n)) for n in names)
+    print(f"{len(names)} archivos en {os.path.relpath(STATIC_DIR, ROOT)} ({total / 1024:.0f} KB), "
+          f"{removed} viejos borrados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Atlas de piezas del rompecabezas, ya codificadas y listas para enviar.
+
+Decodificar ``rompecabezas.jpg``, redimensionarla con LANCZOS y recortar las
+N×N piezas cuesta mucho más que el resto del rerun, y el resultado es el mismo
+para todas las sesiones. Por eso el atlas vive en un LRU del proceso, con
+clave ``(hash del contenido, SIZE, N)``, y cada clic solo hace una búsqueda.
+"""
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Callable
+
+from PIL import Image, ImageOps
+
+from games.cache import BytesLRU, content_digest, file_digest
+from games.variants import open_scaled
+
+TILE_FORMAT = "JPEG"
+TILE_QUALITY = 90
+BORDER_COLOR = (255, 80, 80)
+BORDER_PX = 4
+
+# Unas 36 piezas de 120 px pesan ~250 KB con su versión seleccionada; 48 MB
+# alcanzan para muchas combinaciones de imagen/tamaño sin crecer sin límite.
+ATLAS_MAX_BYTES = 48 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TileAtlas:
+    digest: str
+    size: int
+    n: int
+    tiles: tuple[bytes, ...]      # pieza i, tal cual se manda a st.image
+    selected: tuple[bytes, ...]   # pieza i con el borde de selección
+    sprite: bytes                 # imagen completa SIZE×SIZE para el tablero de un solo elemento
+
+    @property
+    def nbytes(self) -> int:
+        return sum(map(len, self.tiles)) + sum(map(len, self.selected)) + len(self.sprite)
+
+
+_ATLAS = BytesLRU(ATLAS_MAX_BYTES, sizeof=lambda a: a.nbytes)
+
+
+def _encode(im: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    im.save(buf, format=TILE_FORMAT, quality=TILE_QUALITY)
+    return buf.getvalue()
+
+
+def make_tiles(img: Image.Image, n: int) -> list[Image.Image]:
+    step = img.width // n
+    tiles = []
+    for r in range(n):
+        for c in range(n):
+            box = (c * step, r * step, (c + 1) * step, (r + 1) * step)
+            tiles.append(img.crop(box))
+    return tiles
+
+
+def build_atlas(data: bytes, size: int, n: int, digest: str | None = None) -> TileAtlas:
+    # Decodifica ya reducido si la fuente es mucho más grande que SIZE
+    img = open_scaled(io.BytesIO(data), (size, size)).resize((size, size), Image.LANCZOS)
+    tiles = make_tiles(img, n)
+    return TileAtlas(
+        digest=digest or content_digest(data),
+        size=size,
+        n=n,
+        tiles=tuple(_encode(t) for t in tiles),
+        selected=tuple(
+            _encode(ImageOps.expand(t, border=BORDER_PX, fill=BORDER_COLOR)) for t in tiles
+        ),
+        sprite=_encode(img),
+    )
+
+
+def atlas_for_digest(digest: str, size: int, n: int, load: Callable[[], bytes]) -> TileAtlas:
+    """Atlas de una fuente ya identificada por ``digest``; ``load`` solo se
+    llama si el atlas no está en caché."""
+    return _ATLAS.get_or_create(
+        (digest, size, n), lambda: build_atlas(load(), size, n, digest)
+    )
+
+
+def atlas_for_bytes(data: bytes, size: int, n: int) -> TileAtlas:
+    return atlas_for_digest(content_digest(data), size, n, lambda: data)
+
+
+def atlas_for_file(path: str, size: int, n: int) -> TileAtlas:
+    def load() -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    return atlas_for_digest(file_digest(path), size, n, load)
+
+
+def atlas_stats() -> dict:
+    return _ATLAS.stats()
@@ -0,0 +1,174 @@
+"""Variantes de cada imagen en varios anchos, elegidas según la pantalla.
+
+Para JPEG se decodifica ya reducido (``Image.draft`` deja que libjpeg
+descomprima a 1/2, 1/4 u 1/8 del tamaño), y para el resto se usa
+``Image.reduce`` antes del LANCZOS final; así nunca se decodifica a tamaño
+completo una foto que se va a mostrar a 140 px.
+"""
+from __future__ import annotations
+
+import io
+import threading
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+from games.cache import BytesLRU, content_digest, file_digest
+
+# Anchos disponibles (px físicos). El navegador pide el más chico que cubra
+# ancho CSS × devicePixelRatio.
+WIDTHS = (160, 240, 320, 480, 720, 1080)
+VARIANT_QUALITY = 85
+VARIANTS_MAX_BYTES = 32 * 1024 * 1024
+THUMBS_MAX_BYTES = 8 * 1024 * 1024
+
+# Lo que asumimos hasta que el navegador reporta su pantalla (primer rerun)
+DEFAULT_DISPLAY = {"width": 1200, "dpr": 1.0}
+
+
+@dataclass(frozen=True)
+class Variant:
+    data: bytes
+    width: int
+    height: int
+    mimetype: str
+    decode_ms: float   # tiempo de decodificar + escalar (sin codificar)
+
+
+_VARIANTS = BytesLRU(VARIANTS_MAX_BYTES, sizeof=lambda v: len(v.data))
+# Miniaturas cuadradas (cartas de memoria): caché aparte para ver sus aciertos
+_THUMBS = BytesLRU(THUMBS_MAX_BYTES, sizeof=lambda v: len(v.data))
+
+
+def pick_width(css_px: float, dpr: float = 1.0, widths=WIDTHS) -> int:
+    """El ancho más chico que cubre ``css_px`` a la densidad de la pantalla."""
+    need = css_px * max(dpr, 1.0)
+    for w in widths:
+        if w >= need:
+            return w
+    return widths[-1]
+
+
+def open_scaled(fp, target: tuple[int, int], mode: str = "RGB") -> Image.Image:
+    """Abre una imagen decodificando lo menos posible para llegar a ``target``.
+
+    Devuelve una imagen en ``mode`` de al menos ``target`` (salvo que el
+    original sea más chico); el ajuste exacto lo hace quien llama.
+    """
+    img = Image.open(fp)
+    if img.format == "JPEG":
+        # draft elige la mayor escala 1/2^k que sigue cubriendo target
+        img.draft("RGB", target)
+    img = img.convert(mode)
+    factor = min(img.width // max(target[0], 1), img.height // max(target[1], 1))
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img
+
+
+def _square(img: Image.Image) -> Image.Image:
+    side = min(img.size)
+    left = (img.width - side) // 2
+    top = (img.height - side) // 2
+    return img.crop((left, top, left + side, top + side))
+
+
+def build_variant(data: bytes, width: int, square: bool = False) -> Variant:
+    t0 = time.perf_counter()
+    with Image.open(io.BytesIO(data)) as probe:
+        w0, h0 = probe.size
+        has_alpha = probe.mode in ("RGBA", "LA") or "transparency" in probe.info
+    if square:
+        side = min(w0, h0)
+        # Escalamos el lado corto a width; el recorte se hace tras decodificar
+        target = (max(1, w0 * width // side), max(1, h0 * width // side))
+    else:
+        target = (width, max(1, h0 * width // w0))
+    img = open_scaled(io.BytesIO(data), target, "RGBA" if has_alpha else "RGB")
+    if square:
+        img = _square(img)
+        target = (width, width)
+    if img.size != target and img.width > target[0]:
+        img = img.resize(target, Image.LANCZOS)
+    decode_ms = (time.perf_counter() - t0) * 1e3
+
+    buf = io.BytesIO()
+    if has_alpha:
+        # Con transparencia nos quedamos en PNG
+        img.save(buf, format="PNG", optimize=True)
+        mimetype = "image/png"
+    else:
+        img.save(buf, format="JPEG", quality=VARIANT_QUALITY, optimize=True, progressive=True)
+        mimetype = "image/jpeg"
+    return Variant(buf.getvalue(), img.width, img.height, mimetype, decode_ms)
+
+
+def variant_for_file(path: str, width: int, square: bool = False) -> Variant:
+    digest = file_digest(path)
+
+    def load() -> Variant:
+        with open(path, "rb") as f:
+            return build_variant(f.read(), width, square)
+
+    return _VARIANTS.get_or_create((digest, width, square), load)
+
+
+def variant_for_bytes(data: bytes, width: int, square: bool = False) -> Variant:
+    return _VARIANTS.get_or_create(
+        (content_digest(data), width, square), lambda: build_variant(data, width, square)
+    )
+
+
+def variant_stats() -> dict:
+    return _VARIANTS.stats()
+
+
+# ===================================================================================
+# Miniaturas cuadradas
+# ===================================================================================
+def thumbnail_for_file(path: str, size: int) -> Variant:
+    """Miniatura ``size``×``size`` (recorte centrado), codificada una sola vez.
+
+    El caché es del proceso: todas las sesiones comparten la misma miniatura
+    mientras el archivo no cambie.
+    """
+    digest = file_digest(path)
+
+    def load() -> Variant:
+        with open(path, "rb") as f:
+            return build_variant(f.read(), size, square=True)
+
+    return _THUMBS.get_or_create((digest, size), load)
+
+
+_warmed: set = set()
+_warmed_lock = threading.Lock()
+
+
+def warm_thumbnails(paths, size: int) -> threading.Thread | None:
+    """Genera en segundo plano las miniaturas que falten (una vez por tamaño).
+
+    Devuelve el hilo si se lanzó uno; un segundo llamado con los mismos
+    archivos y tamaño no hace nada.
+    """
+    key = (tuple(paths), size)
+    with _warmed_lock:
+        if key in _warmed:
+            return None
+        _warmed.add(key)
+
+    def run() -> None:
+        for path in paths:
+            try:
+                thumbnail_for_file(path, size)
+            except OSError:
+                pass  # la carta lo reintentará (y mostrará el error) al destaparse
+
+    thread = threading.Thread(target=run, name="thumbnail-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def thumbnail_stats() -> dict:
+    return _THUMBS.stats()
@@ -0,0 +1,126 @@
+"""Componentes propios de Streamlit (un solo frontend estático en ``frontend/``).
+
+Todos los widgets comparten el mismo ``declare_component``; el argumento
+``kind`` elige qué script del frontend pinta el iframe. No hace falta build:
+``frontend/`` son archivos HTML/JS planos.
+"""
+from __future__ import annotations
+
+import base64
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit import runtime
+
+from games.variants import DEFAULT_DISPLAY
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_component = components.declare_component("lets_play", path=_FRONTEND_DIR)
+
+
+def media_url(data: bytes, mimetype: str, key: str) -> str:
+    """Registra ``data`` en el media file manager y devuelve su URL.
+
+    Es lo mismo que hace ``st.image`` por dentro: la URL depende del
+    contenido, así que el navegador la cachea y no la vuelve a pedir en los
+    siguientes reruns. Sin runtime (modo "bare") cae a un data URI.
+    """
+    if runtime.exists():
+        return runtime.get_instance().media_file_mgr.add(data, mimetype, f"lets_play.{key}")
+    return f"data:{mimetype};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def consume_event(key: str, value: dict | None = None) -> dict | None:
+    """Devuelve el evento del componente ``key`` solo la primera vez que llega.
+
+    Streamlit repite el último valor del componente en cada rerun; los eventos
+    traen un ``seq`` creciente y aquí se descartan los ya aplicados. Sin
+    ``value`` se lee de ``st.session_state``, lo que permite aplicar el evento
+    antes de volver a pintar el componente.
+    """
+    if value is None:
+        value = st.session_state.get(key)
+    if not isinstance(value, dict) or "seq" not in value:
+        return None
+    seen_key = f"_{key}_seq"
+    if value["seq"] <= st.session_state.get(seen_key, 0):
+        return None
+    st.session_state[seen_key] = value["seq"]
+    return value
+
+
+def puzzle_board(sprite_url: str, n: int, order: list[int], key: str, locked: bool = False) -> dict | None:
+    """Tablero del rompecabezas en un solo elemento.
+
+    Devuelve ``{"seq", "a", "b"}`` cuando el jugador intercambia dos casillas
+    (la selección de la primera casilla no genera rerun).
+    """
+    value = _component(
+        kind="puzzle_board", sprite=sprite_url, n=n, order=list(order),
+        locked=locked, key=key, default=None,
+    )
+    return consume_event(key, value)
+
+
+def client_display(key: str = "viewport") -> dict:
+    """Ancho CSS disponible y devicePixelRatio que reporta el navegador.
+
+    El primer rerun todavía no los conoce y devuelve ``DEFAULT_DISPLAY``; el
+    componente manda los reales una sola vez (y otra si cambia el tamaño).
+    """
+    known = st.session_state.get(key)
+    value = _component(kind="viewport", known=known, key=key, default=None)
+    return {**DEFAULT_DISPLAY, **(value or {})}
+
+
+def crossword_grid(rows: int, cols: int, mask: str, numbers: dict, values: str, key: str,
+                   submit_label: str = "Enviar", locked: bool = False) -> dict | None:
+    """Grilla del crucigrama que se llena en el navegador y se envía completa.
+
+    ``mask`` y ``values`` son cadenas de ``rows*cols`` caracteres por filas:
+    en ``mask`` "1" marca una casilla con letra (la solución nunca viaja al
+    navegador) y en ``values`` un espacio es una casilla vacía. Devuelve
+    ``{"seq", "values"}`` solo al enviar; escribir letras no genera reruns.
+    """
+    value = _component(
+        kind="crossword_grid", rows=rows, cols=cols, mask=mask,
+        numbers=sorted(numbers.items()), values=values, submit_label=submit_label,
+        locked=locked, key=key, default=None,
+    )
+    return consume_event(key, value)
+
+
+def memory_game(images: list[str], deck: list[int], matched: list[int], cols: int, game: str,
+                key: str, locked: bool = False) -> dict | None:
+    """Juego de memoria que voltea las cartas en el navegador.
+
+    ``images`` son las URLs por id de imagen (se cargan una vez por partida,
+    identificada por ``game``), ``deck`` el id de imagen de cada carta y
+    ``matched`` las cartas ya emparejadas según el servidor. Devuelve
+    ``{"seq", "a", "b"}`` por cada par destapado; la primera carta, la espera
+    y el volteo de un par que no coincide no generan reruns.
+    """
+    value = _component(
+        kind="memory_game", images=list(images), deck=list(deck), matched=list(matched),
+        cols=cols, game=game, locked=locked, key=key, default=None,
+    )
+    return consume_event(key, value)
+
+
+def pacman_board(frame: dict, cols: int, cell: int, key: str, locked: bool = False) -> dict | None:
+    """Tablero de Pac-Man que se actualiza por casillas y junta las jugadas.
+
+    ``frame`` sale de ``games.pacman_board.BoardView.frame``: el laberinto
+    completo solo en el primer envío de la partida y luego únicamente el
+    jugador, los fantasmas y las casillas que cambiaron. Las jugadas
+    (teclado, deslizar o el pad) se encolan en el navegador y llegan por
+    lotes como ``{"seq", "moves": "udlr…"}``: un rerun por lote, no por
+    jugada. ``{"seq", "resync": True}`` pide el laberinto otra vez cuando el
+    navegador no tiene la revisión base (p. ej. el iframe se volvió a crear).
+    """
+    value = _component(
+        kind="pacman_board", cols=cols, cell=cell, locked=locked,
+        ack=st.session_state.get(f"_{key}_seq", 0), key=key, default=None, **frame,
+    )
+    return consume_event(key, value)
@@ -21,10 +21,15 @@
 
 #####################
 import streamlit as st
-from PIL import Image, ImageOps
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import random, io
+
+from games.http_cache import default_cache
+from games.puzzle import PuzzleState
+from games.static_assets import asset_url
+from games.tiles import TileAtlas, atlas_for_bytes, atlas_for_digest, atlas_for_file
+from games.variants import pick_width
+from games.widgets import client_display, consume_event, puzzle_board
 
 st.set_page_config(page_title="Cuadro 1 — Rompecabezas", page_icon="🧩", layout="wide")
 
@@ -59,55 +64,75 @@ st.write("Es una idea de nuestra casita, porque nuestro hogar somos tu y yo sin
 
 # ======= Config fija (6x6) =======
 N = 6              # <-- fijo, sin slider
-SIZE = 720         # tamaño del lienzo cuadrado en px (ajusta si quieres más/menos grande)
+# Tamaño del lienzo cuadrado en px: el más chico de estos que cubra el ancho
+# de la pantalla × devicePixelRatio (720 como máximo, igual que antes).
+PUZZLE_SIZES = (360, 480, 720)
+display = client_display()
+SIZE = pick_width(display["width"], display["dpr"], PUZZLE_SIZES)
+# "sprite": el tablero es un solo elemento (una imagen + CSS por casilla).
+# "tiles": el tablero clásico de N×N st.image + st.button.
+BOARD_MODE = st.secrets.get("PUZZLE_BOARD_MODE", "sprite")
 
 # ======= Carga de imagen =======
-def load_base_image() -> Image.Image:
+# Las piezas salen del atlas compartido (games/tiles.py): solo se decodifica y
+# recorta la imagen la primera vez por proceso; los clics son una búsqueda.
+BASE_IMAGE_PATH = "assets/rompecabezas.jpg"
+
+def load_tile_atlas() -> TileAtlas:
     url = st.secrets.get("PUZZLE_IMAGE_URL", "")
     if url:
         try:
-            import urllib.request
-            with urllib.request.urlopen(url) as resp:
-                return Image.open(io.BytesIO(resp.read())).convert("RGB")
+            # Caché en disco con TTL y revalidación en segundo plano: solo la
+            # primera descarga bloquea, y siempre con timeout y tamaño máximo.
+            entry = default_cache().get(url)
+            return atlas_for_digest(entry.digest, SIZE, N, entry.read)
         except Exception as e:
             st.warning(f"No pude leer PUZZLE_IMAGE_URL: {e}. Intento con archivo local…")
     try:
-        return Image.open("assets/rompecabezas.jpg").convert("RGB")
+        return atlas_for_file(BASE_IMAGE_PATH, SIZE, N)
     except Exception:
         st.error("No encontré assets/rompecabezas.jpg. Sube la imagen ahí o define PUZZLE_IMAGE_URL en Secrets.")
         up = st.file_uploader("Sube la imagen del rompecabezas (JPG/PNG)", type=["jpg","jpeg","png"])
         if up:
-            return Image.open(up).convert("RGB")
+            return atlas_for_bytes(up.getvalue(), SIZE, N)
         st.stop()
 
-base_img = load_base_image().resize((SIZE, SIZE), Image.LANCZOS)
-
-# ======= Construcción de tiles =======
-def make_tiles(img: Image.Image, n: int):
-    step = img.width // n
-    tiles = []
-    for r in range(n):
-        for c in range(n):
-            box = (c*step, r*step, (c+1)*step, (r+1)*step)
-            tiles.append(img.crop(box))
-    return tiles
-
-tiles_master = make_tiles(base_img, N)
-SOLVED = list(range(N*N))
+atlas = load_tile_atlas()
 
 # ======= Estado del puzzle =======
 def init_puzzle():
     st.session_state.puzzle_n = N
-    st.session_state.tiles_order = SOLVED.copy()
-    while st.session_state.tiles_order == SOLVED:
-        random.shuffle(st.session_state.tiles_order)
+    # Permutación + cuenta de piezas fuera de lugar (games/puzzle.py)
+    st.session_state.puzzle = PuzzleState.shuffled(N)
     st.session_state.sel = None      # casilla seleccionada (índice pos 0..N*N-1)
-    st.session_state.moves = 0
     st.session_state.puzzle_solved = False
 
-if "puzzle_n" not in st.session_state or st.session_state.puzzle_n != N:
+if "puzzle" not in st.session_state or st.session_state.puzzle_n != N:
     init_puzzle()
 
+puzzle: PuzzleState = st.session_state.puzzle
+
+def swap_tiles(a: int, b: int):
+    # Intercambia (si son diferentes) y dice en O(1) si quedó resuelto
+    if puzzle.swap(a, b):
+        st.session_state.puzzle_solved = True
+        st.balloons()
+        st.success(f"🎉 ¡Rompecabezas resuelto en {puzzle.moves} movimientos!")
+
+# En modo sprite el intercambio llega como evento del componente; lo aplicamos
+# antes de pintar nada para que métricas y tablero salgan ya actualizados en
+# este mismo rerun (sin st.rerun extra).
+if BOARD_MODE == "sprite" and not st.session_state.puzzle_solved:
+    event = consume_event("pz_board")
+    if event:
+        # El evento viene del navegador: solo casillas válidas y distintas
+        try:
+            a, b = int(event["a"]), int(event["b"])
+        except (KeyError, TypeError, ValueError):
+            a = b = -1
+        if a != b and 0 <= a < N * N and 0 <= b < N * N:
+            swap_tiles(a, b)
+
 # ======= Controles superiores =======
 left, sp, right = st.columns([1,2,1])
 
@@ -115,7 +140,8 @@ with left:
     if st.button("🔀 Mezclar"):
         init_puzzle()
         st.rerun()
-    st.metric("Movimientos", st.session_state.get("moves", 0))
+    st.metric("Movimientos", puzzle.moves)
+    st.metric("Piezas en su lugar", f"{puzzle.in_place}/{puzzle.size}")
 
 with right:
     # Habilitar solo si está resuelto
@@ -129,46 +155,46 @@ with right:
 st.divider()
 
 # ======= Render del tablero =======
-def bordered(im: Image.Image, color=(255, 80, 80), px=4):
-    return ImageOps.expand(im, border=px, fill=color)
-
-rows = [st.columns(N, gap="small") for _ in range(N)]
-
-for r in range(N):
-    for c in range(N):
-        pos = r*N + c
-        tile_idx = st.session_state.tiles_order[pos]
-        tile_img = tiles_master[tile_idx]
-
-        # Si esta casilla está seleccionada, le ponemos borde
-        if st.session_state.sel is not None and st.session_state.sel == pos:
-            tile_img = bordered(tile_img)
-
-        with rows[r][c]:
-            st.image(tile_img, use_container_width=True)
-            # El botón no tiene texto visible, solo ocupa el ancho para el click
-            if st.button(" ", key=f"tile_btn_{pos}", help=f"Seleccionar casilla {pos+1}", use_container_width=True):
-                # Primera selección
-                if st.session_state.sel is None:
-                    st.session_state.sel = pos
-                    st.rerun()
-                else:
-                    a = st.session_state.sel
-                    b = pos
-                    # Si son diferentes, intercambiar
-                    if a != b:
-                        order = st.session_state.tiles_order
-                        order[a], order[b] = order[b], order[a]
-                        st.session_state.moves += 1
-                    # Quitar selección
-                    st.session_state.sel = None
-                    # ¿Quedó resuelto?
-                    if st.session_state.tiles_order == SOLVED:
-                        st.session_state.puzzle_solved = True
-                        st.balloons()
-                        st.success(f"🎉 ¡Rompecabezas resuelto en {st.session_state.moves} movimientos!")
+def render_sprite_board():
+    # Una sola imagen para todo el tablero; cada casilla la recorta con
+    # background-position y el borde de selección es CSS del navegador.
+    sprite = asset_url(atlas.sprite, "image/jpeg", "pz_sprite")
+    puzzle_board(sprite, N, puzzle.order, key="pz_board",
+                 locked=st.session_state.puzzle_solved)
+
+def render_tiles_board():
+    rows = [st.columns(N, gap="small") for _ in range(N)]
+
+    for r in range(N):
+        for c in range(N):
+            pos = r*N + c
+            tile_idx = puzzle.tile_at(pos)
+
+            # Si esta casilla está seleccionada, usamos la versión con borde
+            # (cada pieza sale una vez por tablero: su índice sirve de nombre)
+            if st.session_state.sel is not None and st.session_state.sel == pos:
+                tile_url = asset_url(atlas.selected[tile_idx], "image/jpeg", f"pz_sel_{tile_idx}")
+            else:
+                tile_url = asset_url(atlas.tiles[tile_idx], "image/jpeg", f"pz_tile_{tile_idx}")
+
+            with rows[r][c]:
+                st.image(tile_url, use_container_width=True)
+                # El botón no tiene texto visible, solo ocupa el ancho para el click
+                if st.button(" ", key=f"tile_btn_{pos}", help=f"Seleccionar casilla {pos+1}", use_container_width=True):
+                    # Primera selección
+                    if st.session_state.sel is None:
+                        st.session_state.sel = pos
+                    else:
+                        swap_tiles(st.session_state.sel, pos)
+                        # Quitar selección
+                        st.session_state.sel = None
                     st.rerun()
 
+if BOARD_MODE == "sprite":
+    render_sprite_board()
+else:
+    render_tiles_board()
+
 # Mensaje de estado
 if not st.session_state.puzzle_solved:
     st.info("Selecciona una casilla y luego otra para **intercambiar** las piezas (solo esas dos).")
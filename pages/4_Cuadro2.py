@@ -2,7 +2,11 @@ import streamlit as st
 import unicodedata
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from collections import defaultdict
+
+from games.crossword import LAYOUT_BUDGET, LayoutError
+from games.crossword_state import CrosswordState, word_index_for
+from games.packs import DEFAULT_PACK, PackError, default_packs
+from games.widgets import consume_event, crossword_grid
 
 st.set_page_config(page_title="Cuadro 2 — Crucigrama", page_icon="🧠", layout="wide")
 
@@ -24,202 +28,46 @@ st.title("🧠 Crucigrama")
 st.caption(f"Hora local: {datetime.now(TZ).strftime('%Y-%m-%d %H:%M:%S')}")
 
 # ===================================================================================
-# 1) PISTAS (7 horizontales y 7 verticales) — en el orden que diste
-#    Primeras 7 -> horizontales, últimas 7 -> verticales
-# ===================================================================================
-CLUES = [
-    ("Cada fin de mes es el...", "buffetaco"),
-    ("La mezcla de nuestros colores favoritos es el color...", "morado"),
-    ("Desde siempre te ha gustado un juego de nintendo llamado", "metroid"),
-    ("Tu dices rana y yo...", "salto"),
-    ("Los tacos son ricos, pero no más que...", "tu"),
-    ("Cuando viajemos a Alemania fijo hay que ir por una...", "chela"),
-    ("Debemos encontrar la receta del... de &café", "blackfrost"),
-    ("Si por nosotros fuera, ya estuvieramos...", "casados"),
-    ("Este juego tiene varias adaptaciones como: la puerta del infierno y aniquilación", "doom"),
-    ("En las noches o en tiempo libres se juega...para repartir democracia", "helldivers"),
-    ("...es un sanguinario señor de la guerra proveninente de tiempos olvidados al que los siglos han visto nacer en tres ocasiones y morir en otras dos", "mordekaiser"),
-    ("No hay mejor escudería en fórmula 1 que...", "mclaren"),
-    ("Es como un mundo donde construímos nuestra casa, nuestro huerto y luchamos contra monstruos", "minecraft"),
-    ("Es el comandante supremo de los Autobots en su lucha contra los Decepticons", "optimusprime"),
-]
-
-def normalize_answer(s: str) -> str:
-    s = s.lower()
-    s = "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")  # sin acentos
-    s = "".join(ch for ch in s if "a" <= ch <= "z")  # solo letras
-    return s
-
-WORDS_ALL = [(q, normalize_answer(a)) for q, a in CLUES]
-for q, w in WORDS_ALL:
-    if not w:
-        st.error(f"La respuesta de la pista '{q}' quedó vacía tras normalizar. Revísala.")
-        st.stop()
-
-ACROSS = WORDS_ALL[:7]   # 7 horizontales
-DOWN   = WORDS_ALL[7:]   # 7 verticales
-
-# ===================================================================================
-# 2) Generador de crucigrama con separación (no se pegan palabras)
-#    Reglas:
-#    - Las horizontales se colocan en filas distintas (con huecos antes/después).
-#    - Las verticales deben cruzar alguna horizontal (preferido) y no crear adyacencias horizontales
-#      fuera del cruce. También dejamos celda libre antes y después de cada palabra.
+# 1) PISTAS — paquete de packs/crossword/ (games/packs.py)
+#    Se elige con ?pack=<id> o el secreto CROSSWORD_PACK; el índice solo lista
+#    nombres de archivo y el paquete se lee la primera vez que se pide.
 # ===================================================================================
-H, V = "H", "V"
-grid = {}                       # (r,c) -> letra
-letters_positions = defaultdict(list)  # ch -> [(r,c)]
-placed = []                     # {word, clue, orient, row, col}
-
-def occ(r,c): return (r,c) in grid
-
-def can_place(word, r, c, orient):
-    L = len(word)
-    for i, ch in enumerate(word):
-        rr = r + (i if orient == V else 0)
-        cc = c + (i if orient == H else 0)
-        if occ(rr, cc) and grid[(rr, cc)] != ch:
-            return False
-        # Para evitar pegado, si esta celda sería nueva (no existe aún),
-        # no puede tener vecinos laterales formando palabra horizontal accidental.
-        if not occ(rr, cc):
-            if occ(rr, cc-1) or occ(rr, cc+1):
-                # salvo que esos vecinos pertenezcan al cruce exacto (misma letra),
-                # lo bloqueamos para no crear "palabras pegadas".
-                # Aquí simplificamos: si hay vecino, no permitimos (evita "sin texto").
-                return False
-    # Celda anterior y posterior (antes/después de la palabra) deben estar vacías
-    before = (r, c-1) if orient == H else (r-1, c)
-    after  = (r, c+L) if orient == H else (r+L, c)
-    if occ(*before) or occ(*after):
-        return False
-    return True
-
-def place_word(word, clue, r, c, orient):
-    placed.append({"word": word, "clue": clue, "orient": orient, "row": r, "col": c})
-    for i, ch in enumerate(word):
-        rr = r + (i if orient == V else 0)
-        cc = c + (i if orient == H else 0)
-        grid[(rr, cc)] = ch
-        letters_positions[ch].append((rr, cc))
-
-def place_across_rows():
-    # Colocamos cada ACROSS en una fila distinta, con un pequeño offset alterno
-    row = 0
-    offset = 0
-    for clue, w in ACROSS:
-        # buscamos una columna donde quepa con separación
-        placed_ok = False
-        for col in range(offset, offset + 60):  # margen amplio
-            if can_place(w, row, col, H):
-                place_word(w, clue, row, col, H)
-                placed_ok = True
-                break
-        if not placed_ok:
-            st.error(f"No pude colocar la horizontal '{w}'.")
-            st.stop()
-        row += 2           # deja una fila vacía entre horizontales
-        offset = (offset + 3) % 10  # mueve ligeramente el inicio
-    return
-
-def place_down_words():
-    for clue, w in DOWN:
-        placed_ok = False
-        # intenta cruzar con cualquier letra existente
-        for i, ch in enumerate(w):
-            for (rr, cc) in letters_positions.get(ch, []):
-                r0 = rr - i
-                c0 = cc
-                if can_place(w, r0, c0, V):
-                    place_word(w, clue, r0, c0, V)
-                    placed_ok = True
-                    break
-            if placed_ok: break
-        if not placed_ok:
-            # Si no logra cruzar, intenta ponerla en una columna libre sin adyacencias
-            # (aún así serán 7 V, pero quizá con menos cruces).
-            for col in range(-20, 40):
-                for row in range(-20, 40):
-                    if can_place(w, row, col, V):
-                        place_word(w, clue, row, col, V)
-                        placed_ok = True
-                        break
-                if placed_ok: break
-        if not placed_ok:
-            st.error(f"No pude colocar la vertical '{w}'.")
-            st.stop()
-
-# Ejecuta la colocación
-place_across_rows()
-place_down_words()
-
-# Compacta a bounding box
-min_r = min(r for r, _ in grid.keys())
-max_r = max(r for r, _ in grid.keys())
-min_c = min(c for _, c in grid.keys())
-max_c = max(c for _, c in grid.keys())
-ROWS = max_r - min_r + 1
-COLS = max_c - min_c + 1
-
-solution = {(r - min_r, c - min_c): ch for (r, c), ch in grid.items()}
+PACK_ID = st.query_params.get("pack") or st.secrets.get("CROSSWORD_PACK", DEFAULT_PACK)
+packs = default_packs()
+try:
+    pack = packs.get(PACK_ID)
+except PackError as e:
+    st.error(str(e))
+    st.stop()
 
 # ===================================================================================
-# 3) Numeración de "across" y "down" desde la grilla final
+# 2) Layout (colocación, compactado y numeración) — games/crossword.py
+#    Se calcula una vez por contenido de las pistas y se comparte entre
+#    sesiones; escribir una letra ya no regenera nada. El layout precompilado
+#    vive junto al paquete (<id>.layout.json) y solo se regenera si cambia
+#    el hash de sus pistas.
+#    Con CROSSWORD_SEEDS > 1 se prueban varias semillas en paralelo (hasta
+#    CROSSWORD_BUDGET segundos) y se queda el layout de mejor puntaje; ese va
+#    a su propio archivo (<id>.s<K>.layout.json) y no pisa el del repo.
 # ===================================================================================
-def is_letter(r, c): return (r, c) in solution
-
-def starts_across(r, c):
-    if not is_letter(r, c): return False
-    if c > 0 and is_letter(r, c-1): return False
-    if c+1 < COLS and is_letter(r, c+1): return True
-    return False
-
-def starts_down(r, c):
-    if not is_letter(r, c): return False
-    if r > 0 and is_letter(r-1, c): return False
-    if r+1 < ROWS and is_letter(r+1, c): return True
-    return False
-
-def collect_word(r, c, orient):
-    s = []
-    rr, cc = r, c
-    while 0 <= rr < ROWS and 0 <= cc < COLS and is_letter(rr, cc):
-        s.append(solution[(rr, cc)])
-        if orient == "H":
-            if cc+1 >= COLS or not is_letter(rr, cc+1): break
-            cc += 1
-        else:
-            if rr+1 >= ROWS or not is_letter(rr+1, cc): break
-            rr += 1
-    return "".join(s)
-
-num_map = {}
-across_list = []
-down_list = []
-counter = 1
+CROSSWORD_SEEDS = int(st.secrets.get("CROSSWORD_SEEDS", 1))
+CROSSWORD_BUDGET = float(st.secrets.get("CROSSWORD_BUDGET", LAYOUT_BUDGET))
+try:
+    layout = packs.layout(pack, seeds=CROSSWORD_SEEDS, budget=CROSSWORD_BUDGET)
+except LayoutError as e:
+    st.error(str(e))
+    st.stop()
 
-for r in range(ROWS):
-    for c in range(COLS):
-        started = False
-        if starts_across(r, c):
-            w = collect_word(r, c, "H")
-            across_list.append((counter, w))
-            num_map[(r, c)] = counter
-            counter += 1
-            started = True
-        if starts_down(r, c):
-            w = collect_word(r, c, "V")
-            if not started:
-                num_map[(r, c)] = counter
-                counter += 1
-            down_list.append((num_map[(r, c)], w))
+ROWS, COLS = layout.rows, layout.cols
+solution = layout.solution
+num_map = layout.num_map
+across_list = layout.across_list
+down_list = layout.down_list
 
-# Mapas palabra->pista (para mostrar texto correcto)
-ACROSS_WORD_TO_CLUE = {normalize_answer(ans): q for q, ans in ACROSS}
-DOWN_WORD_TO_CLUE   = {normalize_answer(ans): q for q, ans in DOWN}
+is_letter = layout.is_letter   # grilla densa: una fila de bytes por fila
 
 # ===================================================================================
-# 4) Entradas del usuario (solo minúscula sin tildes)
+# 3) Entradas del usuario (solo minúscula sin tildes)
 # ===================================================================================
 def sanitize_cell(s: str) -> str:
     s = s.lower()
@@ -227,20 +75,59 @@ def sanitize_cell(s: str) -> str:
     s = "".join(ch for ch in s if "a" <= ch <= "z")
     return s[:1]
 
-if "cw_inputs" not in st.session_state or st.session_state.get("cw_shape") != (ROWS, COLS):
+if "cw_inputs" not in st.session_state or st.session_state.get("cw_digest") != layout.digest:
     st.session_state.cw_inputs = {k: "" for k in solution.keys()}
     st.session_state.cw_shape = (ROWS, COLS)
+    st.session_state.cw_digest = layout.digest
     st.session_state.crossword_solved = False
 
+# Progreso por palabra: cada casilla sabe qué palabras la cruzan, así que
+# escribir una letra actualiza solo esas dos palabras (sin recorrer la grilla)
+word_index = word_index_for(layout)
+if st.session_state.get("cw_state") is None or st.session_state.cw_state.index is not word_index:
+    st.session_state.cw_state = CrosswordState(word_index)
+    for (r, c), ch in st.session_state.cw_inputs.items():
+        st.session_state.cw_state.set(r, c, ch)
+
+def set_cell(r, c, val):
+    st.session_state.cw_inputs[(r, c)] = val
+    st.session_state.cw_state.set(r, c, val)
+
+# Cómo se escriben las letras:
+#   "grid"  -> un solo componente: se escribe en el navegador (el cursor avanza
+#              por la palabra) y la grilla viaja completa al pulsar Validar
+#   "form"  -> las casillas clásicas dentro de un st.form (un rerun por envío)
+#   "cells" -> las casillas clásicas, un rerun por letra
+CROSSWORD_INPUT_MODE = st.secrets.get("CROSSWORD_INPUT_MODE", "grid")
+GRID_KEY = "cw_grid"
+
+def grid_values() -> str:
+    inputs = st.session_state.cw_inputs
+    return "".join(inputs.get((r, c), "") or " " for r in range(ROWS) for c in range(COLS))
+
+def validate_inputs():
+    total = st.session_state.cw_state.total
+    correct = st.session_state.cw_state.correct
+    if correct == total:
+        st.session_state.crossword_solved = True
+        st.session_state.cuadro2_solved = True      # <- 🔓 habilita Cuadro 3
+        st.success("🎉 ¡Crucigrama completado!")
+    else:
+        st.warning(f"Letras correctas: {correct}/{total}. Sigue intentando.")
+
+# El envío del componente se aplica antes de pintar nada
+submitted = False
+if CROSSWORD_INPUT_MODE == "grid":
+    event = consume_event(GRID_KEY)
+    if event and len(event.get("values", "")) == ROWS * COLS:
+        for (r, c) in solution:
+            set_cell(r, c, sanitize_cell(event["values"][r * COLS + c]))
+        submitted = True
+
 # ===================================================================================
-# 5) UI: grilla (izquierda) + pistas (derecha)
+# 4) UI: grilla (izquierda) + pistas (derecha)
 # ===================================================================================
-left, right = st.columns([3, 1], gap="large")
-
-with left:
-    st.subheader("Completa el crucigrama")
-    st.write("Escribe solo minúsculas y sin tildes. Una letra por casilla mi amor 😘, en este juego hay palabras que decimos muy seguido corazón👀❤️.")
-
+def render_cells_grid():
     for r in range(ROWS):
         cols = st.columns(COLS, gap="small")
         for c in range(COLS):
@@ -263,31 +150,45 @@ with left:
                     )
                     val = sanitize_cell(val)
                     if val != st.session_state.cw_inputs.get((r, c), ""):
-                        st.session_state.cw_inputs[(r, c)] = val
+                        set_cell(r, c, val)
                 else:
                     st.markdown(
                         "<div style='width:100%; aspect-ratio:1/1; background:#111; border-radius:6px;'></div>",
                         unsafe_allow_html=True
                     )
 
+left, right = st.columns([3, 1], gap="large")
+
+with left:
+    st.subheader("Completa el crucigrama")
+    st.write("Escribe solo minúsculas y sin tildes. Una letra por casilla mi amor 😘, en este juego hay palabras que decimos muy seguido corazón👀❤️.")
+
+    if CROSSWORD_INPUT_MODE == "grid":
+        crossword_grid(
+            ROWS, COLS, layout.mask(),
+            {r * COLS + c: n for (r, c), n in num_map.items()},
+            grid_values(), key=GRID_KEY, submit_label="✅ Validar",
+        )
+    elif CROSSWORD_INPUT_MODE == "form":
+        with st.form("cw_form", border=False):
+            render_cells_grid()
+            submitted = st.form_submit_button("✅ Validar")
+    else:
+        render_cells_grid()
+
     st.write("")
     # ===== Botonera: validar | limpiar | volver
     c1, c2, c3 = st.columns([1,1,2])
     with c1:
-        if st.button("✅ Validar"):
-            total = len(solution)
-            correct = sum(1 for pos, ch in solution.items()
-                          if st.session_state.cw_inputs.get(pos, "") == ch)
-            if correct == total:
-                st.session_state.crossword_solved = True
-                st.session_state.cuadro2_solved = True      # <- 🔓 habilita Cuadro 3
-                st.success("🎉 ¡Crucigrama completado!")
-            else:
-                st.warning(f"Letras correctas: {correct}/{total}. Sigue intentando.")
+        if CROSSWORD_INPUT_MODE == "cells":
+            submitted = st.button("✅ Validar")
+        if submitted:
+            validate_inputs()
     with c2:
         if st.button("🗑️ Borrar entradas"):
             for k in list(st.session_state.cw_inputs.keys()):
                 st.session_state.cw_inputs[k] = ""
+            st.session_state.cw_state.clear()
             st.session_state.crossword_solved = False
             st.rerun()
     with c3:
@@ -305,13 +206,20 @@ with left:
 
 with right:
     st.subheader("Pistas")
-    st.markdown("**Horizontales (7)**")
-    for num, w in across_list:
-        clue_text = ACROSS_WORD_TO_CLUE.get(w, "(sin texto)")
-        st.markdown(f"**{num}.** {clue_text}")
+    cw_state = st.session_state.cw_state
+    n_words = len(word_index.words)
+    st.progress(cw_state.words_done / n_words,
+                text=f"Palabras completas: {cw_state.words_done}/{n_words}")
+
+    def clue_line(orient, num, clue_text):
+        done = cw_state.word_done(word_index.by_number[(orient, num)])
+        return f"{'✅ ' if done else ''}**{num}.** {clue_text}"
+
+    st.markdown(f"**Horizontales ({len(across_list)})**")
+    for num, w, clue_text in across_list:
+        st.markdown(clue_line("H", num, clue_text))
 
     st.markdown("---")
-    st.markdown("**Verticales (7)**")
-    for num, w in down_list:
-        clue_text = DOWN_WORD_TO_CLUE.get(w, "(sin texto)")
-        st.markdown(f"**{num}.** {clue_text}")
+    st.markdown(f"**Verticales ({len(down_list)})**")
+    for num, w, clue_text in down_list:
+        st.markdown(clue_line("V", num, clue_text))
@@ -1,8 +1,14 @@
 import streamlit as st
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import random, time
-from PIL import Image
+import math, os, time
+
+from games.cache import content_digest
+from games.collage import collage_job, collage_stats
+from games.memory import MemoryGame, deck_images
+from games.static_assets import asset_url, thumbnail_url
+from games.variants import pick_width, thumbnail_stats, warm_thumbnails
+from games.widgets import client_display, consume_event, memory_game
 
 st.set_page_config(page_title="Cuadro 3 — Memoria", page_icon="🧠", layout="wide")
 
@@ -25,23 +31,32 @@ st.caption(f"Hora local: {datetime.now(TZ).strftime('%Y-%m-%d %H:%M:%S')}")
 st.subheader("Empareja las fotos")
 st.write("En este juego mi lindo, hay fotos de nosotros de momentos increíbles💖. La idea es que al terminar el juego tengas un pequeño collage nuestro de recuerdos de este año amor💫.")
 
-# ====== Configuración de imágenes (10 pares -> 20 cartas) ======
-IMG_PATHS = [
-    "assets/1.jpeg",
-    "assets/2.jpeg",
-    "assets/3.jpeg",
-    "assets/4.jpeg",
-    "assets/5.jpeg",
-    "assets/6.jpeg",
-    "assets/7.jpeg",
-    "assets/8.jpeg",
-    "assets/9.jpeg",
-    "assets/10.jpeg",
-]
-NUM_PAIRS = len(IMG_PATHS)
-COLS = 5          # 5 columnas x 4 filas
+# ====== Configuración de imágenes ======
+# Por defecto 10 pares -> 20 cartas con las fotos de assets/. El secreto
+# MEMORY_DECK_DIR usa cualquier carpeta de imágenes y MEMORY_PAIRS cuántas
+# parejas salen por partida (elegidas al azar entre las disponibles).
+DEFAULT_IMG_PATHS = tuple(f"assets/{i}.jpeg" for i in range(1, 11))
+DECK_DIR = st.secrets.get("MEMORY_DECK_DIR", "")
+IMG_PATHS = deck_images(DECK_DIR) if DECK_DIR else DEFAULT_IMG_PATHS
+if len(IMG_PATHS) < 2:
+    st.error(f"Hacen falta al menos 2 imágenes en {DECK_DIR or 'assets/'} para jugar.")
+    st.stop()
+NUM_PAIRS = max(2, min(int(st.secrets.get("MEMORY_PAIRS", 10)), len(IMG_PATHS)))
+# La partida guarda solo este resumen de la carpeta, no la lista de archivos
+DECK_KEY = (content_digest("\n".join(IMG_PATHS).encode()), NUM_PAIRS)
+# Tablero casi cuadrado: 5 columnas para 20 cartas, 20 para 400
+COLS = max(4, math.ceil(math.sqrt(2 * NUM_PAIRS)))
 CARD_SIZE = 140   # tamaño visual (px aprox)
 
+# Ancho de cada carta en la pantalla real: se manda la variante más chica que
+# lo cubra (las fotos originales miden ~1300 px y se ven a ~140).
+display = client_display()
+CARD_PX = pick_width(max(CARD_SIZE, display["width"] / COLS), display["dpr"])
+
+# Miniaturas cuadradas a CARD_PX, compartidas entre sesiones; la primera
+# visita las genera en segundo plano para que destapar una carta no decodifique
+warm_thumbnails(IMG_PATHS, CARD_PX)
+
 # ====== Estilos para las cartas ======
 st.markdown(f"""
 <style>
@@ -67,29 +82,40 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # ====== Estado ======
+# "client": el componente voltea las cartas en el navegador y solo manda cada
+# par destapado (un rerun por jugada). "classic": un botón por carta.
+MEMORY_MODE = st.secrets.get("MEMORY_MODE", "client")
+BOARD_KEY = "mem_board"
+
 def init_game():
-    # baraja con dos copias de cada id de imagen
-    ids = list(range(NUM_PAIRS)) * 2
-    random.shuffle(ids)
-    st.session_state.mem_cards = [
-        {"img_id": i, "revealed": False, "matched": False} for i in ids
-    ]
-    st.session_state.mem_revealed = []  # índices de cartas reveladas (0,1 o 2)
-    st.session_state.mem_moves = 0
-    st.session_state.mem_matches = 0
+    st.session_state.mem_game = MemoryGame.new(NUM_PAIRS, images=len(IMG_PATHS))
+    st.session_state.mem_deck = DECK_KEY
+    st.session_state.mem_game_id = os.urandom(4).hex()  # el componente rearma el tablero al cambiar
+    st.session_state.mem_revealed = []  # modo clásico: índices destapados (0, 1 o 2)
     st.session_state.flip_deadline = None
     st.session_state.cuadro3_solved = False
 
-if "mem_cards" not in st.session_state:
+# Partida nueva si cambió la carpeta (o su contenido) o el número de parejas
+if "mem_game" not in st.session_state or st.session_state.get("mem_deck") != DECK_KEY:
     init_game()
 
-cards = st.session_state.mem_cards
+game = st.session_state.mem_game
+just_solved = False
 
-# Si hay dos destapadas que no coinciden y pasó el tiempo, volver a tapar
+# El par destapado en el navegador se valida antes de pintar las métricas
+if MEMORY_MODE == "client":
+    event = consume_event(BOARD_KEY)
+    # El evento viene del navegador: si no trae dos cartas, se ignora
+    try:
+        pair = (int(event["a"]), int(event["b"])) if event else None
+    except (KeyError, TypeError, ValueError):
+        pair = None
+    if pair and game.reveal_pair(*pair) and game.solved:
+        st.session_state.cuadro3_solved = True
+        just_solved = True
+
+# Modo clásico: si hay dos destapadas que no coinciden y pasó el tiempo, volver a tapar
 if st.session_state.flip_deadline and time.time() >= st.session_state.flip_deadline:
-    a, b = st.session_state.mem_revealed
-    cards[a]["revealed"] = False
-    cards[b]["revealed"] = False
     st.session_state.mem_revealed = []
     st.session_state.flip_deadline = None
     st.rerun()
@@ -97,9 +123,9 @@ if st.session_state.flip_deadline and time.time() >= st.session_state.flip_deadl
 # ====== Header con estadísticas y acciones ======
 c1, c2, c3, c4 = st.columns([1,1,1,2])
 with c1:
-    st.metric("Pares encontrados", f"{st.session_state.mem_matches}/{NUM_PAIRS}")
+    st.metric("Pares encontrados", f"{game.matches}/{NUM_PAIRS}")
 with c2:
-    st.metric("Movimientos", st.session_state.mem_moves)
+    st.metric("Movimientos", game.moves)
 with c3:
     if st.button("🔄 Reiniciar"):
         init_game()
@@ -112,56 +138,85 @@ with c4:
 st.write("")
 
 # ====== Grid de cartas ======
-rows = (len(cards) + COLS - 1) // COLS
-container = st.container()
-container.markdown("<div class='mem-grid'>", unsafe_allow_html=True)
-
-for r in range(rows):
-    cols = st.columns(COLS, gap="large")
-    for c in range(COLS):
-        idx = r * COLS + c
-        if idx >= len(cards):
-            continue
-        card = cards[idx]
-        img_path = IMG_PATHS[card["img_id"]]
-
-        with cols[c]:
-            if card["revealed"] or card["matched"]:
-                # Mostrar imagen
-                klass = "img-wrap matched" if card["matched"] else "img-wrap"
-                st.markdown(f"<div class='{klass}'>", unsafe_allow_html=True)
-                st.image(Image.open(img_path), use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                # Botón "boca abajo"
-                with st.container():
-                    st.markdown("<div class='card-btn'>", unsafe_allow_html=True)
-                    if st.button("?", key=f"mem_{idx}", use_container_width=True):
-                        # No dejes destapar si ya hay 2 abiertas o si está en espera de flip
-                        if len(st.session_state.mem_revealed) < 2 and not st.session_state.flip_deadline:
-                            card["revealed"] = True
-                            st.session_state.mem_revealed.append(idx)
-
-                            if len(st.session_state.mem_revealed) == 2:
-                                a, b = st.session_state.mem_revealed
-                                st.session_state.mem_moves += 1
-                                if cards[a]["img_id"] == cards[b]["img_id"]:
-                                    # ¡Match!
-                                    cards[a]["matched"] = True
-                                    cards[b]["matched"] = True
-                                    st.session_state.mem_revealed = []
-                                    st.session_state.mem_matches += 1
-                                    if st.session_state.mem_matches == NUM_PAIRS:
-                                        st.session_state.cuadro3_solved = True
-                                        st.balloons()
-                                        st.success("🎉 ¡Completaste todas las parejas!")
-                                else:
-                                    # Programar volteo
-                                    st.session_state.flip_deadline = time.time() + 0.8
-                        st.rerun()
+def render_client_board():
+    # Las miniaturas van por URL (una por imagen y con contenido fijo): el
+    # navegador las baja una vez por partida, no en cada carta destapada
+    images = [thumbnail_url(IMG_PATHS[face], CARD_PX) for face in game.faces]
+    memory_game(images, game.deck, game.matched_cards(), COLS,
+                st.session_state.mem_game_id, key=BOARD_KEY)
+
+def render_classic_board():
+    rows = (game.size + COLS - 1) // COLS
+    container = st.container()
+    container.markdown("<div class='mem-grid'>", unsafe_allow_html=True)
+
+    for r in range(rows):
+        cols = st.columns(COLS, gap="large")
+        for c in range(COLS):
+            idx = r * COLS + c
+            if idx >= game.size:
+                continue
+            img_path = IMG_PATHS[game.faces[game.deck[idx]]]
+            matched = game.is_matched(idx)
+
+            with cols[c]:
+                if matched or idx in st.session_state.mem_revealed:
+                    # Mostrar imagen
+                    klass = "img-wrap matched" if matched else "img-wrap"
+                    st.markdown(f"<div class='{klass}'>", unsafe_allow_html=True)
+                    st.image(thumbnail_url(img_path, CARD_PX), use_container_width=True)
                     st.markdown("</div>", unsafe_allow_html=True)
-
-container.markdown("</div>", unsafe_allow_html=True)
+                else:
+                    # Botón "boca abajo"
+                    with st.container():
+                        st.markdown("<div class='card-btn'>", unsafe_allow_html=True)
+                        if st.button("?", key=f"mem_{idx}", use_container_width=True):
+                            # No dejes destapar si ya hay 2 abiertas o si está en espera de flip
+                            if len(st.session_state.mem_revealed) < 2 and not st.session_state.flip_deadline:
+                                st.session_state.mem_revealed.append(idx)
+
+                                if len(st.session_state.mem_revealed) == 2:
+                                    a, b = st.session_state.mem_revealed
+                                    if game.reveal_pair(a, b):
+                                        # ¡Match!
+                                        st.session_state.mem_revealed = []
+                                        if game.solved:
+                                            st.session_state.cuadro3_solved = True
+                                            st.balloons()
+                                            st.success("🎉 ¡Completaste todas las parejas!")
+                                    else:
+                                        # Programar volteo
+                                        st.session_state.flip_deadline = time.time() + 0.8
+                            st.rerun()
+                        st.markdown("</div>", unsafe_allow_html=True)
+
+    container.markdown("</div>", unsafe_allow_html=True)
+
+if MEMORY_MODE == "client":
+    render_client_board()
+    if just_solved:
+        st.balloons()
+    if game.solved:
+        st.success("🎉 ¡Completaste todas las parejas!")
+else:
+    render_classic_board()
+
+# ====== Collage de las fotos ======
+# Cada pareja encontrada pega su foto en segundo plano (games/collage.py); al
+# encontrar la última solo falta esa casilla. Orden fijo: el de la carpeta.
+COLLAGE_WAIT = 10.0
+collage = collage_job(IMG_PATHS[f] for f in sorted(game.faces))
+collage.ensure(IMG_PATHS[game.faces[p]] for p in game.matched_pairs())
+if game.solved:
+    try:
+        collage_data = collage.result(timeout=COLLAGE_WAIT)
+    except OSError as e:
+        collage_data = None
+        st.warning(f"No pude armar el collage: {e}")
+    if collage_data:
+        st.subheader("Nuestro collage 💞")
+        st.image(asset_url(collage_data, "image/jpeg", "collage"), use_container_width=True)
+        st.download_button("⬇️ Descargar collage", collage_data, file_name="collage.jpg", mime="image/jpeg")
 
 st.write("")
 # ====== Botón Siguiente cuadro ======
@@ -171,3 +226,24 @@ if st.button("➡️ Siguiente cuadro", disabled=disabled_next):
         st.switch_page("pages/6_Cuadro4.py")
     except Exception:
         st.rerun()
+
+# ====== Depuración (?debug=1 o secreto DEBUG) ======
+if st.query_params.get("debug") or st.secrets.get("DEBUG", False):
+    with st.expander("🔧 Caché de miniaturas"):
+        stats = thumbnail_stats()
+        lookups = stats["hits"] + stats["misses"]
+        d1, d2, d3, d4 = st.columns(4)
+        d1.metric("Aciertos", stats["hits"])
+        d2.metric("Fallos", stats["misses"])
+        d3.metric("Tasa de acierto", f"{stats['hits'] / lookups:.0%}" if lookups else "—")
+        d4.metric("Miniaturas", stats["entries"])
+        st.caption(
+            f"{stats['bytes'] / 1024:.0f} KB de {stats['max_bytes'] / 1024 / 1024:.0f} MB · "
+            f"{stats['evictions']} desalojos · {CARD_PX} px por carta"
+        )
+        cstats = collage_stats()
+        st.caption(
+            f"Collage: {collage.pasted}/{len(collage.paths)} fotos pegadas · "
+            f"{cstats['collages']['entries']} terminados en caché ({cstats['collages']['bytes'] / 1024:.0f} KB) · "
+            f"{cstats['jobs']['entries']} lienzos en memoria"
+        )
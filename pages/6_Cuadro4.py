@@ -1,7 +1,15 @@
 import streamlit as st
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import random
+
+from games.pacman_ai import DEFAULT_BUDGET_MS, STRATEGIES, make_ai
+from games.pacman_board import MOVE_BATCH, BoardView, board_css, board_html
+from games.pacman_engine import WON, PacmanGame
+from games.pacman_levels import DEFAULT_LEVEL, LevelError, default_levels
+from games.pacman_replay import ReplayError, dumps, get_replay, record, replay_level, start
+from games.static_assets import variant_url
+from games.variants import pick_width
+from games.widgets import client_display, consume_event, pacman_board
 
 st.set_page_config(page_title="Cuadro 4 — Mini Pac-Man", page_icon="🎮", layout="wide")
 
@@ -25,249 +33,151 @@ st.subheader("Acumula todos los puntos de pac-man")
 st.write("Para variar un poco del tipo de juego mi bello, este es un clásico, pero un tantito diferente porque hay que hacerlo con mucha paciencia corazón⌛🩷.")
 
 # =========================
-#   Laberinto (9x19)
+#   Nivel — packs/pacman/<id>.txt (games/pacman_levels.py)
 #   #: muro   .: pellet   o: power pellet   P: jugador   G: fantasma
+#   Se elige con ?level=<id> o el secreto PACMAN_LEVEL; se valida y compila
+#   una vez por proceso y todas las sesiones comparten el mismo nivel.
+#   Con ?replay=<id> la página repite una partida grabada de
+#   packs/pacman/replays/ (games/pacman_replay.py) turno por turno.
 # =========================
-MAZE = [
-    "###################",
-    "#P........#......o#",
-    "#.###.###.#.###.###",
-    "#.................#",
-    "###.#.#####.#.###.#",
-    "#...#...G...#.....#",
-    "#.###.#.#.#.#.###.#",
-    "#.....# G #.....o.#",
-    "###################",
-]
-ROWS, COLS = len(MAZE), len(MAZE[0])
+REPLAY_ID = st.query_params.get("replay")
+REPLAY = None
+try:
+    if REPLAY_ID:
+        REPLAY = get_replay(REPLAY_ID)
+        LEVEL = replay_level(REPLAY)
+    else:
+        LEVEL_ID = st.query_params.get("level") or st.secrets.get("PACMAN_LEVEL", DEFAULT_LEVEL)
+        LEVEL = default_levels().get(LEVEL_ID)
+except (LevelError, ReplayError) as e:
+    st.error(str(e))
+    st.stop()
+ROWS, COLS = LEVEL.rows, LEVEL.cols
 
-CELL = 30  # px para cada casilla
+CELL = max(12, min(30, 700 // COLS - 6))  # px para cada casilla (más chicas en niveles grandes)
 
-# ====== Estado y utilidades ======
-def find_positions():
-    pellets, powers, walls = set(), set(), set()
-    player = None
-    ghosts = []
-    for r in range(ROWS):
-        for c in range(COLS):
-            ch = MAZE[r][c]
-            if ch == "#": walls.add((r, c))
-            elif ch == ".": pellets.add((r, c))
-            elif ch == "o": powers.add((r, c))
-            elif ch == "P": player = (r, c)
-            elif ch == "G": ghosts.append((r, c))
-    return player, ghosts, pellets, powers, walls
+# ====== Estado ======
+# Las reglas viven en games/pacman_engine.py (sin Streamlit); la página solo
+# guarda la partida en la sesión, le pasa cada jugada y pinta el resultado.
+# Cada partida tiene su semilla y graba sus jugadas (un byte por turno), así
+# que se puede descargar y repetir igual. La repetición usa su propia
+# partida en la sesión: mirarla no toca la partida en curso.
+GAME_KEY, VIEW_KEY = ("pm_replay_game", "pm_replay_view") if REPLAY else ("pm_game", "pm_view")
 
 def init_game():
-    p, gs, pe, po, wa = find_positions()
-    st.session_state.pm_player = p
-    st.session_state.pm_ghosts = [{"pos": g, "home": g, "dir": None} for g in gs]
-    st.session_state.pm_pellets = set(pe)
-    st.session_state.pm_powers = set(po)
-    st.session_state.pm_walls = set(wa)
-    st.session_state.pm_score = 0
-    st.session_state.pm_lives = 3
-    st.session_state.pm_power_timer = 0  # turnos “power”
-    st.session_state.pm_game_over = False
-    st.session_state.pm_win = False
-    st.session_state.pm_moves = 0
-    st.session_state.cuadro4_solved = False
-
-if "pm_player" not in st.session_state:
+    if REPLAY:
+        st.session_state.pm_replay_game = start(REPLAY, LEVEL)
+        st.session_state.pm_replay_id = REPLAY_ID
+    else:
+        st.session_state.pm_game = PacmanGame(LEVEL)
+        st.session_state.cuadro4_solved = False
+    st.session_state[VIEW_KEY] = BoardView()
+
+# Partida nueva si cambió el nivel (otro ?level= o el archivo se editó) o la grabación
+if (GAME_KEY not in st.session_state or st.session_state[GAME_KEY].level is not LEVEL
+        or (REPLAY and st.session_state.get("pm_replay_id") != REPLAY_ID)):
     init_game()
 
-def is_wall(rc): return rc in st.session_state.pm_walls
-def in_bounds(r, c): return 0 <= r < ROWS and 0 <= c < COLS
-def add(a, b): return (a[0] + b[0], a[1] + b[1])
-
-DIRS = {"up":(-1,0),"down":(1,0),"left":(0,-1),"right":(0,1)}
-DIR_KEYS = {"⬆️":"up","⬇️":"down","⬅️":"left","➡️":"right"}
+pm: PacmanGame = st.session_state[GAME_KEY]
 
-# ====== Lógica de movimiento ======
-def step_player(dkey):
-    if st.session_state.pm_game_over or st.session_state.pm_win: return
-    if dkey not in DIRS: return
-    dr, dc = DIRS[dkey]
-    r, c = st.session_state.pm_player
-    nr, nc = r + dr, c + dc
-    if not in_bounds(nr, nc) or is_wall((nr, nc)):
-        return  # golpea muro, no se mueve
-    st.session_state.pm_player = (nr, nc)
-    st.session_state.pm_moves += 1
+# ====== Fantasmas ======
+# "greedy" da un paso por distancia real; "expectimax"/"minimax" buscan
+# varias jugadas adelante con un tope de ms por turno (games/pacman_ai.py).
+# Se elige en la página; el secreto PACMAN_GHOSTS pone la de inicio y
+# PACMAN_GHOST_BUDGET_MS el tope. La repetición usa la de la grabación.
+GHOSTS_DEFAULT = st.secrets.get("PACMAN_GHOSTS", "greedy")
+GHOST_BUDGET_MS = float(st.secrets.get("PACMAN_GHOST_BUDGET_MS", DEFAULT_BUDGET_MS))
+GHOST_LABELS = {"greedy": "Directos", "expectimax": "Astutos (expectimax)", "minimax": "Implacables (minimax)"}
 
-    # Comer pellet / power
-    if (nr, nc) in st.session_state.pm_pellets:
-        st.session_state.pm_pellets.remove((nr, nc))
-        st.session_state.pm_score += 10
-    if (nr, nc) in st.session_state.pm_powers:
-        st.session_state.pm_powers.remove((nr, nc))
-        st.session_state.pm_score += 50
-        st.session_state.pm_power_timer = 15  # turnos en modo “power”
+def ghost_ai(name: str):
+    return make_ai() if name == "greedy" else make_ai(name, budget_ms=GHOST_BUDGET_MS)
 
-def ghost_options(pos):
-    opts = []
-    for d in DIRS.values():
-        nxt = add(pos, d)
-        if in_bounds(*nxt) and not is_wall(nxt):
-            opts.append(nxt)
-    return opts
-
-def move_ghosts():
-    """Fantasmas con movimiento simple:
-       - Si power_timer>0 huyen (maximizan distancia Manhattan).
-       - Si power_timer==0 persiguen (minimizan distancia).
-       - Si no hay mejoría, eligen opción aleatoria válida.
-    """
-    pr, pc = st.session_state.pm_player
-    new_positions = []
-    for g in st.session_state.pm_ghosts:
-        options = ghost_options(g["pos"])
-        if not options:
-            new_positions.append(g["pos"])
-            continue
-        # función objetivo
-        def score(cell):
-            r, c = cell
-            dist = abs(r - pr) + abs(c - pc)
-            return -dist if st.session_state.pm_power_timer == 0 else dist
-        # mejor opción
-        best_val = None
-        best = []
-        for opt in options:
-            val = score(opt)
-            if best_val is None or val > best_val:
-                best_val = val; best = [opt]
-            elif val == best_val:
-                best.append(opt)
-        new_positions.append(random.choice(best))
-    # aplicar
-    for i, g in enumerate(st.session_state.pm_ghosts):
-        g["pos"] = new_positions[i]
-
-def check_collisions():
-    p = st.session_state.pm_player
-    eaten = []
-    for g in st.session_state.pm_ghosts:
-        if g["pos"] == p:
-            if st.session_state.pm_power_timer > 0:
-                eaten.append(g)  # fantasma comido
-                st.session_state.pm_score += 200
-            else:
-                # Pac-Man pierde vida
-                st.session_state.pm_lives -= 1
-                if st.session_state.pm_lives <= 0:
-                    st.session_state.pm_game_over = True
-                respawn()
-                return  # turno termina
-    # Enviar fantasmas comidos a su “home”
-    for g in eaten:
-        g["pos"] = g["home"]
-
-def respawn():
-    # regresa jugador y fantasmas a su spawn, sin tocar pellets
-    p, gs, _, _, _ = find_positions()
-    st.session_state.pm_player = p
-    for i, g in enumerate(st.session_state.pm_ghosts):
-        st.session_state.pm_ghosts[i]["pos"] = st.session_state.pm_ghosts[i]["home"]
-    st.session_state.pm_power_timer = 0
+# Antes de aplicar jugadas: el selector ya trae en la sesión la elección nueva
+if not REPLAY:
+    GHOSTS = st.session_state.get("pm_ghosts", GHOSTS_DEFAULT if GHOSTS_DEFAULT in STRATEGIES else "greedy")
+    if pm.ai.name != GHOSTS:
+        pm.ai = ghost_ai(GHOSTS)
 
 def turn(dkey):
-    if st.session_state.pm_game_over or st.session_state.pm_win: return
-    step_player(dkey)
-    # Comer/ganar tras mover jugador
-    if not st.session_state.pm_pellets and not st.session_state.pm_powers:
-        st.session_state.pm_win = True
+    if pm.step(dkey) & WON:
         st.session_state.cuadro4_solved = True
-        return
-    # mover fantasmas y checar colisiones
-    move_ghosts()
-    check_collisions()
-    # decrementar power
-    if st.session_state.pm_power_timer > 0:
-        st.session_state.pm_power_timer -= 1
 
 # ====== Render del tablero ======
-def render_board():
-    # CSS
-    st.markdown(f"""
-    <style>
-    .board {{
-        display: grid;
-        grid-template-columns: repeat({COLS}, {CELL}px);
-        grid-auto-rows: {CELL}px;
-        gap: 6px;
-        user-select: none;
-    }}
-    .cell {{
-        width: {CELL}px; height: {CELL}px; border-radius: 7px;
-        display:flex; align-items:center; justify-content:center;
-        background: #111;  /* por defecto bloqueada */
-    }}
-    .floor {{ background: #0b132b; }}
-    .wall  {{ background: #1d4ed8; }} /* azul muro */
-    .pellet::after {{
-        content:''; width:8px; height:8px; border-radius:50%; background:#fef08a;
-        box-shadow: 0 0 6px #fde68a;
-    }}
-    .power::after {{
-        content:''; width:14px; height:14px; border-radius:50%; background:#fbbf24;
-        box-shadow: 0 0 10px #f59e0b;
-    }}
-    .pacman {{
-        width: 70%; height: 70%; border-radius: 50%; background: #facc15; /* amarillo */
-        box-shadow: inset -6px -6px 0 rgba(0,0,0,.12);
-    }}
-    .ghost {{
-        width: 70%; height: 70%; background:#ef4444; border-radius: 16px 16px 6px 6px;
-        position:relative; overflow:hidden;
-    }}
-    .ghost.blue {{ background:#22d3ee; }}
-    .fright .ghost {{ filter: hue-rotate(40deg) saturate(0.6) brightness(1.1); }}
-    </style>
-    """, unsafe_allow_html=True)
+# "component": el laberinto viaja una vez por partida y cada turno manda solo
+# jugador, fantasmas y casillas que cambiaron (games/pacman_board.py).
+# "html": el tablero completo como HTML en cada rerun, desde una plantilla.
+BOARD_MODE = st.secrets.get("PACMAN_BOARD_MODE", "component")
+BOARD_KEY = "pm_board"
+
+if VIEW_KEY not in st.session_state:
+    st.session_state[VIEW_KEY] = BoardView()
+view: BoardView = st.session_state[VIEW_KEY]
+
+# Las jugadas llegan por lotes desde el navegador (teclado, deslizar o pad) y
+# se aplican en orden en este mismo rerun, antes de pintar HUD y tablero.
+# El navegador también pide el laberinto completo si no tiene la revisión base.
+if BOARD_MODE == "component":
+    event = consume_event(BOARD_KEY)
+    if event:
+        if event.get("resync"):
+            view.resync()
+        moves = str(event.get("moves", ""))[:MOVE_BATCH]
+        if moves and not REPLAY and pm.play(moves) & WON:
+            st.session_state.cuadro4_solved = True
 
-    # mapa de celdas base (muro/piso/pellets)
-    pellets = st.session_state.pm_pellets
-    powers  = st.session_state.pm_powers
-    walls   = st.session_state.pm_walls
-    P       = st.session_state.pm_player
-    Gs      = [g["pos"] for g in st.session_state.pm_ghosts]
-
-    html = ['<div class="board {}">'.format("fright" if st.session_state.pm_power_timer>0 else "")]
-    for r in range(ROWS):
-        for c in range(COLS):
-            pos = (r,c)
-            if pos in walls:
-                html.append('<div class="cell wall"></div>')
-                continue
-            classes = ["cell","floor"]
-            inner = ""
-            if pos == P:
-                inner = '<div class="pacman"></div>'
-            elif pos in Gs:
-                idx = Gs.index(pos)
-                gcls = "ghost blue" if idx==1 else "ghost"
-                inner = f'<div class="{gcls}"></div>'
-            elif pos in pellets:
-                classes.append("pellet")
-            elif pos in powers:
-                classes.append("power")
-            html.append(f'<div class="{" ".join(classes)}">{inner}</div>')
-    html.append("</div>")
-    st.markdown("".join(html), unsafe_allow_html=True)
+def render_board():
+    if BOARD_MODE == "component":
+        pacman_board(view.frame(pm), COLS, CELL, key=BOARD_KEY,
+                     locked=pm.over or REPLAY is not None)
+    else:
+        st.markdown(board_css(COLS, CELL), unsafe_allow_html=True)
+        st.markdown(board_html(pm), unsafe_allow_html=True)
 
 # ====== HUD y controles ======
 top = st.columns([1,1,1,2])
 with top[0]:
-    st.metric("Puntaje", st.session_state.pm_score)
+    st.metric("Puntaje", pm.score)
 with top[1]:
-    st.metric("Vidas", st.session_state.pm_lives)
+    st.metric("Vidas", pm.lives)
 with top[2]:
-    st.metric("Power", st.session_state.pm_power_timer)
+    st.metric("Power", pm.power)
+with top[3]:
+    if not REPLAY:
+        st.selectbox("Fantasmas", STRATEGIES, index=STRATEGIES.index(GHOSTS),
+                     format_func=GHOST_LABELS.get, key="pm_ghosts")
 
 render_board()
 
 st.write("")
+if REPLAY:
+    # ====== Repetición: avanzar la partida grabada ======
+    def advance(n: int):
+        for code in REPLAY.moves[len(pm.log):len(pm.log) + n]:
+            pm.step(code)
+
+    st.caption(f"Repetición **{REPLAY_ID}** (nivel {LEVEL.id}, semilla {REPLAY.seed}): "
+               f"turno {len(pm.log)} de {REPLAY.turns}")
+    rp = st.columns(4)
+    with rp[0]:
+        if st.button("⏮️ Inicio"):
+            init_game(); st.rerun()
+    with rp[1]:
+        if st.button("⏭️ Un turno"):
+            advance(1); st.rerun()
+    with rp[2]:
+        if st.button("⏩ 10 turnos"):
+            advance(10); st.rerun()
+    with rp[3]:
+        if st.button("⏯️ Hasta el final"):
+            advance(REPLAY.turns); st.rerun()
+    if len(pm.log) == REPLAY.turns:
+        if (pm.score, pm.lives, pm.win) == (REPLAY.score, REPLAY.lives, REPLAY.win):
+            st.success(f"✅ Final igual al grabado: puntaje {pm.score}, vidas {pm.lives}.")
+        else:
+            st.error(f"La repetición no coincide: puntaje {pm.score} (grabado {REPLAY.score}), "
+                     f"vidas {pm.lives} (grabado {REPLAY.lives}).")
+    st.stop()
+
 ctrl = st.columns([1,1,1,2])
 with ctrl[0]:
     if st.button("🔄 Reiniciar"):
@@ -276,26 +186,40 @@ with ctrl[1]:
     if st.button("⬅️ Volver a Contenido"):
         try: st.switch_page("pages/2_Contenido.py")
         except Exception: st.rerun()
-
-st.write("")
-pad = st.columns(3)
-with pad[0]:
-    st.write("")
-    if st.button("⬅️"): turn("left"); st.rerun()
-with pad[1]:
-    if st.button("⬆️"): turn("up"); st.rerun()
-    if st.button("⬇️"): turn("down"); st.rerun()
-with pad[2]:
+with ctrl[2]:
+    # Al terminar, la partida se puede bajar y repetir con ?replay=<id>
+    # (dejando el archivo en packs/pacman/replays/). No si los fantasmas
+    # buscaron con tiempo límite o se cambió de estrategia a mitad de partida:
+    # la repetición no daría lo mismo
+    if pm.over and pm.seed is not None and pm.replayable and pm.ai.deterministic:
+        st.download_button("⬇️ Guardar jugadas", dumps(record(pm)),
+                           file_name=f"{LEVEL.id}_{pm.seed}.json", mime="application/json")
+
+# En modo componente el pad va dentro del tablero (y las flechas del teclado)
+if BOARD_MODE == "component":
+    st.caption("Mueve a Pac-Man con las flechas (o WASD), deslizando el dedo o con el pad.")
+else:
     st.write("")
-    if st.button("➡️"): turn("right"); st.rerun()
+    pad = st.columns(3)
+    with pad[0]:
+        st.write("")
+        if st.button("⬅️"): turn("left"); st.rerun()
+    with pad[1]:
+        if st.button("⬆️"): turn("up"); st.rerun()
+        if st.button("⬇️"): turn("down"); st.rerun()
+    with pad[2]:
+        st.write("")
+        if st.button("➡️"): turn("right"); st.rerun()
 
 # Mensajes de estado
-if st.session_state.pm_win:
+if pm.win:
     st.success("🎉 ¡Has comido todos los puntos! Nivel completado.")
     st.session_state.cuadro4_solved = True
-elif st.session_state.pm_game_over:
+elif pm.game_over:
     st.error("💀 Te quedaste sin vidas. ¡Inténtalo de nuevo!")
 
 # ====== 👇 ADICIÓN: mostrar la imagen cuando ya se comieron todos los puntos ======
-if st.session_state.pm_win:
-    st.image("assets/11.png", use_container_width=True)
+if pm.win:
+    display = client_display()
+    st.image(variant_url("assets/11.png", pick_width(display["width"], display["dpr"])),
+             use_container_width=True)